@@ -9,17 +9,357 @@ Provides intelligent content analysis, summary generation, and enhanced
 notifications using Google's Gemini AI model.
 """
 
+import asyncio
 import logging
+import math
 import re
+import threading
 import time
-from typing import Optional, Dict, Any
-import google.generativeai as genai
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
 
-from boon_tube_daemon.utils.config import get_config, get_secret, get_bool_config, get_int_config
+from boon_tube_daemon.llm.llm_cache import LLMCache, DEFAULT_CACHE_PATH, json_dumps, json_loads
+from boon_tube_daemon.utils.config import get_config, get_secret, get_bool_config, get_int_config, get_float_config
 from boon_tube_daemon.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# clean_description() patterns, compiled once at import.
+# Sponsor/tip/"follow me on" phrases; each removes the rest of its line.
+_PROMO_PATTERNS = (
+    r'sponsor(?:ed|s)?\s*(?:by|:)?',
+    r'support\s+(?:me|us)\s+on',
+    r'patreon',
+    r'ko-fi',
+    r'buy\s+me\s+a\s+coffee',
+    r'tip\s+jar',
+    r'donate',
+    r'merch',
+    r'affiliate',
+    r'discord\s+server',
+    r'join\s+(?:my|our)\s+discord',
+    r'follow\s+(?:me|us)\s+on',
+    r'find\s+me\s+on',
+    r'connect\s+with\s+me',
+)
+# Everything clean_description() deletes - URLs, @handles, and promo lines -
+# matched in one left-to-right scan. URLs and handles come first so a keyword
+# inside them (patreon.com/..., @merch) only removes the URL/handle, same as
+# stripping them in separate passes.
+_STRIP_RE = re.compile(
+    r'https?://\S+|@\w+|(?i:' + '|'.join(_PROMO_PATTERNS) + r')[^\n]*'
+)
+_MULTINL_RE = re.compile(r'\n\s*\n\s*\n+')
+# Only runs that actually change: 2+ spaces/tabs, or a lone tab. A lone space
+# is already normalized, so matching it would just copy it back in place.
+_WS_RE = re.compile(r'[ \t]{2,}|\t')
+
+# Default post style per social platform
+_DEFAULT_STYLES = {
+    'discord': 'conversational',
+    'matrix': 'professional',
+    'bluesky': 'conversational',
+    'mastodon': 'detailed'
+}
+
+# Style-specific prompt instructions
+_STYLE_INSTRUCTIONS = {
+    'professional': "Use a formal, clear, business-like tone. Be informative and direct.",
+    'conversational': "Use a casual, friendly, community-focused tone. Be warm and approachable.",
+    'detailed': "Provide comprehensive context and explanation. Be thorough and informative.",
+    'concise': "Be brief and to-the-point. Use minimal text while staying engaging."
+}
+
+# Post text budgets, leaving room for the URL we append.
+# Bluesky has 300 GRAPHEME limit (not bytes). YouTube URLs are ~43 chars.
+# 300 total - 43 URL - 2 newlines - 5 buffer = 250 chars for content
+# Being conservative because emojis count as multiple graphemes
+_BLUESKY_CONTENT_LIMIT = 250
+# Mastodon has 500 char limit. YouTube URLs are ~43 chars, so leave room
+# 500 total - 43 URL - 2 newlines = 455 chars for content
+_MASTODON_CONTENT_LIMIT = 455
+
+# enhance_notification() prompts per social platform.
+# post_style, style_instruction and the content limits are filled once per
+# (platform, style) by _prompt_template(); platform_name, title and cleaned_desc
+# are filled per video.
+_DISCORD_PROMPT = """Create an engaging Discord announcement for this new {platform_name} video.
+
+Title: {title}
+Description: {cleaned_desc}
+
+Style: {post_style}
+{style_instruction}
+
+Discord-specific guidelines:
+- NO hashtags (Discord doesn't use them)
+- NO platform greetings like "Hey Discord!" or "Hello everyone!" - just get to the content
+- NO placeholder URLs like "[YouTube Link]" or "youtu.be/your_youtube_link_here" - the actual URL will be added automatically
+- End with an invitation to watch/discuss
+- Keep it under 300 characters (URL will be added separately)
+
+Write the announcement now WITHOUT including any URLs:"""
+
+_MATRIX_PROMPT = """Create a Matrix/Element announcement for this new {platform_name} video.
+
+Title: {title}
+Description: {cleaned_desc}
+
+Style: {post_style}
+{style_instruction}
+
+Matrix-specific guidelines:
+- NO hashtags (Matrix doesn't use them)
+- NO platform greetings like "Hey Matrix!" - just get to the content
+- NO placeholder URLs like "[VIDEO_ID]" or "youtube.com/watch?v=[VIDEO_ID]" - the actual URL will be added automatically
+- Focus on the content value
+- Keep it under 350 characters (URL will be added separately)
+
+Write the announcement now WITHOUT including any URLs:"""
+
+_BLUESKY_PROMPT = """Create a SHORT Bluesky post for this new {platform_name} video.
+
+Title: {title}
+
+Style: {post_style}
+{style_instruction}
+
+BLUESKY RULES (MUST FOLLOW):
+- ABSOLUTE MAXIMUM: {bluesky_content_limit} characters total (this is NON-NEGOTIABLE)
+- The URL will be added automatically - DO NOT include any URLs
+- Include 2-3 SHORT hashtags at the end (counts toward limit)
+- NO greetings, NO meta text, NO placeholder URLs
+- Emojis count as 2+ characters each - use sparingly
+- Aim for 200-230 characters to be safe
+
+Write ONLY the post text (under {bluesky_content_limit} chars, no URLs):"""
+
+_MASTODON_PROMPT = """Create an engaging Mastodon toot for this new {platform_name} video.
+
+Title: {title}
+Description: {cleaned_desc}
+
+Style: {post_style}
+{style_instruction}
+
+Mastodon-specific guidelines:
+- CRITICAL: Stay under {mastodon_content_limit} characters (URL will be added separately, Mastodon limit is 500 total)
+- Count EVERY character including spaces, hashtags, punctuation
+- NO platform greetings like "Hey Mastodon!" - wastes characters
+- NO placeholder URLs like "YOUR_VIDEO_ID" - the actual URL will be added automatically
+- Include 3-5 SHORT hashtags at the end (#Linux not #LinuxForBeginners)
+- Keep main text to ~380 chars to leave room for hashtags
+- If style is 'detailed', be comprehensive but STAY UNDER {mastodon_content_limit} chars
+
+Write the toot now WITHOUT including any URLs (MUST be under {mastodon_content_limit} chars):"""
+
+# Fallback for unknown platforms
+_FALLBACK_PROMPT = """Create an engaging social media post for this new {platform_name} video.
+
+Title: {title}
+Description: {cleaned_desc}
+
+Style: {post_style}
+{style_instruction}
+
+Keep it under 280 characters, include the URL, and make it clickable.
+
+Write the post now:"""
+
+_PROMPTS = {
+    'discord': _DISCORD_PROMPT,
+    'matrix': _MATRIX_PROMPT,
+    'bluesky': _BLUESKY_PROMPT,
+    'mastodon': _MASTODON_PROMPT,
+}
+
+_SHOULD_NOTIFY_PROMPT = """Determine if this video should trigger a notification based on quality and relevance.
+
+Title: {title}
+Description: {description}
+
+Filter out:
+- Spam or clickbait
+- Low-quality content
+- Off-topic videos
+%s
+
+Return ONLY "yes" or "no"."""
+
+
+def _escape_braces(text: str) -> str:
+    """Escape config text baked into a template so str.format() leaves it alone."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+# Junk to drop from a generated post, in one scan:
+# - LLM meta-text at the start of a line ("Here's a Bluesky post:", "Sure thing", "Draft:").
+#   At most one preface per line - repeating would eat posts that start with
+#   the same word ("Draft: Drafting your first novel").
+# - Any URL the LLM put in the post (we append the real one)
+_POST_CLEAN_RE = re.compile(
+    r'^(?:(?:Here\'?s|Okay,? here\'?s|Alright,? here\'?s)\s+(?:a|an|your)\s+(?:Bluesky|Mastodon|Discord|Matrix)?\s*'
+    r'(?:post|toot|announcement|draft)|Here you go|Sure thing|Certainly|Draft).*?:?\s*'
+    r'|https?://\S+',
+    re.IGNORECASE | re.MULTILINE
+)
+# Literal escape sequences an LLM sometimes emits instead of real whitespace
+_ESCAPES = {'\\n': '\n', '\\t': '\t', '\\r': '\r'}
+_ESCAPE_RE = re.compile(r'\\[ntr]')
+
+
+def _unescape_match(match: 're.Match') -> str:
+    """_ESCAPE_RE replacement: map a literal escape to its character."""
+    return _ESCAPES[match.group()]
+
+
+# Transient errors that mean we're over quota, and Gemini's "Please retry in 12.3s"
+_RATE_LIMIT_ERROR_RE = re.compile(r'\b429\b|quota|rate.?limit|resource.?exhausted', re.IGNORECASE)
+_RETRY_IN_RE = re.compile(r'retry in (\d+(?:\.\d+)?)\s*s', re.IGNORECASE)
+# Cap on a server-suggested wait, so a daily-quota error doesn't park the daemon
+_MAX_RETRY_AFTER = 120.0
+
+# Generation config for one-word answers: stop after a few tokens, deterministic
+_SHORT_ANSWER_CONFIG = {
+    'max_output_tokens': 4,
+    'temperature': 0.0,
+    'candidate_count': 1,
+    'stop_sequences': ['\n'],
+}
+
+# Output token caps for length-limited text: ~4 chars per token in English,
+# budgeted at 3 so the cap only stops runaway output, never a post mid-sentence
+_CHARS_PER_TOKEN = 3
+# Post length asked for in each enhance_notification() prompt
+_POST_CHAR_LIMITS = {
+    'discord': 300,
+    'matrix': 350,
+    'bluesky': _BLUESKY_CONTENT_LIMIT,
+    'mastodon': _MASTODON_CONTENT_LIMIT,
+}
+_FALLBACK_POST_CHAR_LIMIT = 280
+
+# Labels analyze_sentiment() and process_video() choose from
+_SENTIMENTS = ('positive', 'negative', 'neutral', 'educational', 'entertainment',
+               'news', 'tutorial', 'review', 'comedy', 'dramatic')
+
+# Per-platform rules for posts generated by process_video()
+_BATCH_POST_RULES = {
+    'discord': "NO hashtags. End with an invitation to watch/discuss. Under 300 characters.",
+    'matrix': "NO hashtags. Focus on the content value. Under 350 characters.",
+    'bluesky': "2-3 SHORT hashtags at the end. ABSOLUTE MAXIMUM %d characters including hashtags; "
+               "emojis count as 2+ characters." % _BLUESKY_CONTENT_LIMIT,
+    'mastodon': "3-5 SHORT hashtags at the end (#Linux not #LinuxForBeginners). "
+                "Under %d characters including hashtags." % _MASTODON_CONTENT_LIMIT,
+}
+
+
+def _unit_vector(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length so cosine similarity is a plain dot product."""
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector] if norm else list(vector)
+
+
+def _mean_unit_vector(vectors: List[List[float]]) -> List[float]:
+    """Average a set of embeddings into one (unit-length) prototype vector."""
+    mean = [sum(column) / len(vectors) for column in zip(*vectors)]
+    return _unit_vector(mean)
+
+
+def _truncate_at_word(text: str, limit: int) -> str:
+    """
+    Cut text to at most limit characters at the last word boundary and add "...".
+    
+    Args:
+        text: Text to truncate
+        limit: Maximum characters kept before the ellipsis
+        
+    Returns:
+        Truncated text
+    """
+    idx = text.rfind(' ', 0, limit)
+    return (text[:idx] if idx >= 0 else text[:limit]) + "..."
+
+
+# Code points that extend the previous grapheme: zero-width joiner,
+# variation selectors and emoji skin tones (combining marks are checked separately)
+_ZWJ = '\u200d'
+_GRAPHEME_EXTENDERS = frozenset('\u200d\ufe0e\ufe0f\U0001F3FB\U0001F3FC\U0001F3FD\U0001F3FE\U0001F3FF')
+
+
+def _truncate_for_bluesky(text: str, limit: int) -> str:
+    """
+    Cut a post to at most limit graphemes, keeping its trailing hashtags if they fit.
+    
+    Walks the text once, counting graphemes the way Bluesky does (closely enough:
+    combining marks, joiners and skin tones don't count), and remembering the last
+    space before the limit and where the closing run of hashtags starts.
+    
+    Args:
+        text: Post text without the URL
+        limit: Maximum graphemes
+        
+    Returns:
+        Text unchanged if it fits, otherwise truncated at a word boundary
+    """
+    count = 0               # graphemes so far
+    cut = -1                # index where grapheme limit+1 starts
+    last_space = -1         # last space before cut ...
+    space_count = 0         # ... and the graphemes before it
+    ws_start = 0            # start of the current whitespace run
+    tags_start = -1         # start (incl. leading whitespace) of the trailing hashtag run
+    tags_count = 0          # graphemes before tags_start
+    tags_end = -1           # index after the last hashtag character ...
+    tags_end_count = 0      # ... and the graphemes up to it
+    in_tag = False          # current word is still a valid #tag
+    prev = ' '
+    for i, ch in enumerate(text):
+        if prev != _ZWJ and ch not in _GRAPHEME_EXTENDERS and not unicodedata.combining(ch):
+            if count == limit and cut < 0:
+                cut = i
+            count += 1
+        if ch.isspace():
+            if not prev.isspace():
+                ws_start = i
+                if in_tag and prev == '#':
+                    in_tag = False
+                    tags_start = -1
+            if ch == ' ' and cut < 0:
+                last_space = i
+                space_count = count - 1
+        elif prev.isspace():
+            # First character of a word: a hashtag continues (or starts) the run
+            in_tag = ch == '#'
+            if not in_tag:
+                tags_start = -1
+            elif tags_start < 0:
+                tags_start = ws_start if i else 0
+                tags_count = count - 1 - (i - tags_start)
+        elif in_tag and not (ch.isalnum() or ch == '_' or ch == '#'):
+            in_tag = False
+            tags_start = -1
+        if in_tag and ch != '#' and not ch.isspace():
+            tags_end = i + 1
+            tags_end_count = count
+        prev = ch
+    
+    if cut < 0:
+        return text
+    if prev == '#':
+        in_tag = False
+    
+    end = last_space if last_space >= 0 and space_count > limit - 50 else cut
+    kept = space_count if end == last_space else limit
+    truncated = text[:end].rstrip()
+    # Try to preserve hashtags if they were at the end (and not already kept)
+    if in_tag and tags_start >= end and tags_end > tags_start:
+        tags = text[tags_start:tags_end]
+        if kept + (tags_end_count - tags_count) <= limit:
+            truncated += tags
+    return truncated.strip()
+
 
 class GeminiLLM:
     """
@@ -37,8 +377,45 @@ class GeminiLLM:
         self.name = "Gemini-Flash-2.0-Lite"
         self.enabled = False
         self.model = None
+        self.model_name = None
         self.api_key = None
         self.rate_limiter = None
+        # google.generativeai module, imported in authenticate() - it pulls in
+        # grpc/protobuf, which daemons with the LLM disabled shouldn't pay for
+        self._genai = None
+        self.cache = None
+        self.semantic_cache = False
+        self.embedding_model = None
+        self.max_concurrency = 8
+        self.request_options = None
+        # Config values read once in authenticate() (they don't change during a run)
+        self._style_cache: Dict[str, str] = {}
+        self._filter_enabled = False
+        self._filter_keywords = ''
+        self._filter_keyword_list: List[str] = []
+        self._filter_heuristics = False
+        # Prompt templates with config baked in (see _prompt_template)
+        self._prompt_templates: Dict[Tuple[str, str], str] = {}
+        self._should_notify_template: Optional[str] = None
+        self._short_answer_config = None
+        self._limit_output_tokens = False
+        self._length_configs: Dict[int, Dict[str, Any]] = {}
+        # Embedding prototype filter (see _prototype_decision)
+        self._filter_good_examples: List[str] = []
+        self._filter_bad_examples: List[str] = []
+        self._filter_margin = 0.1
+        self._prototypes: Optional[Tuple[List[float], List[float]]] = None
+        self._prototypes_failed = False
+        self._embed_memo: 'OrderedDict[str, list]' = OrderedDict()
+        # Stripped descriptions (see _stripped_description)
+        self._strip_memo: 'OrderedDict[str, str]' = OrderedDict()
+        self._cache_dir = DEFAULT_CACHE_PATH.parent
+        # Requests currently being generated, so identical concurrent calls share one
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._ainflight: Dict[str, asyncio.Future] = {}
+        self._semaphore = None
+        self._semaphore_loop = None
         
     def authenticate(self) -> bool:
         """
@@ -60,12 +437,25 @@ class GeminiLLM:
                 logger.warning("✗ Gemini API key not found")
                 return False
             
+            # Import the SDK only now that we know it's needed (sys.modules makes
+            # re-authentication free)
+            try:
+                import google.generativeai as genai
+            except ImportError:
+                logger.warning("✗ google-generativeai not installed (pip install google-generativeai)")
+                return False
+            self._genai = genai
+            
             # Configure Gemini
+            # The default transport is already gRPC (grpc_asyncio for the async API), and
+            # genai caches its clients module-wide, so every call shares one HTTP/2 channel.
+            # Don't pin transport='grpc' here - it would also be forced on the async client.
             genai.configure(api_key=self.api_key)
             
             # Initialize model
             model_name = get_config('LLM', 'model', default='gemini-2.5-flash-lite')
             self.model = genai.GenerativeModel(model_name)
+            self.model_name = model_name
             
             # Initialize rate limiter
             # Gemini Free Tier: 15 requests per minute
@@ -73,6 +463,61 @@ class GeminiLLM:
             rate_limit = get_int_config('LLM', 'rate_limit', default=15)
             self.rate_limiter = RateLimiter(max_requests=rate_limit, time_window=60.0)
             
+            # Per-request deadline, so a stalled call fails fast into our retry loop
+            self.request_options = {'timeout': get_float_config('LLM', 'request_timeout', default=30.0)}
+            
+            # Read per-call config once
+            self._style_cache = {
+                platform: get_config(platform.title(), 'post_style', default=style).lower()
+                for platform, style in _DEFAULT_STYLES.items()
+            }
+            self._filter_enabled = get_bool_config('LLM', 'enable_filtering', default=False)
+            self._filter_keywords = get_config('LLM', 'filter_keywords', default='')
+            self._filter_keyword_list = [k.strip().lower() for k in self._filter_keywords.split(',') if k.strip()]
+            self._filter_heuristics = get_bool_config('LLM', 'filter_heuristics', default=False)
+            
+            # Example titles for the embedding prototype filter ('|'-separated,
+            # titles often contain commas). Both lists are needed to enable it.
+            self._filter_good_examples = [
+                t.strip() for t in get_config('LLM', 'filter_good_examples', default='').split('|') if t.strip()
+            ]
+            self._filter_bad_examples = [
+                t.strip() for t in get_config('LLM', 'filter_bad_examples', default='').split('|') if t.strip()
+            ]
+            self._filter_margin = get_float_config('LLM', 'filter_prototype_margin', default=0.1)
+            
+            # Assemble prompt templates for the configured styles now, so each
+            # call only has to fill in the video fields
+            self._prompt_templates = {}
+            for platform, style in self._style_cache.items():
+                self._prompt_template(platform, style)
+            self._should_notify_template = None
+            self._build_should_notify_template()
+            self.embedding_model = get_config('LLM', 'embedding_model', default='models/text-embedding-004')
+            
+            # One-word answers (sentiment, yes/no) only need a few output tokens.
+            # Thinking models (gemini-2.5-flash/pro) spend output tokens on reasoning
+            # first, so the cap can be turned off for them with LLM.limit_output_tokens.
+            self._limit_output_tokens = get_bool_config('LLM', 'limit_output_tokens', default=True)
+            if self._limit_output_tokens:
+                self._short_answer_config = _SHORT_ANSWER_CONFIG
+            
+            # Max in-flight requests for the async API
+            self.max_concurrency = max(1, get_int_config('LLM', 'max_concurrency', default=8))
+            
+            # Initialize response cache (exact match, plus optional semantic tier)
+            cache_path = get_config('LLM', 'cache_path', default=str(DEFAULT_CACHE_PATH))
+            self._cache_dir = Path(cache_path).expanduser().parent if cache_path else DEFAULT_CACHE_PATH.parent
+            if get_bool_config('LLM', 'enable_cache', default=True):
+                self.cache = LLMCache.shared(
+                    path=cache_path or None,
+                    max_entries=get_int_config('LLM', 'cache_size', default=2000),
+                    semantic_threshold=get_float_config('LLM', 'semantic_cache_threshold', default=0.95),
+                    video_ttl=get_float_config('LLM', 'video_cache_ttl_hours', default=168.0) * 3600,
+                    ttl=get_float_config('LLM', 'cache_ttl', default=1800.0)
+                )
+                self.semantic_cache = get_bool_config('LLM', 'semantic_cache', default=False)
+            
             self.enabled = True
             logger.info(f"✓ Gemini LLM initialized ({model_name}, {rate_limit} req/min)")
             return True
@@ -82,7 +527,271 @@ class GeminiLLM:
             self.enabled = False
             return False
     
-    def _generate_with_retry(self, prompt: str, max_retries: int = 3, initial_delay: float = 2.0) -> Optional[str]:
+    def _embed(self, text: str) -> Optional[list]:
+        """
+        Get an embedding vector for the semantic cache tier and prototype filter.
+        
+        The last few vectors are memoized, so the filter and the semantic cache
+        share one embed call per video.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector or None on error
+        """
+        vector = self._embed_memo.get(text)
+        if vector is not None:
+            return vector
+        try:
+            result = self._genai.embed_content(model=self.embedding_model, content=text)
+        except Exception as e:
+            logger.debug("Embedding failed, skipping semantic cache: %s", e)
+            return None
+        return self._remember_embedding(text, result['embedding'])
+    
+    def _remember_embedding(self, text: str, vector: list) -> list:
+        """Memoize an embedding vector (small LRU)."""
+        self._embed_memo[text] = vector
+        while len(self._embed_memo) > 64:
+            self._embed_memo.popitem(last=False)
+        return vector
+    
+    def _semantic_text(self, video_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the text used as the semantic cache key for a video.
+        
+        Args:
+            video_data: Video information dict
+            
+        Returns:
+            Title plus cleaned description, or None if the semantic tier is off
+        """
+        if not self.semantic_cache:
+            return None
+        return self._embedding_text(video_data)
+    
+    def _embedding_text(self, video_data: Dict[str, Any]) -> str:
+        """Title plus cleaned description - the text we embed for a video."""
+        title = video_data.get('title', '')
+        cleaned_desc = self._cleaned_description(video_data)
+        return f"{title}\n{cleaned_desc}"
+    
+    def _cache_lookup(self, prompt: str, task: str, vector: Optional[list]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look a request up in the response cache.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            task: Task name used to namespace cache entries
+            vector: Embedding for the semantic tier (None to skip it)
+            
+        Returns:
+            Tuple of (cached response or None, exact-tier cache key)
+        """
+        if not self.cache:
+            return None, None
+        
+        cache_key = self.cache.make_key(task, self.model_name or '', prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("💾 LLM cache hit (%s)", task)
+            return cached, cache_key
+        
+        if vector:
+            cached = self.cache.get_similar(task, vector)
+            if cached is not None:
+                logger.debug("💾 LLM semantic cache hit (%s)", task)
+                self.cache.set(cache_key, task, cached)
+                return cached, cache_key
+        
+        return None, cache_key
+    
+    def _cache_store(self, cache_key: Optional[str], task: str, vector: Optional[list], result: Optional[str]) -> None:
+        """Store a fresh response in both cache tiers."""
+        if not self.cache or not cache_key or not result:
+            return
+        self.cache.set(cache_key, task, result)
+        if vector:
+            self.cache.add_similar(task, vector, result)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached LLM responses (memory and disk)."""
+        if self.cache:
+            self.cache.clear()
+            logger.info("🗑 LLM cache cleared")
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache counters for this run.
+        
+        Returns:
+            Dict with hits, semantic_hits, misses, hit_rate and entry counts
+            (empty if the cache is disabled)
+        """
+        return self.cache.stats() if self.cache else {}
+    
+    def _length_config(self, max_chars: int) -> Optional[Dict[str, Any]]:
+        """
+        Generation config that stops Gemini soon after max_chars of output.
+        
+        We trim summaries and posts to length afterwards anyway; this stops
+        paying (and waiting) for tokens that would be thrown away.
+        
+        Args:
+            max_chars: Length the prompt asks for
+            
+        Returns:
+            Generation config, or None when LLM.limit_output_tokens is off
+        """
+        if not self._limit_output_tokens:
+            return None
+        # A handful of distinct limits, so build each config once and reuse it
+        config = self._length_configs.get(max_chars)
+        if config is None:
+            config = self._length_configs[max_chars] = {
+                'max_output_tokens': math.ceil(max_chars / _CHARS_PER_TOKEN)
+            }
+        return config
+    
+    def _generate_with_retry(self, prompt: str, max_retries: int = 3, initial_delay: float = 2.0,
+                             task: str = 'generate', semantic_text: Optional[str] = None,
+                             generation_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Generate content, serving repeated requests from the response cache.
+        
+        Exact matches are keyed by (task, model, prompt). When the semantic tier
+        is enabled and semantic_text is given, near-identical content for the same
+        task is also served from cache. On a miss, concurrent callers with the same
+        request wait for the first one's response instead of sending their own.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            max_retries: Maximum number of retry attempts (default: 3)
+            initial_delay: Initial delay in seconds between retries (default: 2.0)
+            task: Task name used to namespace cache entries
+            semantic_text: Content to embed for the semantic cache tier
+            generation_config: Optional Gemini generation config (JSON mode, token limits, ...)
+            
+        Returns:
+            Generated text or None on failure
+        """
+        vector = None
+        if self.cache and self.semantic_cache and semantic_text:
+            vector = self._embed(semantic_text)
+        
+        cached, cache_key = self._cache_lookup(prompt, task, vector)
+        if cached is not None:
+            return cached
+        
+        flight_key = cache_key or LLMCache.make_key(task, self.model_name or '', prompt)
+        with self._inflight_lock:
+            future = self._inflight.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._inflight[flight_key] = Future()
+        if not leader:
+            logger.debug("⏳ Waiting for identical in-flight request (%s)", task)
+            return future.result()
+        
+        result = None
+        try:
+            result = self._generate_uncached(prompt, max_retries, initial_delay, generation_config)
+            self._cache_store(cache_key, task, vector, result)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[flight_key]
+            future.set_result(result)
+        return result
+    
+    @staticmethod
+    def _decode_response(result: str) -> str:
+        """
+        Fix escaped newlines and other escape sequences in a response.
+        
+        Sometimes LLM returns strings with literal \\n instead of actual newlines.
+        This is a common issue when LLM treats the output as a string representation.
+        Note: This is safe for our use case (social media posts) as we don't expect
+        file paths or other content with legitimate backslash-n sequences.
+        
+        Args:
+            result: Stripped response text
+            
+        Returns:
+            Decoded response text
+        """
+        if '\\n' in result:
+            logger.debug("Detected escaped newlines in LLM response, decoding...")
+            
+            # First, remove quotes if response is wrapped (indicates string representation)
+            if (result.startswith('"') and result.endswith('"')) or \
+               (result.startswith("'") and result.endswith("'")):
+                result = result[1:-1]
+            
+            # Then decode common escape sequences (one pass)
+            result = _ESCAPE_RE.sub(_unescape_match, result)
+            
+            result = result.strip()
+        
+        return result
+    
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """
+        Get the server-suggested retry delay from an API error, if any.
+        
+        Checks a Retry-After header (REST), a google.rpc.RetryInfo detail (gRPC)
+        and the "Please retry in 12.3s" hint in Gemini's quota error message.
+        
+        Args:
+            error: Exception raised by the API call
+            
+        Returns:
+            Seconds to wait, or None
+        """
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if headers:
+            try:
+                return float(headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                pass
+        
+        for detail in getattr(error, 'details', None) or []:
+            retry_delay = getattr(detail, 'retry_delay', None)
+            if retry_delay is not None:
+                return retry_delay.seconds + retry_delay.nanos / 1e9
+        
+        match = _RETRY_IN_RE.search(str(error))
+        return float(match.group(1)) if match else None
+    
+    def _transient_error_delay(self, error: Exception) -> float:
+        """
+        Handle a transient API error before retrying.
+        
+        Rate-limit errors slow the rate limiter down, and the server's
+        Retry-After (if any) becomes the minimum wait.
+        
+        Args:
+            error: Exception raised by the API call
+            
+        Returns:
+            Minimum seconds to wait before the next attempt (0 if no hint)
+        """
+        if not _RATE_LIMIT_ERROR_RE.search(str(error)):
+            return 0.0
+        if self.rate_limiter:
+            self.rate_limiter.on_failure()
+        return min(self._retry_after(error) or 0.0, _MAX_RETRY_AFTER)
+    
+    @staticmethod
+    def _is_permanent_error(error: Exception) -> bool:
+        """Check whether an API error is not worth retrying."""
+        error_str = str(error).lower()
+        return any(perm in error_str for perm in ['invalid', 'unauthorized', 'forbidden', 'blocked'])
+    
+    def _generate_uncached(self, prompt: str, max_retries: int = 3, initial_delay: float = 2.0,
+                           generation_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Generate content with exponential backoff retry logic and rate limiting.
         
@@ -90,11 +799,11 @@ class GeminiLLM:
             prompt: The prompt to send to Gemini
             max_retries: Maximum number of retry attempts (default: 3)
             initial_delay: Initial delay in seconds between retries (default: 2.0)
+            generation_config: Optional Gemini generation config
             
         Returns:
             Generated text or None on failure
         """
-        last_error = None
         delay = initial_delay
         
         for attempt in range(max_retries):
@@ -103,7 +812,7 @@ class GeminiLLM:
                 if self.rate_limiter:
                     wait_time = self.rate_limiter.get_wait_time()
                     if wait_time > 0:
-                        logger.debug(f"⏱ Rate limit: waiting {wait_time:.1f}s before API call...")
+                        logger.debug("⏱ Rate limit: waiting %.1fs before API call...", wait_time)
                     
                     # Acquire token (will block if rate limit reached)
                     if not self.rate_limiter.acquire(timeout=30.0):
@@ -111,43 +820,23 @@ class GeminiLLM:
                         return None
                 
                 # Make API call
-                response = self.model.generate_content(prompt)
-                result = response.text.strip()
-                
-                # Fix escaped newlines and other escape sequences
-                # Sometimes LLM returns strings with literal \n instead of actual newlines
-                # This is a common issue when LLM treats the output as a string representation
-                # Note: This is safe for our use case (social media posts) as we don't expect
-                # file paths or other content with legitimate backslash-n sequences
-                if '\\n' in result:
-                    logger.debug("Detected escaped newlines in LLM response, decoding...")
-                    
-                    # First, remove quotes if response is wrapped (indicates string representation)
-                    if (result.startswith('"') and result.endswith('"')) or \
-                       (result.startswith("'") and result.endswith("'")):
-                        result = result[1:-1]
-                    
-                    # Then decode common escape sequences
-                    result = result.replace('\\n', '\n')
-                    result = result.replace('\\t', '\t')
-                    result = result.replace('\\r', '\r')
-                    
-                    result = result.strip()
-                
-                return result
+                response = self.model.generate_content(
+                    prompt, generation_config=generation_config, request_options=self.request_options
+                )
+                if self.rate_limiter:
+                    self.rate_limiter.on_success()
+                return self._decode_response(response.text.strip())
                 
             except Exception as e:
-                last_error = e
-                error_str = str(e).lower()
-                
                 # Don't retry on permanent errors
-                if any(perm in error_str for perm in ['invalid', 'unauthorized', 'forbidden', 'blocked']):
+                if self._is_permanent_error(e):
                     logger.error("Gemini API permanent error")
                     return None
                 
                 # Retry on transient errors (rate limit, network, timeout, etc.)
                 if attempt < max_retries - 1:
                     logger.warning(f"Gemini API error (attempt {attempt + 1}/{max_retries})")
+                    delay = max(delay, self._transient_error_delay(e))
                     logger.info(f"Retrying in {delay:.1f}s...")
                     time.sleep(delay)
                     delay *= 2  # Exponential backoff
@@ -171,81 +860,98 @@ class GeminiLLM:
         if not description:
             return ""
         
-        # Remove URLs (http/https)
-        cleaned = re.sub(r'https?://[^\s]+', '', description)
-        
-        # Remove social media handles (@username, @handle)
-        cleaned = re.sub(r'@\w+', '', cleaned)
-        
-        # Remove common sponsor/tip keywords and their surrounding text
-        sponsor_patterns = [
-            r'(?i)sponsor(?:ed|s)?\s*(?:by|:)?[^\n]*',
-            r'(?i)support\s+(?:me|us)\s+on[^\n]*',
-            r'(?i)patreon[^\n]*',
-            r'(?i)ko-fi[^\n]*',
-            r'(?i)buy\s+me\s+a\s+coffee[^\n]*',
-            r'(?i)tip\s+jar[^\n]*',
-            r'(?i)donate[^\n]*',
-            r'(?i)merch[^\n]*',
-            r'(?i)affiliate[^\n]*',
-            r'(?i)discord\s+server[^\n]*',
-            r'(?i)join\s+(?:my|our)\s+discord[^\n]*',
-        ]
-        
-        for pattern in sponsor_patterns:
-            cleaned = re.sub(pattern, '', cleaned)
-        
-        # Remove "Follow me on" type lines
-        cleaned = re.sub(r'(?i)follow\s+(?:me|us)\s+on[^\n]*', '', cleaned)
-        cleaned = re.sub(r'(?i)find\s+me\s+on[^\n]*', '', cleaned)
-        cleaned = re.sub(r'(?i)connect\s+with\s+me[^\n]*', '', cleaned)
-        
-        # Remove multiple newlines and excessive whitespace
-        cleaned = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned)
-        cleaned = re.sub(r'[ \t]+', ' ', cleaned)
-        
-        # Remove leading/trailing whitespace
-        cleaned = cleaned.strip()
+        cleaned = self._stripped_description(description)
         
         # Truncate to max length
         if len(cleaned) > max_length:
-            cleaned = cleaned[:max_length].rsplit(' ', 1)[0] + "..."
+            cleaned = _truncate_at_word(cleaned, max_length)
         
         return cleaned
     
-    def generate_summary(self, video_data: Dict[str, Any], max_length: int = 200) -> Optional[str]:
+    @staticmethod
+    def _strip_description(description: str) -> str:
+        """Remove promotional content and collapse whitespace (no truncation)."""
+        # Remove URLs, social media handles (@username) and sponsor/tip/"follow me on"
+        # lines in a single pass
+        cleaned = _STRIP_RE.sub('', description)
+        
+        # Remove multiple newlines and excessive whitespace
+        cleaned = _MULTINL_RE.sub('\n\n', cleaned)
+        cleaned = _WS_RE.sub(' ', cleaned)
+        
+        # Remove leading/trailing whitespace
+        return cleaned.strip()
+    
+    def _stripped_description(self, description: str) -> str:
         """
-        Generate a concise summary of video content.
+        _strip_description() memoized per description (small LRU).
+        
+        A video's description is cleaned for the semantic cache text and again
+        for every per-platform prompt, so the regex passes only run once.
         
         Args:
-            video_data: Video information dict (title, description, etc.)
-            max_length: Maximum summary length in characters
+            description: Raw video description
             
         Returns:
-            Generated summary or None on error
+            Stripped description text
         """
-        if not self.enabled or not self.model:
-            return None
+        cleaned = self._strip_memo.get(description)
+        if cleaned is not None:
+            self._strip_memo.move_to_end(description)
+            return cleaned
+        cleaned = self._strip_description(description)
+        self._strip_memo[description] = cleaned
+        while len(self._strip_memo) > 64:
+            self._strip_memo.popitem(last=False)
+        return cleaned
+    
+    def _cleaned_description(self, video_data: Dict[str, Any], max_length: int = 500) -> str:
+        """clean_description() for a video dict."""
+        return self.clean_description(video_data.get('description', ''), max_length)
+    
+    def _summary_prompt(self, video_data: Dict[str, Any], max_length: int) -> str:
+        """Build the generate_summary prompt."""
+        title = video_data.get('title', '')
+        description = video_data.get('description', '')
         
-        try:
-            title = video_data.get('title', '')
-            description = video_data.get('description', '')
-            
-            prompt = f"""Analyze this video and create a brief, engaging summary in {max_length} characters or less:
+        return f"""Analyze this video and create a brief, engaging summary in {max_length} characters or less:
 
 Title: {title}
 Description: {description[:500]}
 
 Create a concise summary that captures the main topic and would make people want to watch. Be enthusiastic but professional."""
-
-            summary = self._generate_with_retry(prompt)
+    
+    def generate_summary(self, video_data: Dict[str, Any], max_length: int = 200) -> Optional[str]:
+        """
+        Generate a concise summary of video content.
+        
+        Args:
+            video_data: Video information dict (title, description, etc.)
+            max_length: Maximum summary length in characters
+            
+        Returns:
+            Generated summary or None on error
+        """
+        if not self.enabled or not self.model:
+            return None
+        
+        summary = self._get_batched(video_data, 'summary')
+        if summary:
+            return summary if len(summary) <= max_length else _truncate_at_word(summary, max_length - 3)
+        
+        try:
+            summary = self._generate_with_retry(
+                self._summary_prompt(video_data, max_length),
+                task=f'summary:{max_length}', semantic_text=self._semantic_text(video_data),
+                generation_config=self._length_config(max_length)
+            )
             
             if summary:
                 # Ensure length limit
                 if len(summary) > max_length:
-                    summary = summary[:max_length-3] + "..."
+                    summary = _truncate_at_word(summary, max_length - 3)
                 
-                logger.debug(f"Generated summary: {summary[:50]}...")
+                logger.debug("Generated summary: %.50s...", summary)
                 return summary
             
             return None
@@ -254,6 +960,18 @@ Create a concise summary that captures the main topic and would make people want
             logger.error("Error generating summary")
             return None
     
+    def _hashtags_prompt(self, video_data: Dict[str, Any], max_tags: int) -> str:
+        """Build the generate_hashtags prompt."""
+        title = video_data.get('title', '')
+        description = video_data.get('description', '')
+        
+        return f"""Generate {max_tags} relevant, popular hashtags for this video. Return ONLY the hashtags separated by spaces, with # prefix.
+
+Title: {title}
+Description: {description[:300]}
+
+Example format: #Tech #Gaming #Tutorial #AI #Programming"""
+    
     def generate_hashtags(self, video_data: Dict[str, Any], max_tags: int = 5) -> Optional[str]:
         """
         Generate relevant hashtags for the video.
@@ -268,29 +986,300 @@ Create a concise summary that captures the main topic and would make people want
         if not self.enabled or not self.model:
             return None
         
+        hashtags = self._get_batched(video_data, 'hashtags')
+        if hashtags:
+            return ' '.join(hashtags.split()[:max_tags])
+        
         try:
-            title = video_data.get('title', '')
-            description = video_data.get('description', '')
+            hashtags = self._generate_with_retry(
+                self._hashtags_prompt(video_data, max_tags),
+                task=f'hashtags:{max_tags}', semantic_text=self._semantic_text(video_data),
+                generation_config=self._length_config(max_tags * 20)
+            )
+            
+            if hashtags:
+                logger.debug("Generated hashtags: %s", hashtags)
+                return hashtags
+            
+            return None
             
-            prompt = f"""Generate {max_tags} relevant, popular hashtags for this video. Return ONLY the hashtags separated by spaces, with # prefix.
+        except Exception as e:
+            logger.error("Error generating hashtags")
+            return None
+    
+    def _get_batched(self, video_data: Dict[str, Any], field: str, default: Any = None) -> Any:
+        """
+        Get a result produced by process_video() for this video.
+        
+        Args:
+            video_data: Video information dict
+            field: Result field (summary, hashtags, sentiment, should_notify, posts)
+            default: Value to return if not batched
+            
+        Returns:
+            Batched value or default
+        """
+        batched = video_data.get('_llm_cache')
+        if not batched:
+            return default
+        value = batched.get(field)
+        return default if value is None else value
+    
+    def _process_video_prompt(self, video_data: Dict[str, Any], platforms: List[str], styles: Dict[str, str],
+                              platform_name: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the process_video prompt and JSON-mode generation config.
+        
+        Returns:
+            Tuple of (prompt, generation_config)
+        """
+        title = video_data.get('title', '')
+        cleaned_desc = self._cleaned_description(video_data, max_length=400)
+        filter_keywords = self._filter_keywords
+        
+        post_sections = []
+        for social_platform in platforms:
+            post_style, style_instruction = self._get_post_style(social_platform, styles.get(social_platform))
+            rules = _BATCH_POST_RULES.get(social_platform, "Under 280 characters.")
+            post_sections.append(f"   - {social_platform} ({post_style} style: {style_instruction}) {rules}")
+        
+        prompt = f"""Analyze this new {platform_name} video and complete every task below. Respond with a single JSON object.
 
 Title: {title}
-Description: {description[:300]}
-
-Example format: #Tech #Gaming #Tutorial #AI #Programming"""
+Description: {cleaned_desc}
 
-            hashtags = self._generate_with_retry(prompt)
+1. summary: A brief, engaging summary in 200 characters or less. Enthusiastic but professional.
+2. hashtags: 5 relevant, popular hashtags, each with # prefix.
+3. sentiment: ONE WORD from: {', '.join(_SENTIMENTS)}.
+4. should_notify: false if the video is spam, clickbait, low-quality or off-topic{f' or contains: {filter_keywords}' if filter_keywords else ''}; otherwise true.
+5. posts: One announcement per platform below. NO URLs or placeholder links (the real URL is added automatically), NO greetings, NO meta text.
+{chr(10).join(post_sections) if post_sections else '   (none)'}"""
+        
+        # The schema does the validation: a fixed sentiment label and a bounded
+        # hashtag list come back well-formed instead of being checked afterwards
+        protos = self._genai.protos
+        string_type = protos.Schema(type=protos.Type.STRING)
+        properties = {
+            'summary': string_type,
+            'hashtags': protos.Schema(type=protos.Type.ARRAY, items=string_type, min_items=1, max_items=5),
+            'sentiment': protos.Schema(type=protos.Type.STRING, format='enum', enum=list(_SENTIMENTS)),
+            'should_notify': protos.Schema(type=protos.Type.BOOLEAN),
+        }
+        if platforms:
+            properties['posts'] = protos.Schema(
+                type=protos.Type.OBJECT,
+                properties={p: string_type for p in platforms},
+                required=platforms
+            )
+        schema = protos.Schema(
+            type=protos.Type.OBJECT,
+            properties=properties,
+            required=list(properties)
+        )
+        
+        return prompt, {'response_mime_type': 'application/json', 'response_schema': schema}
+    
+    def _store_batched(self, video_data: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """
+        Parse a process_video response and memoize it on video_data.
+        
+        Args:
+            video_data: Video information dict
+            response: JSON response text
             
-            if hashtags:
-                logger.debug(f"Generated hashtags: {hashtags}")
-                return hashtags
+        Returns:
+            Parsed result dict
+        """
+        # json_loads tolerates real newlines in strings: escape-sequence cleanup
+        # may have turned \\n into them
+        result = json_loads(response)
+        if not isinstance(result, dict):
+            raise ValueError("batched response is not a JSON object")
+        result['posts'] = {k.lower(): v for k, v in (result.get('posts') or {}).items() if v}
+        if isinstance(result.get('hashtags'), list):
+            result['hashtags'] = ' '.join(result['hashtags'])
+        
+        video_data['_llm_cache'] = result
+        url = video_data.get('url')
+        if self.cache and url:
+            self.cache.set_video(url, result)
+        logger.info("✨ Batch-processed video (%d posts): %.50s", len(result['posts']), video_data.get('title', ''))
+        return result
+    
+    def _cached_batch(self, video_data: Dict[str, Any], platforms: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Find an earlier process_video result covering these platforms.
+        
+        Checks the memo on video_data, then the per-URL cache (which survives
+        restarts and re-polls of the same video).
+        
+        Args:
+            video_data: Video information dict
+            platforms: Social platforms a post is needed for
             
+        Returns:
+            Result dict or None
+        """
+        batched = video_data.get('_llm_cache')
+        if batched and all(p in batched.get('posts', {}) for p in platforms):
+            return batched
+        
+        url = video_data.get('url')
+        if self.cache and url:
+            batched = self.cache.get_video(url)
+            if batched and all(p in batched.get('posts', {}) for p in platforms):
+                logger.debug("💾 LLM video cache hit: %s", url)
+                video_data['_llm_cache'] = batched
+                return batched
+        return None
+    
+    def process_video(self, video_data: Dict[str, Any], platforms: Optional[List[str]] = None,
+                      styles: Optional[Dict[str, str]] = None, platform_name: str = 'YouTube') -> Optional[Dict[str, Any]]:
+        """
+        Run every per-video task in a single JSON-mode request.
+        
+        Produces summary, hashtags, sentiment, the filtering decision, and one post
+        per social platform. The result is memoized on video_data['_llm_cache'] so
+        the individual methods (generate_summary, enhance_notification, ...) become
+        dict lookups instead of separate API calls.
+        
+        Args:
+            video_data: Video information dict (title, description, url, etc.)
+            platforms: Social platforms to write posts for (discord, matrix, bluesky, mastodon)
+            styles: Optional post style per platform (defaults to configured styles)
+            platform_name: Source platform name (YouTube, TikTok, etc.)
+            
+        Returns:
+            Dict with summary, hashtags, sentiment, should_notify and posts, or None on error
+        """
+        if not self.enabled or not self.model:
             return None
+        
+        platforms = [p.lower() for p in (platforms or [])]
+        styles = {k.lower(): v.lower() for k, v in (styles or {}).items()}
+        
+        batched = self._cached_batch(video_data, platforms)
+        if batched:
+            return batched
+        
+        # A filter-keyword hit means nothing will be posted - don't spend a request on it
+        if self._filter_enabled and self._match_filter_keyword(video_data):
+            return None
+        
+        try:
+            prompt, generation_config = self._process_video_prompt(video_data, platforms, styles, platform_name)
+            
+            response = self._generate_with_retry(
+                prompt,
+                task=f'process_video:{platform_name.lower()}:{",".join(platforms)}',
+                generation_config=generation_config
+            )
+            if not response:
+                logger.warning("Failed to batch-process video, falling back to per-task requests")
+                return None
+            
+            return self._store_batched(video_data, response)
             
         except Exception as e:
-            logger.error("Error generating hashtags")
+            logger.error(f"Error batch-processing video: {e}")
             return None
     
+    def _get_post_style(self, social_platform: str, post_style: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Get the configured posting style for a social platform.
+        
+        Args:
+            social_platform: Target social platform (discord, matrix, bluesky, mastodon)
+            post_style: Explicit style overriding the configured one
+            
+        Returns:
+            Tuple of (style name, style instruction for the prompt)
+        """
+        if not post_style:
+            social_platform_lower = social_platform.lower()
+            post_style = self._style_cache.get(social_platform_lower)
+            if post_style is None:
+                post_style = get_config(
+                    social_platform.title(),
+                    'post_style',
+                    default=_DEFAULT_STYLES.get(social_platform_lower, 'conversational')
+                ).lower()
+                self._style_cache[social_platform_lower] = post_style
+        
+        return post_style, _STYLE_INSTRUCTIONS.get(post_style, _STYLE_INSTRUCTIONS['conversational'])
+    
+    def _finalize_notification(self, notification: str, url: str, social_platform: str) -> str:
+        """
+        Clean up raw LLM post text and attach the video URL.
+        
+        Args:
+            notification: Raw LLM output
+            url: Video URL to append
+            social_platform: Target social platform (lowercase)
+            
+        Returns:
+            Post text ready to publish
+        """
+        # Clean up common LLM meta-text patterns and any URLs the LLM
+        # might have included (we add the real one)
+        notification = _POST_CLEAN_RE.sub('', notification).strip()
+        
+        # BLUESKY: Enforce hard character limit BEFORE adding URL
+        # Bluesky limit is 300 graphemes. URL is ~43 chars + 2 newlines = 45
+        # Leave buffer for grapheme counting differences (emojis, etc.)
+        if social_platform == 'bluesky':
+            max_content_length = _BLUESKY_CONTENT_LIMIT
+            if len(notification) > max_content_length:
+                truncated = _truncate_for_bluesky(notification, max_content_length)
+                if truncated != notification:
+                    logger.warning(f"Bluesky content too long ({len(notification)} chars), truncating to {max_content_length}")
+                    notification = truncated
+        
+        # Ensure URL is included (should be from LLM, but double-check)
+        if url and url not in notification:
+            notification += f"\n\n{url}"
+        
+        return notification
+    
+    def _prompt_template(self, social_platform_lower: str, post_style: str) -> str:
+        """
+        Get the enhance_notification template for a (platform, style) pair.
+        
+        Style and platform limits are filled in once; the result only has
+        {platform_name}, {title} and {cleaned_desc} left.
+        
+        Args:
+            social_platform_lower: Target social platform (lowercase)
+            post_style: Posting style name
+            
+        Returns:
+            Prompt template for str.format()
+        """
+        key = (social_platform_lower, post_style)
+        template = self._prompt_templates.get(key)
+        if template is None:
+            style_instruction = _STYLE_INSTRUCTIONS.get(post_style, _STYLE_INSTRUCTIONS['conversational'])
+            template = _PROMPTS.get(social_platform_lower, _FALLBACK_PROMPT)
+            for name, value in (('post_style', post_style),
+                                ('style_instruction', style_instruction),
+                                ('bluesky_content_limit', str(_BLUESKY_CONTENT_LIMIT)),
+                                ('mastodon_content_limit', str(_MASTODON_CONTENT_LIMIT))):
+                template = template.replace('{%s}' % name, _escape_braces(value))
+            self._prompt_templates[key] = template
+        return template
+    
+    def _notification_prompt(self, video_data: Dict[str, Any], platform_name: str, social_platform_lower: str,
+                             post_style: str) -> str:
+        """Build the enhance_notification prompt for one social platform."""
+        # Clean description to remove sponsor links, URLs, etc.
+        cleaned_desc = self._cleaned_description(video_data, max_length=400)
+        
+        return self._prompt_template(social_platform_lower, post_style).format(
+            platform_name=platform_name,
+            title=video_data.get('title', ''),
+            cleaned_desc=cleaned_desc
+        )
+    
     def generate_notification(self, video_data: dict, platform_name: str, social_platform: str) -> Optional[str]:
         """
         Generate a platform-specific notification message (unified interface).
@@ -306,6 +1295,32 @@ Example format: #Tech #Gaming #Tutorial #AI #Programming"""
         """
         return self.enhance_notification(video_data, platform_name, social_platform)
     
+    def generate_all_notifications(self, video_data: Dict[str, Any], platform_name: str,
+                                   targets: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Generate posts for several social platforms with one Gemini request.
+        
+        Uses the JSON-mode process_video() request, which writes every post at
+        once, then applies the usual per-platform cleanup. Platforms missing from
+        the JSON fall back to their own enhance_notification() request.
+        
+        Args:
+            video_data: Video information dict (title, description, url, etc.)
+            platform_name: Source platform name (YouTube, TikTok, etc.)
+            targets: Social platforms to write posts for (discord, matrix, bluesky, mastodon)
+            
+        Returns:
+            Dict of social platform (lowercase) -> post text, or None where generation failed
+        """
+        if not self.enabled or not self.model:
+            return {target.lower(): None for target in targets}
+        
+        self.process_video(video_data, platforms=targets, platform_name=platform_name)
+        return {
+            target.lower(): self.enhance_notification(video_data, platform_name, target)
+            for target in targets
+        }
+    
     def enhance_notification(self, video_data: Dict[str, Any], platform_name: str, social_platform: str) -> Optional[str]:
         """
         Generate a platform-specific enhanced notification message with AI.
@@ -323,184 +1338,49 @@ Example format: #Tech #Gaming #Tutorial #AI #Programming"""
             return None
         
         try:
-            title = video_data.get('title', '')
-            description = video_data.get('description', '')
             url = video_data.get('url', '')
             
-            # Clean description to remove sponsor links, URLs, etc.
-            cleaned_desc = self.clean_description(description, max_length=400)
-            
             # Get platform-specific posting style from config
             social_platform_lower = social_platform.lower()
+            post_style, _ = self._get_post_style(social_platform)
             
-            # Default styles per platform
-            default_styles = {
-                'discord': 'conversational',
-                'matrix': 'professional',
-                'bluesky': 'conversational',
-                'mastodon': 'detailed'
-            }
-            
-            post_style = get_config(
-                social_platform.title(),
-                'post_style',
-                default=default_styles.get(social_platform_lower, 'conversational')
-            ).lower()
-            
-            # Style-specific instructions
-            style_instructions = {
-                'professional': "Use a formal, clear, business-like tone. Be informative and direct.",
-                'conversational': "Use a casual, friendly, community-focused tone. Be warm and approachable.",
-                'detailed': "Provide comprehensive context and explanation. Be thorough and informative.",
-                'concise': "Be brief and to-the-point. Use minimal text while staying engaging."
-            }
+            # Already generated by process_video() for this video?
+            batched = self._get_batched(video_data, 'posts', {}).get(social_platform_lower)
+            if batched:
+                notification = self._finalize_notification(batched, url, social_platform_lower)
+                logger.info("✨ Generated %s post (%s style, batched): %.60s...", social_platform, post_style, notification)
+                return notification
             
-            style_instruction = style_instructions.get(post_style, style_instructions['conversational'])
-            
-            # Platform-specific prompts
-            if social_platform_lower == 'discord':
-                prompt = f"""Create an engaging Discord announcement for this new {platform_name} video.
-
-Title: {title}
-Description: {cleaned_desc}
-
-Style: {post_style}
-{style_instruction}
-
-Discord-specific guidelines:
-- NO hashtags (Discord doesn't use them)
-- NO platform greetings like "Hey Discord!" or "Hello everyone!" - just get to the content
-- NO placeholder URLs like "[YouTube Link]" or "youtu.be/your_youtube_link_here" - the actual URL will be added automatically
-- End with an invitation to watch/discuss
-- Keep it under 300 characters (URL will be added separately)
-
-Write the announcement now WITHOUT including any URLs:"""
-
-            elif social_platform_lower == 'matrix':
-                prompt = f"""Create a Matrix/Element announcement for this new {platform_name} video.
-
-Title: {title}
-Description: {cleaned_desc}
-
-Style: {post_style}
-{style_instruction}
-
-Matrix-specific guidelines:
-- NO hashtags (Matrix doesn't use them)
-- NO platform greetings like "Hey Matrix!" - just get to the content
-- NO placeholder URLs like "[VIDEO_ID]" or "youtube.com/watch?v=[VIDEO_ID]" - the actual URL will be added automatically
-- Focus on the content value
-- Keep it under 350 characters (URL will be added separately)
-
-Write the announcement now WITHOUT including any URLs:"""
-
-            elif social_platform_lower == 'bluesky':
-                # Bluesky has 300 GRAPHEME limit (not bytes). YouTube URLs are ~43 chars.
-                # 300 total - 43 URL - 2 newlines - 5 buffer = 250 chars for content
-                # Being conservative because emojis count as multiple graphemes
-                bluesky_content_limit = 250
-                prompt = f"""Create a SHORT Bluesky post for this new {platform_name} video.
-
-Title: {title}
-
-Style: {post_style}
-{style_instruction}
-
-BLUESKY RULES (MUST FOLLOW):
-- ABSOLUTE MAXIMUM: {bluesky_content_limit} characters total (this is NON-NEGOTIABLE)
-- The URL will be added automatically - DO NOT include any URLs
-- Include 2-3 SHORT hashtags at the end (counts toward limit)
-- NO greetings, NO meta text, NO placeholder URLs
-- Emojis count as 2+ characters each - use sparingly
-- Aim for 200-230 characters to be safe
-
-Write ONLY the post text (under {bluesky_content_limit} chars, no URLs):"""
-
-            elif social_platform_lower == 'mastodon':
-                # Mastodon has 500 char limit. YouTube URLs are ~43 chars, so leave room
-                # 500 total - 43 URL - 2 newlines = 455 chars for content
-                prompt = f"""Create an engaging Mastodon toot for this new {platform_name} video.
-
-Title: {title}
-Description: {cleaned_desc}
-
-Style: {post_style}
-{style_instruction}
-
-Mastodon-specific guidelines:
-- CRITICAL: Stay under 455 characters (URL will be added separately, Mastodon limit is 500 total)
-- Count EVERY character including spaces, hashtags, punctuation
-- NO platform greetings like "Hey Mastodon!" - wastes characters
-- NO placeholder URLs like "YOUR_VIDEO_ID" - the actual URL will be added automatically
-- Include 3-5 SHORT hashtags at the end (#Linux not #LinuxForBeginners)
-- Keep main text to ~380 chars to leave room for hashtags
-- If style is 'detailed', be comprehensive but STAY UNDER 455 chars
-
-Write the toot now WITHOUT including any URLs (MUST be under 455 chars):"""
-
-            else:
-                # Fallback for unknown platforms
-                prompt = f"""Create an engaging social media post for this new {platform_name} video.
-
-Title: {title}
-Description: {cleaned_desc}
-
-Style: {post_style}
-{style_instruction}
-
-Keep it under 280 characters, include the URL, and make it clickable.
-
-Write the post now:"""
-
-            notification = self._generate_with_retry(prompt)
+            notification = self._generate_with_retry(
+                self._notification_prompt(video_data, platform_name, social_platform_lower, post_style),
+                task=f'notification:{platform_name.lower()}:{social_platform_lower}:{post_style}',
+                semantic_text=self._semantic_text(video_data),
+                generation_config=self._length_config(
+                    _POST_CHAR_LIMITS.get(social_platform_lower, _FALLBACK_POST_CHAR_LIMIT))
+            )
             if not notification:
                 logger.warning(f"Failed to generate enhanced notification for {social_platform}, using fallback")
                 return None
             
-            # Clean up common LLM meta-text patterns
-            meta_patterns = [
-                r'^(?:Here\'?s|Okay,? here\'?s|Alright,? here\'?s)\s+(?:a|an|your)\s+(?:Bluesky|Mastodon|Discord|Matrix)?\s*(?:post|toot|announcement|draft).*?:?\s*',
-                r'^(?:Here you go|Sure thing|Certainly).*?:?\s*',
-                r'^Draft.*?:?\s*',
-            ]
-            
-            for pattern in meta_patterns:
-                notification = re.sub(pattern, '', notification, flags=re.IGNORECASE | re.MULTILINE)
-            notification = notification.strip()
+            notification = self._finalize_notification(notification, url, social_platform_lower)
             
-            # Remove any URLs the LLM might have included (we add the real one)
-            notification = re.sub(r'https?://[^\s]+', '', notification).strip()
-            
-            # BLUESKY: Enforce hard character limit BEFORE adding URL
-            # Bluesky limit is 300 graphemes. URL is ~43 chars + 2 newlines = 45
-            # Leave buffer for grapheme counting differences (emojis, etc.)
-            if social_platform_lower == 'bluesky':
-                max_content_length = 250  # 300 - 43 URL - 2 newlines - 5 buffer
-                if len(notification) > max_content_length:
-                    logger.warning(f"Bluesky content too long ({len(notification)} chars), truncating to {max_content_length}")
-                    # Try to truncate at a word boundary before the limit
-                    truncated = notification[:max_content_length]
-                    # Find last space to avoid cutting mid-word
-                    last_space = truncated.rfind(' ')
-                    if last_space > max_content_length - 50:  # Only if we don't lose too much
-                        truncated = truncated[:last_space]
-                    # Try to preserve hashtags if they were at the end
-                    hashtag_match = re.search(r'((?:\s*#\w+)+)\s*$', notification)
-                    if hashtag_match and len(truncated) + len(hashtag_match.group(1)) <= max_content_length:
-                        truncated = truncated.rstrip() + hashtag_match.group(1)
-                    notification = truncated.strip()
-            
-            # Ensure URL is included (should be from LLM, but double-check)
-            if url and url not in notification:
-                notification += f"\n\n{url}"
-            
-            logger.info(f"✨ Generated {social_platform} post ({post_style} style): {notification[:60]}...")
+            logger.info("✨ Generated %s post (%s style): %.60s...", social_platform, post_style, notification)
             return notification
             
         except Exception as e:
             logger.error(f"Error generating enhanced notification for {social_platform}")
             return None
     
+    def _sentiment_prompt(self, video_data: Dict[str, Any]) -> str:
+        """Build the analyze_sentiment prompt."""
+        title = video_data.get('title', '')
+        description = video_data.get('description', '')
+        
+        return f"""Analyze the tone/sentiment of this video content. Return ONE WORD only from: {', '.join(_SENTIMENTS)}.
+
+Title: {title}
+Description: {description[:300]}"""
+    
     def analyze_sentiment(self, video_data: Dict[str, Any]) -> Optional[str]:
         """
         Analyze the sentiment/tone of the video content.
@@ -514,28 +1394,178 @@ Write the post now:"""
         if not self.enabled or not self.model:
             return None
         
+        sentiment = self._get_batched(video_data, 'sentiment')
+        if sentiment:
+            return sentiment.strip().lower()
+        
         try:
-            title = video_data.get('title', '')
-            description = video_data.get('description', '')
-            
-            prompt = f"""Analyze the tone/sentiment of this video content. Return ONE WORD only from: positive, negative, neutral, educational, entertainment, news, tutorial, review, comedy, dramatic.
-
-Title: {title}
-Description: {description[:300]}"""
-
-            sentiment = self._generate_with_retry(prompt)
+            sentiment = self._generate_with_retry(
+                self._sentiment_prompt(video_data),
+                task='sentiment', semantic_text=self._semantic_text(video_data),
+                generation_config=self._short_answer_config
+            )
             if not sentiment:
                 logger.warning("Failed to analyze sentiment, returning None")
                 return None
             
             sentiment = sentiment.lower()
-            logger.debug(f"Analyzed sentiment: {sentiment}")
+            logger.debug("Analyzed sentiment: %s", sentiment)
             return sentiment
             
         except Exception as e:
             logger.error("Error analyzing sentiment")
             return None
     
+    def _match_filter_keyword(self, video_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Check title and description against LLM.filter_keywords locally.
+        
+        A keyword hit is a definite reject, so there's no need to ask the LLM.
+        
+        Args:
+            video_data: Video information dict
+            
+        Returns:
+            The first matching keyword, or None
+        """
+        if not self._filter_keyword_list:
+            return None
+        blob = f"{video_data.get('title', '')} {video_data.get('description', '')}".lower()
+        for keyword in self._filter_keyword_list:
+            if keyword in blob:
+                return keyword
+        return None
+    
+    def _local_should_notify(self, video_data: Dict[str, Any]) -> Optional[bool]:
+        """
+        Decide the obvious should_notify cases without calling Gemini.
+        
+        A filter-keyword hit is always a reject. With LLM.filter_heuristics on,
+        a video with a description and a title of ordinary length with no
+        clickbait markers (!!!, mostly caps, emoji spam) is accepted too.
+        
+        Args:
+            video_data: Video information dict
+            
+        Returns:
+            True/False for a confident local decision, None to ask the LLM
+        """
+        title = video_data.get('title', '')
+        keyword = self._match_filter_keyword(video_data)
+        if keyword:
+            logger.info(f"🚫 Filtered out video (keyword '{keyword}'): {title[:50]}...")
+            return False
+        
+        if not self._filter_heuristics or not 10 < len(title) < 100:
+            return None
+        if not video_data.get('description', '').strip():
+            return None
+        if '!!!' in title or '???' in title:
+            return None
+        letters = [c for c in title if c.isalpha()]
+        if len(letters) >= 10 and sum(c.isupper() for c in letters) / len(letters) > 0.6:
+            return None
+        if sum(1 for c in title if ord(c) >= 0x1F000 or 0x2600 <= ord(c) <= 0x27BF) > 5:
+            return None
+        return True
+    
+    def _prototype_path(self) -> Path:
+        """File the filter prototypes are persisted to (next to the response cache)."""
+        return self._cache_dir / 'filter_prototypes.json'
+    
+    def _load_prototypes(self) -> Optional[Tuple[List[float], List[float]]]:
+        """
+        Get the (good, bad) prototype vectors for the embedding filter.
+        
+        Built on first use by embedding LLM.filter_good_examples and
+        LLM.filter_bad_examples, then persisted so restarts don't re-embed them.
+        The saved file is only reused if the model and example lists match.
+        
+        Returns:
+            Tuple of unit-length (good, bad) vectors, or None if unavailable
+        """
+        if self._prototypes is not None or self._prototypes_failed:
+            return self._prototypes
+        if not self._filter_good_examples or not self._filter_bad_examples:
+            self._prototypes_failed = True
+            return None
+        
+        signature = {
+            'model': self.embedding_model,
+            'good': self._filter_good_examples,
+            'bad': self._filter_bad_examples,
+        }
+        path = self._prototype_path()
+        try:
+            saved = json_loads(path.read_text())
+            if saved.get('signature') == signature:
+                self._prototypes = (saved['good'], saved['bad'])
+                return self._prototypes
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        
+        try:
+            good = [self._embed(t) for t in self._filter_good_examples]
+            bad = [self._embed(t) for t in self._filter_bad_examples]
+            if not all(good) or not all(bad):
+                raise ValueError("embedding failed")
+            self._prototypes = (_mean_unit_vector(good), _mean_unit_vector(bad))
+        except Exception as e:
+            logger.warning(f"⚠ Filter prototypes unavailable, using LLM filtering only: {e}")
+            self._prototypes_failed = True
+            return None
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json_dumps({
+                'signature': signature,
+                'good': self._prototypes[0],
+                'bad': self._prototypes[1],
+            }))
+        except OSError as e:
+            logger.debug("Could not persist filter prototypes: %s", e)
+        return self._prototypes
+    
+    def _prototype_decision(self, vector: Optional[list]) -> Optional[bool]:
+        """
+        Classify a video embedding against the good/bad prototypes.
+        
+        Args:
+            vector: Embedding of the video's title and description
+            
+        Returns:
+            True/False when the score is outside the ambiguous band
+            (+/- LLM.filter_prototype_margin), None to fall back to the LLM
+        """
+        if not vector or not self._prototypes:
+            return None
+        good, bad = self._prototypes
+        if len(vector) != len(good):
+            return None
+        unit = _unit_vector(vector)
+        score = sum(a * b for a, b in zip(unit, good)) - sum(a * b for a, b in zip(unit, bad))
+        logger.debug("Filter prototype score: %.3f", score)
+        if score > self._filter_margin:
+            return True
+        if score < -self._filter_margin:
+            return False
+        return None
+    
+    def _build_should_notify_template(self) -> str:
+        """Bake the configured filter keywords into the should_notify template."""
+        if self._should_notify_template is None:
+            filter_keywords = self._filter_keywords
+            keyword_line = f'- Content containing: {_escape_braces(filter_keywords)}' if filter_keywords else ''
+            self._should_notify_template = _SHOULD_NOTIFY_PROMPT % keyword_line
+        return self._should_notify_template
+    
+    def _should_notify_prompt(self, video_data: Dict[str, Any]) -> str:
+        """Build the should_notify prompt."""
+        return self._build_should_notify_template().format(
+            title=video_data.get('title', ''),
+            description=video_data.get('description', '')[:300]
+        )
+    
     def should_notify(self, video_data: Dict[str, Any]) -> bool:
         """
         Use AI to determine if this video is worth notifying about.
@@ -551,30 +1581,36 @@ Description: {description[:300]}"""
             return True  # Default to notifying if LLM not available
         
         # Check if filtering is enabled
-        if not get_bool_config('LLM', 'enable_filtering', default=False):
+        if not self._filter_enabled:
             return True
         
+        local = self._local_should_notify(video_data)
+        if local is not None:
+            return local
+        
+        batched = self._get_batched(video_data, 'should_notify')
+        if batched is not None:
+            if not batched:
+                logger.info(f"🚫 LLM filtered out video: {video_data.get('title', '')[:50]}...")
+            return bool(batched)
+        
         try:
             title = video_data.get('title', '')
-            description = video_data.get('description', '')
             
-            # Get filter criteria from config
-            filter_keywords = get_config('LLM', 'filter_keywords', default='')
+            # One embed call instead of a generate call when the video is
+            # clearly on one side of the configured examples
+            if self._load_prototypes():
+                decision = self._prototype_decision(self._embed(self._embedding_text(video_data)))
+                if decision is not None:
+                    if not decision:
+                        logger.info(f"🚫 Filtered out video (prototype match): {title[:50]}...")
+                    return decision
             
-            prompt = f"""Determine if this video should trigger a notification based on quality and relevance.
-
-Title: {title}
-Description: {description[:300]}
-
-Filter out:
-- Spam or clickbait
-- Low-quality content
-- Off-topic videos
-{f'- Content containing: {filter_keywords}' if filter_keywords else ''}
-
-Return ONLY "yes" or "no"."""
-
-            decision = self._generate_with_retry(prompt)
+            decision = self._generate_with_retry(
+                self._should_notify_prompt(video_data),
+                task='should_notify', semantic_text=self._semantic_text(video_data),
+                generation_config=self._short_answer_config
+            )
             if not decision:
                 logger.warning("Failed to get LLM filtering decision, defaulting to notify")
                 return True
@@ -590,3 +1626,325 @@ Return ONLY "yes" or "no"."""
         except Exception as e:
             logger.error("Error in LLM filtering")
             return True  # Default to notifying on error
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def _aembed(self, text: str) -> Optional[list]:
+        """Async version of _embed()."""
+        vector = self._embed_memo.get(text)
+        if vector is not None:
+            return vector
+        try:
+            result = await self._genai.embed_content_async(model=self.embedding_model, content=text)
+        except Exception as e:
+            logger.debug("Embedding failed, skipping semantic cache: %s", e)
+            return None
+        return self._remember_embedding(text, result['embedding'])
+    
+    async def _agenerate_with_retry(self, prompt: str, max_retries: int = 3, initial_delay: float = 2.0,
+                                    task: str = 'generate', semantic_text: Optional[str] = None,
+                                    generation_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Async version of _generate_with_retry()."""
+        vector = None
+        if self.cache and self.semantic_cache and semantic_text:
+            vector = await self._aembed(semantic_text)
+        
+        cached, cache_key = self._cache_lookup(prompt, task, vector)
+        if cached is not None:
+            return cached
+        
+        flight_key = cache_key or LLMCache.make_key(task, self.model_name or '', prompt)
+        future = self._ainflight.get(flight_key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            logger.debug("⏳ Waiting for identical in-flight request (%s)", task)
+            return await asyncio.shield(future)
+        future = self._ainflight[flight_key] = asyncio.get_running_loop().create_future()
+        
+        result = None
+        try:
+            result = await self._agenerate_uncached(prompt, max_retries, initial_delay, generation_config)
+            self._cache_store(cache_key, task, vector, result)
+        finally:
+            if self._ainflight.get(flight_key) is future:
+                del self._ainflight[flight_key]
+            future.set_result(result)
+        return result
+    
+    async def _agenerate_uncached(self, prompt: str, max_retries: int = 3, initial_delay: float = 2.0,
+                                  generation_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Async version of _generate_uncached().
+        
+        Requests run concurrently, bounded by LLM.max_concurrency and the rate limiter.
+        """
+        delay = initial_delay
+        
+        for attempt in range(max_retries):
+            try:
+                # RateLimiter.acquire() blocks, so wait for the token off the event loop
+                if self.rate_limiter:
+                    if not await asyncio.to_thread(self.rate_limiter.acquire, 30.0):
+                        logger.error("Rate limit token acquisition timeout after 30s")
+                        return None
+                
+                async with self._get_semaphore():
+                    response = await self.model.generate_content_async(
+                        prompt, generation_config=generation_config, request_options=self.request_options
+                    )
+                if self.rate_limiter:
+                    self.rate_limiter.on_success()
+                return self._decode_response(response.text.strip())
+                
+            except Exception as e:
+                if self._is_permanent_error(e):
+                    logger.error("Gemini API permanent error")
+                    return None
+                
+                if attempt < max_retries - 1:
+                    logger.warning(f"Gemini API error (attempt {attempt + 1}/{max_retries})")
+                    delay = max(delay, self._transient_error_delay(e))
+                    logger.info(f"Retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+                    delay *= 2  # Exponential backoff
+                else:
+                    logger.error(f"Gemini API failed after {max_retries} attempts")
+        
+        return None
+    
+    async def agenerate_summary(self, video_data: Dict[str, Any], max_length: int = 200) -> Optional[str]:
+        """Async version of generate_summary()."""
+        if not self.enabled or not self.model:
+            return None
+        
+        summary = self._get_batched(video_data, 'summary')
+        if not summary:
+            summary = await self._agenerate_with_retry(
+                self._summary_prompt(video_data, max_length),
+                task=f'summary:{max_length}', semantic_text=self._semantic_text(video_data),
+                generation_config=self._length_config(max_length)
+            )
+        if summary and len(summary) > max_length:
+            summary = _truncate_at_word(summary, max_length - 3)
+        return summary or None
+    
+    async def agenerate_hashtags(self, video_data: Dict[str, Any], max_tags: int = 5) -> Optional[str]:
+        """Async version of generate_hashtags()."""
+        if not self.enabled or not self.model:
+            return None
+        
+        hashtags = self._get_batched(video_data, 'hashtags')
+        if hashtags:
+            return ' '.join(hashtags.split()[:max_tags])
+        
+        return await self._agenerate_with_retry(
+            self._hashtags_prompt(video_data, max_tags),
+            task=f'hashtags:{max_tags}', semantic_text=self._semantic_text(video_data),
+            generation_config=self._length_config(max_tags * 20)
+        ) or None
+    
+    async def aenhance_notification(self, video_data: Dict[str, Any], platform_name: str,
+                                    social_platform: str) -> Optional[str]:
+        """Async version of enhance_notification()."""
+        if not self.enabled or not self.model:
+            return None
+        
+        try:
+            url = video_data.get('url', '')
+            social_platform_lower = social_platform.lower()
+            post_style, _ = self._get_post_style(social_platform)
+            
+            notification = self._get_batched(video_data, 'posts', {}).get(social_platform_lower)
+            if not notification:
+                notification = await self._agenerate_with_retry(
+                    self._notification_prompt(video_data, platform_name, social_platform_lower, post_style),
+                    task=f'notification:{platform_name.lower()}:{social_platform_lower}:{post_style}',
+                    semantic_text=self._semantic_text(video_data),
+                    generation_config=self._length_config(
+                        _POST_CHAR_LIMITS.get(social_platform_lower, _FALLBACK_POST_CHAR_LIMIT))
+                )
+            if not notification:
+                logger.warning(f"Failed to generate enhanced notification for {social_platform}, using fallback")
+                return None
+            
+            notification = self._finalize_notification(notification, url, social_platform_lower)
+            logger.info("✨ Generated %s post (%s style): %.60s...", social_platform, post_style, notification)
+            return notification
+            
+        except Exception as e:
+            logger.error(f"Error generating enhanced notification for {social_platform}: {e}")
+            return None
+    
+    async def agenerate_notification(self, video_data: dict, platform_name: str, social_platform: str) -> Optional[str]:
+        """Async version of generate_notification()."""
+        return await self.aenhance_notification(video_data, platform_name, social_platform)
+    
+    async def enhance_for_all_platforms(self, video_data: Dict[str, Any], platform_name: str,
+                                        targets: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Generate posts for several social platforms concurrently.
+        
+        The per-platform requests overlap instead of running back-to-back
+        (bounded by LLM.max_concurrency). Posts already produced by
+        process_video() are served from the memo without a request.
+        
+        Args:
+            video_data: Video information dict (title, description, url, etc.)
+            platform_name: Source platform name (YouTube, TikTok, etc.)
+            targets: Social platforms to write posts for (discord, matrix, bluesky, mastodon)
+            
+        Returns:
+            Dict of social platform (lowercase) -> post text, or None where generation failed
+        """
+        posts = await asyncio.gather(
+            *(self.aenhance_notification(video_data, platform_name, target) for target in targets),
+            return_exceptions=True
+        )
+        return {
+            target.lower(): None if isinstance(post, BaseException) else post
+            for target, post in zip(targets, posts)
+        }
+    
+    async def enhance_notifications_batch(self, jobs: List[Tuple[Dict[str, Any], str, str]]) -> List[Optional[str]]:
+        """
+        Generate posts for several (video, social platform) pairs concurrently.
+        
+        Used when more than one new video turns up at once. Concurrency is
+        capped at the rate limiter's current budget (and LLM.max_concurrency),
+        so a burst doesn't drain the bucket and then stall on acquire().
+        
+        Args:
+            jobs: (video_data, platform_name, social_platform) tuples
+            
+        Returns:
+            One post (or None where generation failed) per job, in order
+        """
+        if not jobs:
+            return []
+        budget = self.max_concurrency
+        if self.rate_limiter:
+            budget = min(budget, self.rate_limiter.tokens_available())
+        semaphore = asyncio.Semaphore(max(1, budget))
+        
+        async def bounded(video_data: Dict[str, Any], platform_name: str, social_platform: str) -> Optional[str]:
+            async with semaphore:
+                return await self.aenhance_notification(video_data, platform_name, social_platform)
+        
+        posts = await asyncio.gather(*(bounded(*job) for job in jobs), return_exceptions=True)
+        return [None if isinstance(post, BaseException) else post for post in posts]
+    
+    def enhance_notifications_batch_sync(self, jobs: List[Tuple[Dict[str, Any], str, str]]) -> List[Optional[str]]:
+        """
+        Blocking wrapper around enhance_notifications_batch() for the sync daemon loop.
+        
+        Args:
+            jobs: (video_data, platform_name, social_platform) tuples
+            
+        Returns:
+            One post (or None where generation failed) per job, in order
+        """
+        return asyncio.run(self.enhance_notifications_batch(jobs))
+    
+    async def aanalyze_sentiment(self, video_data: Dict[str, Any]) -> Optional[str]:
+        """Async version of analyze_sentiment()."""
+        if not self.enabled or not self.model:
+            return None
+        
+        sentiment = self._get_batched(video_data, 'sentiment')
+        if not sentiment:
+            sentiment = await self._agenerate_with_retry(
+                self._sentiment_prompt(video_data),
+                task='sentiment', semantic_text=self._semantic_text(video_data),
+                generation_config=self._short_answer_config
+            )
+        return sentiment.strip().lower() if sentiment else None
+    
+    async def ashould_notify(self, video_data: Dict[str, Any]) -> bool:
+        """Async version of should_notify()."""
+        if not self.enabled or not self.model:
+            return True
+        
+        if not self._filter_enabled:
+            return True
+        
+        local = self._local_should_notify(video_data)
+        if local is not None:
+            return local
+        
+        decision = self._get_batched(video_data, 'should_notify')
+        if decision is None and await asyncio.to_thread(self._load_prototypes):
+            decision = self._prototype_decision(await self._aembed(self._embedding_text(video_data)))
+        if decision is None:
+            response = await self._agenerate_with_retry(
+                self._should_notify_prompt(video_data),
+                task='should_notify', semantic_text=self._semantic_text(video_data),
+                generation_config=self._short_answer_config
+            )
+            if not response:
+                logger.warning("Failed to get LLM filtering decision, defaulting to notify")
+                return True
+            decision = 'yes' in response.lower()
+        
+        if not decision:
+            logger.info(f"🚫 LLM filtered out video: {video_data.get('title', '')[:50]}...")
+        return bool(decision)
+    
+    async def aprocess_video(self, video_data: Dict[str, Any], platforms: Optional[List[str]] = None,
+                             styles: Optional[Dict[str, str]] = None, platform_name: str = 'YouTube') -> Optional[Dict[str, Any]]:
+        """Async version of process_video()."""
+        if not self.enabled or not self.model:
+            return None
+        
+        platforms = [p.lower() for p in (platforms or [])]
+        styles = {k.lower(): v.lower() for k, v in (styles or {}).items()}
+        
+        batched = self._cached_batch(video_data, platforms)
+        if batched:
+            return batched
+        
+        # A filter-keyword hit means nothing will be posted - don't spend a request on it
+        if self._filter_enabled and self._match_filter_keyword(video_data):
+            return None
+        
+        try:
+            prompt, generation_config = self._process_video_prompt(video_data, platforms, styles, platform_name)
+            response = await self._agenerate_with_retry(
+                prompt,
+                task=f'process_video:{platform_name.lower()}:{",".join(platforms)}',
+                generation_config=generation_config
+            )
+            if not response:
+                logger.warning("Failed to batch-process video, falling back to per-task requests")
+                return None
+            return self._store_batched(video_data, response)
+            
+        except Exception as e:
+            logger.error(f"Error batch-processing video: {e}")
+            return None
+    
+    async def process_videos_batch(self, videos: List[Dict[str, Any]], platforms: Optional[List[str]] = None,
+                                   platform_name: str = 'YouTube') -> List[Optional[Dict[str, Any]]]:
+        """
+        Process several videos concurrently.
+        
+        Each video gets a single process_video() request; the requests overlap
+        instead of running back-to-back, bounded by LLM.max_concurrency.
+        
+        Args:
+            videos: List of video information dicts
+            platforms: Social platforms to write posts for
+            platform_name: Source platform name (YouTube, TikTok, etc.)
+            
+        Returns:
+            One process_video() result (or None on error) per video, in order
+        """
+        results = await asyncio.gather(
+            *(self.aprocess_video(video, platforms, platform_name=platform_name) for video in videos),
+            return_exceptions=True
+        )
+        return [None if isinstance(result, BaseException) else result for result in results]
@@ -0,0 +1,430 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Response cache for LLM providers.
+
+Two tiers:
+- Exact: LRU keyed by a hash of (task, model, prompt)
+- Semantic: cosine similarity over embeddings of the video content
+
+Plus per-video results (process_video output) keyed by video URL, with a TTL.
+
+Everything is persisted to SQLite (WAL mode) so a daemon restart doesn't
+throw away responses we already paid for.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'boon_tube' / 'llm_cache.sqlite'
+
+# LLMCache.shared() instances by resolved path ('' = in-memory)
+_shared_caches: Dict[str, 'LLMCache'] = {}
+_shared_lock = threading.Lock()
+
+
+def json_loads(text: str) -> Any:
+    """
+    Parse JSON, using orjson when it's installed.
+
+    Falls back to the stdlib with strict=False, which also accepts raw control
+    characters (e.g. real newlines) inside strings - orjson rejects those.
+
+    Args:
+        text: JSON text
+
+    Returns:
+        Parsed object
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text, strict=False)
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize to compact JSON, using orjson when it's installed.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON text
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+class LLMCache:
+    """
+    Two-tier (exact + semantic) LLM response cache.
+
+    Example:
+        cache = LLMCache(path='~/.cache/boon_tube/llm_cache.sqlite')
+        key = cache.make_key('summary', 'gemini-2.5-flash-lite', prompt)
+
+        response = cache.get(key)
+        if response is None:
+            response = call_llm(prompt)
+            cache.set(key, 'summary', response)
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2000,
+                 semantic_threshold: float = 0.95, video_ttl: float = 0, ttl: float = 0):
+        """
+        Initialize cache.
+
+        Args:
+            path: SQLite file to persist to (None = in-memory only)
+            max_entries: Maximum entries kept per tier
+            semantic_threshold: Minimum cosine similarity for a semantic hit
+            video_ttl: Seconds a per-video result stays valid (0 = no expiry)
+            ttl: Seconds an exact/semantic response stays valid (0 = no expiry)
+        """
+        self.max_entries = max(1, max_entries)
+        self.semantic_threshold = semantic_threshold
+        self.video_ttl = video_ttl
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+        # key -> (created, response)
+        self._exact: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        # task -> [(unit-length vector, response, created), ...] oldest first.
+        # Bucketed by task so a lookup only scores entries that can match.
+        self._semantic: Dict[str, List[Tuple[Tuple[float, ...], str, float]]] = {}
+        self._semantic_count = 0
+        self._stats = {'hits': 0, 'semantic_hits': 0, 'misses': 0}
+        # url -> (created, JSON result)
+        self._videos: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+
+        self._conn = None
+        if path:
+            self._open(Path(path).expanduser())
+
+    @classmethod
+    def shared(cls, path: Optional[str] = None, **kwargs: Any) -> 'LLMCache':
+        """
+        Get the process-wide cache for a path, creating it on first use.
+
+        Every provider instance that asks for the same file shares one set of
+        in-memory tiers and one SQLite connection, so a response cached by one
+        is a hit for all of them. Settings are taken from the first caller.
+
+        Args:
+            path: SQLite file to persist to (None = in-memory only)
+            **kwargs: LLMCache() settings (max_entries, ttl, ...)
+
+        Returns:
+            Shared LLMCache instance
+        """
+        key = str(Path(path).expanduser().resolve()) if path else ''
+        with _shared_lock:
+            cache = _shared_caches.get(key)
+            if cache is None or (path and cache._conn is None):
+                cache = _shared_caches[key] = cls(path, **kwargs)
+            return cache
+
+    @staticmethod
+    def make_key(task: str, model: str, prompt: str) -> str:
+        """
+        Build the exact-tier cache key.
+
+        Args:
+            task: Task name (summary, hashtags, notification:discord, ...)
+            model: Model name
+            prompt: Full prompt text
+
+        Returns:
+            Hex digest identifying this request
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for part in (task, model, prompt):
+            h.update(part.encode('utf-8'))
+            h.update(b'\x00')
+        return h.hexdigest()
+
+    def _open(self, path: Path) -> None:
+        """Open (or create) the SQLite store and load persisted entries."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, task TEXT, response TEXT, created REAL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS embeddings ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, task TEXT, vector BLOB, '
+                'response TEXT, created REAL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS videos ('
+                'url TEXT PRIMARY KEY, result TEXT, created REAL)'
+            )
+            conn.commit()
+
+            rows = conn.execute(
+                'SELECT key, response, created FROM responses ORDER BY created DESC LIMIT ?',
+                (self.max_entries,)
+            ).fetchall()
+            for key, response, created in reversed(rows):
+                if not self._expired(created, self.ttl):
+                    self._exact[key] = (created, response)
+
+            rows = conn.execute(
+                'SELECT task, vector, response, created FROM embeddings ORDER BY created DESC LIMIT ?',
+                (self.max_entries,)
+            ).fetchall()
+            for task, blob, response, created in reversed(rows):
+                if self._expired(created, self.ttl):
+                    continue
+                vector = array('f')
+                vector.frombytes(blob)
+                self._semantic.setdefault(task, []).append((tuple(vector), response, created))
+                self._semantic_count += 1
+
+            rows = conn.execute(
+                'SELECT url, result, created FROM videos ORDER BY created DESC LIMIT ?',
+                (self.max_entries,)
+            ).fetchall()
+            for url, result, created in reversed(rows):
+                if not self._expired(created, self.video_ttl):
+                    self._videos[url] = (created, result)
+
+            self._conn = conn
+            logger.debug("LLM cache loaded from %s (%d exact, %d semantic, %d videos)",
+                         path, len(self._exact), self._semantic_count, len(self._videos))
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"⚠ LLM cache persistence disabled ({path}): {e}")
+            self._conn = None
+
+    def _persist(self, sql: str, params: tuple, table: str) -> None:
+        """Write a row and trim the table to max_entries. Caller holds the lock."""
+        if not self._conn:
+            return
+        try:
+            self._conn.execute(sql, params)
+            self._conn.execute(
+                f'DELETE FROM {table} WHERE rowid NOT IN '
+                f'(SELECT rowid FROM {table} ORDER BY created DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.debug("LLM cache write failed: %s", e)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up an exact-tier entry.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached response or None
+        """
+        with self.lock:
+            entry = self._exact.get(key)
+            if entry is None or self._expired(entry[0], self.ttl):
+                if entry is not None:
+                    del self._exact[key]
+                self._stats['misses'] += 1
+                return None
+            self._exact.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def set(self, key: str, task: str, response: str) -> None:
+        """
+        Store an exact-tier entry.
+
+        Args:
+            key: Key from make_key()
+            task: Task name (stored for debugging / housekeeping)
+            response: LLM response text
+        """
+        created = time.time()
+        with self.lock:
+            self._exact[key] = (created, response)
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+            self._persist(
+                'INSERT OR REPLACE INTO responses (key, task, response, created) VALUES (?, ?, ?, ?)',
+                (key, task, response, created),
+                'responses'
+            )
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> Tuple[float, ...]:
+        """Scale a vector to unit length so cosine similarity is a plain dot product."""
+        norm = math.sqrt(sum(v * v for v in vector))
+        if not norm:
+            return tuple(vector)
+        return tuple(v / norm for v in vector)
+
+    def get_similar(self, task: str, vector: Sequence[float]) -> Optional[str]:
+        """
+        Look up a semantic-tier entry.
+
+        Args:
+            task: Task name - only entries for the same task can match
+            vector: Embedding of the content being processed
+
+        Returns:
+            Response of the most similar entry above the threshold, or None
+        """
+        query = self._normalize(vector)
+        best_score = self.semantic_threshold
+        best = None
+        with self.lock:
+            for entry_vector, response, created in self._semantic.get(task, ()):
+                if len(entry_vector) != len(query):
+                    continue
+                score = sum(a * b for a, b in zip(query, entry_vector))
+                if score >= best_score and not self._expired(created, self.ttl):
+                    best_score = score
+                    best = response
+            if best is not None:
+                self._stats['semantic_hits'] += 1
+        if best is not None:
+            logger.debug("Semantic cache hit for %s (cosine %.3f)", task, best_score)
+        return best
+
+    def add_similar(self, task: str, vector: Sequence[float], response: str) -> None:
+        """
+        Store a semantic-tier entry.
+
+        Args:
+            task: Task name
+            vector: Embedding of the content that produced the response
+            response: LLM response text
+        """
+        normalized = self._normalize(vector)
+        created = time.time()
+        with self.lock:
+            self._semantic.setdefault(task, []).append((normalized, response, created))
+            self._semantic_count += 1
+            while self._semantic_count > self.max_entries:
+                # Evict the globally oldest entry (each bucket is oldest first)
+                oldest = min(self._semantic, key=lambda t: self._semantic[t][0][2])
+                del self._semantic[oldest][0]
+                if not self._semantic[oldest]:
+                    del self._semantic[oldest]
+                self._semantic_count -= 1
+            self._persist(
+                'INSERT INTO embeddings (task, vector, response, created) VALUES (?, ?, ?, ?)',
+                (task, array('f', normalized).tobytes(), response, created),
+                'embeddings'
+            )
+
+    @staticmethod
+    def _expired(created: float, ttl: float) -> bool:
+        """Check an entry's age against a TTL (0 = never expires)."""
+        return bool(ttl) and time.time() - created > ttl
+
+    def get_video(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the stored result for a video.
+
+        Args:
+            url: Video URL
+
+        Returns:
+            Result dict, or None if missing or older than video_ttl
+        """
+        with self.lock:
+            entry = self._videos.get(url)
+            if entry is None:
+                return None
+            if self._expired(entry[0], self.video_ttl):
+                del self._videos[url]
+                return None
+            self._videos.move_to_end(url)
+        return json_loads(entry[1])
+
+    def set_video(self, url: str, result: Dict[str, Any]) -> None:
+        """
+        Store the result for a video, replacing any previous one.
+
+        Args:
+            url: Video URL
+            result: JSON-serializable result dict
+        """
+        blob = json_dumps(result)
+        created = time.time()
+        with self.lock:
+            self._videos[url] = (created, blob)
+            self._videos.move_to_end(url)
+            while len(self._videos) > self.max_entries:
+                self._videos.popitem(last=False)
+            self._persist(
+                'INSERT OR REPLACE INTO videos (url, result, created) VALUES (?, ?, ?)',
+                (url, blob, created),
+                'videos'
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for this run.
+
+        Returns:
+            Dict with entry counts, hits, semantic_hits, misses and hit_rate
+        """
+        with self.lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._exact)
+            stats['semantic_entries'] = self._semantic_count
+            stats['videos'] = len(self._videos)
+        lookups = stats['hits'] + stats['misses']
+        # A semantic hit is counted as an exact miss first
+        stats['hit_rate'] = (stats['hits'] + stats['semantic_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop every cached entry, in memory and on disk, and reset the counters."""
+        with self.lock:
+            self._exact.clear()
+            self._semantic.clear()
+            self._semantic_count = 0
+            self._videos.clear()
+            self._stats = {'hits': 0, 'semantic_hits': 0, 'misses': 0}
+            if self._conn:
+                try:
+                    for table in ('responses', 'embeddings', 'videos'):
+                        self._conn.execute(f'DELETE FROM {table}')
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.debug("LLM cache clear failed: %s", e)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self.lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
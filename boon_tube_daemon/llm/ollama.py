@@ -21,21 +21,304 @@ Features:
 - Qwen3 thinking mode support
 """
 
+import asyncio
+import json
 import logging
+import random
 import re
 import time
-from typing import Optional, List, Set, Tuple
+from collections import OrderedDict
+from typing import Optional, Any, Dict, FrozenSet, List, Set, Tuple
 
 try:
+    import httpx
     import ollama
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
 
-from boon_tube_daemon.utils.config import get_config, get_bool_config
+from boon_tube_daemon.llm.llm_cache import LLMCache, DEFAULT_CACHE_PATH
+from boon_tube_daemon.utils.config import get_config, get_bool_config, get_int_config, get_float_config
 
 logger = logging.getLogger(__name__)
 
+# Idle connections to the Ollama server are kept this long (seconds) so the
+# posts for one video, and their retries, reuse the same TCP connection.
+_KEEPALIVE_EXPIRY = 120.0
+
+# Streamed posts are cut off this far past the platform limit. Guardrails strip
+# meta-text and URLs before trimming to the limit, so leave them some slack.
+_STREAM_SLACK_CHARS = 100
+
+# Retry backoff: doubling delays are capped, and jittered +/-20% so concurrent
+# platform requests that failed together don't all retry at the same instant
+_MAX_BACKOFF = 30.0
+_PERMANENT_ERROR_RE = re.compile(r'not found|invalid|unauthorized')
+
+
+def _jittered(delay: float) -> float:
+    """Spread a backoff delay by +/-20%."""
+    return delay * (0.8 + 0.4 * random.random())
+
+
+def _http_client(client):
+    """The httpx client behind an ollama Client/AsyncClient, or None.
+
+    ollama-python has no public close(), so this reads the private attribute
+    defensively in case a release renames it.
+    """
+    return getattr(client, '_client', None)
+
+
+# Ollama runtime options that can be set from config (LLM_OLLAMA_NUM_CTX etc.)
+_SERVER_OPTIONS = ('num_ctx', 'num_batch', 'num_gpu', 'num_thread')
+
+# Structured output (LLM_OLLAMA_JSON_OUTPUT): Ollama constrains decoding to this
+# schema, so the post comes back as {"post": "..."} instead of buried in prose
+_POST_SCHEMA = {
+    'type': 'object',
+    'properties': {'post': {'type': 'string'}},
+    'required': ['post'],
+}
+_JSON_POST_INSTRUCTION = 'Respond with JSON only: {"post": "<the post text>"}'
+
+# How long the server keeps the model loaded after a request (LLM_OLLAMA_KEEP_ALIVE).
+# Ollama's own default is 5m, shorter than most gaps between uploads, so the
+# next video would pay the model load again.
+_DEFAULT_KEEP_ALIVE = '30m'
+
+
+def _keep_alive_value(value: str):
+    """
+    Convert a keep_alive setting for the Ollama API.
+    
+    Args:
+        value: Duration string ('30m', '2h') or a number of seconds ('-1' = forever)
+        
+    Returns:
+        The duration string, a number of seconds, or None to use the server default
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return value
+    return int(seconds) if seconds.is_integer() else seconds
+
+
+# Notification prompt rules and examples. Every post prompt starts with this
+# exact text and only the video details at the end change, so the Ollama
+# server can reuse the cached prefix (keep it free of per-video values).
+_NOTIFICATION_RULES = """You are a social media assistant that writes engaging video announcements with personality.
+
+TASK: Write a short, engaging post announcing the new video described at the end.
+
+STEP 1 - STYLE & TONE:
+✓ Match the vibe: Read the title and match its energy (technical, gaming, tutorial, entertainment, etc.)
+✓ Be personality-driven: Write like a real person with character, not a corporate bot
+✓ Add interest: Make people want to click - build curiosity without being cringe
+✓ Use formatting: Short lines or natural flow work great
+✓ Emoji: Use 0-1 emoji that fits the vibe (🎬 for video, 🎮 for gaming, 💻 for tech, etc.)
+
+STEP 2 - CONTENT RULES (FOLLOW EXACTLY):
+✓ Length: MUST fit the character limit given at the end (including hashtags)
+✓ Output: ONLY the post text (no quotes, no meta-commentary, no "Here's...")
+✓ Based on title: Reference what the video is about BUT don't just copy/paste the title
+✓ Call-to-action: Natural invite like "check it out", "link below", "new video"
+✗ DO NOT repost the title verbatim - the link already shows it
+✗ DO NOT include the URL (it's added automatically)
+✗ DO NOT invent details not in the title (no "giveaways", "premiering tonight", etc.)
+✗ DO NOT use cringe words: "INSANE", "EPIC", "smash that", "unmissable", "legendary", "incredible"
+
+STEP 3 - HASHTAG RULES (CRITICAL):
+Use EXACTLY the number of hashtags asked for at the end, after the text (none if it says no hashtags).
+- Extract hashtags from key words/topics in the title
+- NEVER use generic tags like #Video, #YouTube, #New, #Content
+- Format: space before each hashtag
+
+EXAMPLES OF GOOD POSTS:
+
+Example 1 - Tech Tutorial:
+Title: "Building a Home Server with Proxmox"
+Good: "New video! Building out a home server with Proxmox. Full walkthrough from hardware to config 💻 #Homelab #Proxmox #SelfHosted"
+
+Example 2 - Gaming:
+Title: "Elden Ring Boss Guide - Malenia"
+Good: "Finally beat Malenia and made a guide about it. Tips that actually work. #EldenRing #BossGuide #Gaming"
+
+Example 3 - Casual/Vlog:
+Title: "Day in My Life - Remote Worker Edition"
+Good: "New vlog is up! A day in my life working remote. Coffee, code, and questionable time management 🎬 #RemoteWork #Vlog #DayInMyLife"
+
+BAD examples to AVOID:
+✗ "EPIC new video just dropped! INSANE content! #AMAZING #EPIC" (cringe, forbidden words)
+✗ Just copying: "Building a Home Server with Proxmox #Server #Home #Build" (lazy, no personality)
+✗ "Check out my new video at https://..." (don't include URL)"""
+
+# Quantization levels that mean the model weights are not quantized at all
+_UNQUANTIZED_LEVELS = frozenset({'F16', 'BF16', 'F32'})
+
+# Per-platform post settings: (max_chars, use_hashtags, hashtag_count)
+_PLATFORM_LIMITS = {
+    'bluesky': (250, True, 3),  # Conservative for Bluesky's 300 grapheme limit
+    'mastodon': (400, True, 3),  # Leave room for URL and hashtags
+    'discord': (300, False, 0),
+    'matrix': (350, False, 0),
+}
+_DEFAULT_LIMITS = (300, False, 0)
+
+# Guardrail patterns, compiled once. Word lists are matched with one
+# alternation per list instead of one search per word.
+_FORBIDDEN_WORDS = (
+    'insane', 'epic', 'crazy', 'smash', 'unmissable',
+    'incredible', 'amazing', 'lit', 'fire', 'legendary',
+    'mind-blowing', 'jaw-dropping', 'unbelievable'
+)
+_PROFANITY_MILD = ('damn', 'hell', 'crap', 'suck', 'sucks', 'piss', 'pissed')
+_PROFANITY_MODERATE = ('ass', 'bastard', 'bitch', 'dick', 'cock', 'pussy', 'slut', 'whore')
+_PROFANITY_SEVERE = ('fuck', 'fucking', 'shit', 'shitty', 'motherfucker', 'asshole', 'cunt')
+
+
+def _word_list_re(words) -> re.Pattern:
+    """Compile a word list into a single whole-word alternation."""
+    return re.compile(r'\b(?:' + '|'.join(re.escape(word) for word in words) + r')\b')
+
+
+_FORBIDDEN_RE = _word_list_re(_FORBIDDEN_WORDS)
+_PROFANITY_LEVELS = {
+    'mild': (_PROFANITY_MILD, _word_list_re(_PROFANITY_MILD)),
+    'moderate': (_PROFANITY_MILD + _PROFANITY_MODERATE,
+                 _word_list_re(_PROFANITY_MILD + _PROFANITY_MODERATE)),
+    'severe': (_PROFANITY_MILD + _PROFANITY_MODERATE + _PROFANITY_SEVERE,
+               _word_list_re(_PROFANITY_MILD + _PROFANITY_MODERATE + _PROFANITY_SEVERE)),
+}
+
+_HASHTAG_RE = re.compile(r'#([a-zA-Z]\w*)')
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F000-\U0001FAFF"  # enclosed, flags, pictographs, emoticons, transport, supplemental
+    "\U00002190-\U000021FF"  # arrows
+    "\U00002300-\U000023FF"  # misc technical (clocks, media controls)
+    "\U000025A0-\U000025FF"  # geometric shapes (play button)
+    "\U00002600-\U000027BF"  # misc symbols & dingbats
+    "\U00002934-\U00002935"  # curved arrows
+    "\U00002B00-\U00002BFF"  # arrows & stars
+    "\U000024C2"              # circled M
+    "\U00003030\U0000303D"    # wavy dash, part alternation mark
+    "\U00003297\U00003299"    # circled ideographs (congratulation, secret)
+    "]", flags=re.UNICODE
+)
+_URL_RE = re.compile(r'https?://\S+')
+_URL_SCHEME_RE = re.compile(r'https?://')
+_HTML_ENTITY_RE = re.compile(r'&[a-z]+;')
+_HASHTAG_STRIP_RE = re.compile(r'#\w+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+_HASHTAG_SPLIT_RE = re.compile(r'\s+#')
+_CAMEL_SPLIT_RE = re.compile(r'[A-Z]*[a-z]+|[A-Z]+(?=[A-Z]|$)|[0-9]+')
+# Punctuation variety or an emoticon
+_PERSONALITY_RE = re.compile('[!?\U0001F600-\U0001F64F]')
+
+# Qwen3 thinking output markers: "post: ..." style (group 'post') and
+# "output: ..." / "result: ...". "Here's the post: ..." is covered by the
+# post alternative.
+_THINKING_MARKER_RE = re.compile(
+    r'(?:(?:final\s+)?(?P<post>post|notification|message|announcement)|output|result):'
+    r'\s*["\']?(?P<body>.+?)["\']?\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+_THINKING_LINE_PREFIX_RE = re.compile(r'^(?:post|notification|message):\s*', re.IGNORECASE)
+
+# Meta-text the model likes to open a line with. Applied once each, in this
+# order: a later pattern may strip a prefix the earlier one exposed
+# ("Here's Post: ..."), but no pattern runs twice, so a post that itself
+# starts with "Post..." or "Draft..." keeps its first word.
+_META_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in (
+    r'^(?:Here\'?s|Okay,? here\'?s|Alright,? here\'?s)\s+.*?:?\s*',
+    r'^(?:Here you go|Sure thing|Certainly).*?:?\s*',
+    r'^(?:Post|Draft|Output).*?:?\s*',
+))
+_QUOTE_EDGE_RE = re.compile(r'^"|"$', re.MULTILINE)  # Leading/trailing quotes
+_HALLUCINATION_PATTERNS = tuple((pattern, re.compile(pattern, re.IGNORECASE)) for pattern in (
+    r'drops?\s+enabled',
+    r'giveaway',
+    r'tonight\s+at\s+\d',
+    r'premiering?\s+at\s+\d',
+    r'\d+\s*pm',
+    r'\d+\s*am',
+    r'coming\s+soon',
+    r'\d+\s+views?',
+    r'subscribe\s+for',
+    r'special\s+guest',
+    r'live\s+now',
+    r'streaming\s+now',
+))
+
+
+def _validate_discord(message: str) -> List[str]:
+    """Discord: no mass pings, no unmatched markdown."""
+    issues = []
+    # Check for mass pings (most posts have no '@' at all)
+    if '@' in message and ('@everyone' in message or '@here' in message):
+        issues.append("Contains @everyone or @here mention")
+    
+    # Check for unmatched markdown (only count markers that are present)
+    unmatched_markdown = (
+        ('**' in message and message.count('**') & 1) or
+        ('__' in message and message.count('__') & 1)
+    )
+    if unmatched_markdown:
+        issues.append("Unmatched markdown formatting")
+    return issues
+
+
+def _validate_bluesky(message: str) -> List[str]:
+    """Bluesky: the URL is added separately, so none in the content."""
+    # Substring gate first: most posts contain no URL, so skip the regex
+    if 'http' in message and _URL_RE.search(message):
+        return ["URL found in content (should be added separately)"]
+    return []
+
+
+def _validate_mastodon(message: str) -> List[str]:
+    """Mastodon: plain text, no HTML entities."""
+    if '&' in message and _HTML_ENTITY_RE.search(message):
+        return ["HTML entities detected (should be plain text)"]
+    return []
+
+
+_PLATFORM_VALIDATORS = {
+    'discord': _validate_discord,
+    'bluesky': _validate_bluesky,
+    'mastodon': _validate_mastodon,
+}
+
+
+def _post_complete(parts: List[str], length: int, max_chars: int, hashtag_count: int) -> bool:
+    """
+    Check whether a streamed post is finished, so generation can stop early.
+    
+    A post is done once it has run well past the length limit (the rest would
+    be trimmed anyway), or once a line ends after all its hashtags - anything
+    the model writes after that is commentary. Only the length check runs per
+    token; the text is joined just when the latest token ends a line.
+    
+    Args:
+        parts: Response tokens streamed so far
+        length: Total length of parts
+        max_chars: Platform character limit
+        hashtag_count: Expected number of hashtags (0 = no hashtag rule)
+        
+    Returns:
+        True if the rest of the generation can be skipped
+    """
+    if length >= max_chars + _STREAM_SLACK_CHARS:
+        return True
+    return (bool(hashtag_count) and parts[-1].endswith('\n')
+            and len(_HASHTAG_RE.findall(''.join(parts))) >= hashtag_count)
+
 
 class OllamaLLM:
     """
@@ -59,16 +342,39 @@ class OllamaLLM:
         self.model = None
         self.ollama_client = None
         self.ollama_host = None
+        self.request_timeout = 300.0
+        
+        # Async client for concurrent per-platform generation (one per event loop)
+        self._async_client = None
+        self._async_client_loop = None
         
         # Qwen3 thinking mode support
         self.thinking_mode_enabled = False
         self.thinking_token_multiplier = 4.0
         
+        # Ask for {"post": ...} JSON instead of free text
+        self.json_output = False
+        
+        # Write one post per video and adapt it per platform
+        self.shared_post = False
+        
+        # Keep the model loaded between notifications (None = server default)
+        self.keep_alive = None
+        
+        # Expected quantization level of the model tag ('' = don't check)
+        self.quantization = ''
+        
         # Generation parameters (because even AI needs tuning knobs)
         self.temperature = 0.3
         self.top_p = 0.9
         self.max_tokens = 150
         
+        # Server throughput options (num_ctx, num_batch, num_gpu, num_thread) - only sent when set
+        self.server_options: Dict[str, int] = {}
+        
+        # Prebuilt generate() options per requested max_tokens
+        self._gen_options: Dict[int, dict] = {}
+        
         # Retry configuration
         self.max_retries = 3
         self.retry_delay_base = 2
@@ -84,9 +390,12 @@ class OllamaLLM:
         self.profanity_severity = 'moderate'
         self.enable_platform_validation = True
         
-        # Deduplication cache: stores recent messages to prevent repeats
+        # Response cache for generated posts (shared LLMCache, None = disabled)
+        self.cache = None
+        
+        # Deduplication cache: normalized text -> word set of recent messages (LRU)
         # Because variety is the spice of life, even for robot-generated content
-        self._message_cache: List[str] = []
+        self._message_cache: 'OrderedDict[str, FrozenSet[str]]' = OrderedDict()
         
     def authenticate(self) -> bool:
         """
@@ -122,15 +431,26 @@ class OllamaLLM:
             # Qwen3 thinking mode support
             self.thinking_mode_enabled = get_bool_config('LLM', 'enable_thinking_mode', default=False)
             self.thinking_token_multiplier = float(get_config('LLM', 'thinking_token_multiplier', default='4.0'))
+            self.json_output = get_bool_config('LLM', 'ollama_json_output', default=False)
+            self.shared_post = get_bool_config('LLM', 'ollama_shared_post', default=False)
             
             # Generation parameters
             self.temperature = float(get_config('LLM', 'temperature', default='0.3'))
             self.top_p = float(get_config('LLM', 'top_p', default='0.9'))
             self.max_tokens = int(get_config('LLM', 'max_tokens', default='150'))
+            self.quantization = (get_config('LLM', 'ollama_quantization', default='') or '').strip()
+            self.server_options = {}
+            for option in _SERVER_OPTIONS:
+                value = get_config('LLM', f'ollama_{option}')
+                if value:
+                    self.server_options[option] = int(value)
+            self._gen_options = {}
             
             # Retry configuration
             self.max_retries = int(get_config('LLM', 'max_retries', default='3'))
             self.retry_delay_base = int(get_config('LLM', 'retry_delay_base', default='2'))
+            self.request_timeout = float(get_config('LLM', 'ollama_timeout', default='300'))
+            self.keep_alive = _keep_alive_value(get_config('LLM', 'ollama_keep_alive', default=_DEFAULT_KEEP_ALIVE) or '')
             
             # Guardrails configuration
             self.enable_deduplication = get_bool_config('LLM', 'enable_deduplication', default=True)
@@ -142,6 +462,16 @@ class OllamaLLM:
             self.profanity_severity = get_config('LLM', 'profanity_severity', default='moderate')
             self.enable_platform_validation = get_bool_config('LLM', 'enable_platform_validation', default=True)
             
+            # Response cache: same file and settings as the Gemini provider
+            if get_bool_config('LLM', 'enable_cache', default=True):
+                cache_path = get_config('LLM', 'cache_path', default=str(DEFAULT_CACHE_PATH))
+                self.cache = LLMCache.shared(
+                    path=cache_path or None,
+                    max_entries=get_int_config('LLM', 'cache_size', default=2000),
+                    video_ttl=get_float_config('LLM', 'video_cache_ttl_hours', default=168.0) * 3600,
+                    ttl=get_float_config('LLM', 'cache_ttl', default=1800.0)
+                )
+            
             # Build full host URL if port is specified separately
             if not ollama_host.startswith('http'):
                 ollama_host = f"http://{ollama_host}"
@@ -156,7 +486,7 @@ class OllamaLLM:
             
             # Test connection by listing models
             try:
-                self.ollama_client = ollama.Client(host=self.ollama_host)
+                self.ollama_client = ollama.Client(host=self.ollama_host, **self._http_options())
                 models_response = self.ollama_client.list()
                 logger.debug(f"Connected to Ollama at {self.ollama_host}")
                 
@@ -174,6 +504,9 @@ class OllamaLLM:
                         f"To pull the model, run: ollama pull {model_name}"
                     )
                 
+                self._log_quantization(model_name)
+                self._warm_up(model_name)
+                
                 # Log thinking mode status
                 if self.thinking_mode_enabled:
                     logger.info(f"🧠 Qwen3 thinking mode enabled (token multiplier: {self.thinking_token_multiplier}x)")
@@ -191,6 +524,58 @@ class OllamaLLM:
             self.enabled = False
             return False
     
+    def _log_quantization(self, model_name: str):
+        """
+        Log the model's quantization level, and warn about unquantized weights
+        or a level other than LLM_OLLAMA_QUANTIZATION.
+        
+        A 4B model in F16 moves four times the bytes per token of its q4_K_M
+        build, and generation speed on a single GPU is mostly memory bandwidth.
+        
+        Args:
+            model_name: Model tag to inspect
+        """
+        try:
+            details = self.ollama_client.show(model_name).details
+        except Exception as e:
+            logger.debug(f"Could not read model details for {model_name}: {e}")
+            return
+        
+        level = getattr(details, 'quantization_level', None)
+        if not level:
+            return
+        if self.quantization and level.upper() != self.quantization.upper():
+            # Tag names differ per model family (4b-it-q8_0, 7b-instruct-q8_0, ...)
+            base = model_name.split(':')[0]
+            logger.warning(
+                f"⚠ Model '{model_name}' is {level}, not {self.quantization}. Pick the "
+                f"{self.quantization} tag from https://ollama.com/library/{base}/tags and "
+                f"set LLM_MODEL to it (ollama pull <tag>)"
+            )
+        elif level.upper() in _UNQUANTIZED_LEVELS and not self.quantization:
+            logger.warning(
+                f"⚠ Model '{model_name}' is unquantized ({level}). A q4_K_M or q5_K_M tag "
+                f"generates faster in a fraction of the VRAM"
+            )
+        else:
+            logger.info(f"📦 Model quantization: {level}")
+    
+    def _warm_up(self, model_name: str):
+        """
+        Load the model into memory now, so the first notification doesn't wait for it.
+        
+        An empty prompt makes Ollama load the model (for keep_alive) without
+        generating anything.
+        
+        Args:
+            model_name: Model tag to load
+        """
+        try:
+            self.ollama_client.generate(model=model_name, prompt='', keep_alive=self.keep_alive)
+            logger.debug(f"Model {model_name} loaded (keep_alive: {self.keep_alive or 'server default'})")
+        except Exception as e:
+            logger.debug(f"Could not preload {model_name}: {e}")
+    
     def _extract_from_thinking(self, thinking_content: str, max_chars: int) -> Optional[str]:
         """
         Extract the actual notification from Qwen3's thinking mode output.
@@ -209,44 +594,43 @@ class OllamaLLM:
         if not thinking_content:
             return None
         
-        lines = thinking_content.strip().split('\n')
+        # Split and strip once; strategies 1 and 3 share the lines
+        lines = [line.strip() for line in thinking_content.strip().split('\n')]
         
         # Strategy 1: Look for quoted text (lines starting with >)
-        quoted_lines = [line.lstrip('> ').strip() for line in lines if line.strip().startswith('>')]
+        quoted_lines = [line.lstrip('> ').strip() for line in lines if line.startswith('>')]
         if quoted_lines:
             result = '\n'.join(quoted_lines)
             if 30 <= len(result) <= max_chars + 50:
                 return result
         
-        # Strategy 2: Look for explicit markers
-        markers = [
-            r'(?:final\s+)?(?:post|notification|message|announcement):\s*["\']?(.+?)["\']?\s*$',
-            r'here\'?s?\s+(?:the|my)\s+(?:post|notification):\s*["\']?(.+?)["\']?\s*$',
-            r'(?:output|result):\s*["\']?(.+?)["\']?\s*$',
-        ]
-        
-        full_text = thinking_content.lower()
-        for marker in markers:
-            match = re.search(marker, full_text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                result = match.group(1).strip().strip('"\'')
-                if 30 <= len(result) <= max_chars + 50:
-                    return result
+        # Strategy 2: Look for explicit markers, in one scan. A usable
+        # "post: ..." style marker wins over "output: ..." / "result: ...".
+        output_result = None
+        for match in _THINKING_MARKER_RE.finditer(thinking_content):
+            result = match.group('body').strip().strip('"\'')
+            if not 30 <= len(result) <= max_chars + 50:
+                continue
+            if match.group('post'):
+                return result
+            output_result = output_result or result
+        if output_result:
+            return output_result
         
         # Strategy 3: Look for lines with hashtags (likely the actual post)
         for line in reversed(lines):
-            line = line.strip()
             if '#' in line and 30 <= len(line) <= max_chars + 50:
                 # Clean up any leading markers
-                cleaned = re.sub(r'^(?:post|notification|message):\s*', '', line, flags=re.IGNORECASE)
+                cleaned = _THINKING_LINE_PREFIX_RE.sub('', line)
                 return cleaned
         
-        # Strategy 4: Take the last substantial paragraph
-        paragraphs = [p.strip() for p in thinking_content.split('\n\n') if p.strip()]
-        if paragraphs:
-            last_para = paragraphs[-1]
-            if 30 <= len(last_para) <= max_chars + 50:
-                return last_para
+        # Strategy 4: Take the last substantial paragraph (only the last one is stripped)
+        for paragraph in reversed(thinking_content.split('\n\n')):
+            last_para = paragraph.strip()
+            if last_para:
+                if 30 <= len(last_para) <= max_chars + 50:
+                    return last_para
+                break
         
         logger.warning("Could not extract notification from thinking mode output")
         return None
@@ -272,11 +656,11 @@ class OllamaLLM:
             List of hashtags (without # prefix, lowercase)
         """
         # Match hashtags: # followed by a letter, then any alphanumeric characters
-        hashtags = re.findall(r'#([a-zA-Z]\w*)', message)
+        hashtags = _HASHTAG_RE.findall(message)
         return [tag.lower() for tag in hashtags]
     
     @staticmethod
-    def _contains_forbidden_words(message: str) -> Tuple[bool, List[str]]:
+    def _contains_forbidden_words(message: str, lowered: Optional[str] = None) -> Tuple[bool, List[str]]:
         """
         Check if message contains clickbait/forbidden words.
         
@@ -289,24 +673,17 @@ class OllamaLLM:
         
         Args:
             message: The generated message
+            lowered: message.lower(), if the caller already has it
             
         Returns:
             tuple: (has_forbidden_words, list_of_found_words)
         """
-        # Forbidden words we explicitly tell the AI not to use
-        forbidden_words = [
-            'insane', 'epic', 'crazy', 'smash', 'unmissable', 
-            'incredible', 'amazing', 'lit', 'fire', 'legendary',
-            'mind-blowing', 'jaw-dropping', 'unbelievable'
-        ]
+        if lowered is None:
+            lowered = message.lower()
         
-        message_lower = message.lower()
-        found_words = []
-        
-        for word in forbidden_words:
-            # Use word boundaries to avoid false positives
-            if re.search(rf'\b{word}\b', message_lower):
-                found_words.append(word)
+        # Forbidden words we explicitly tell the AI not to use (_FORBIDDEN_WORDS)
+        matches = set(_FORBIDDEN_RE.findall(lowered))
+        found_words = [word for word in _FORBIDDEN_WORDS if word in matches]
         
         return (len(found_words) > 0, found_words)
     
@@ -324,20 +701,13 @@ class OllamaLLM:
         Returns:
             Number of emoji characters
         """
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map symbols
-            "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            "\U00002702-\U000027B0"  # dingbats
-            "\U000024C2-\U0001F251"  # enclosed characters
-            "]", flags=re.UNICODE
-        )
-        return len(emoji_pattern.findall(message))
+        if message.isascii():  # O(1) in CPython; plenty of posts have no emoji at all
+            return 0
+        return len(_EMOJI_RE.findall(message))
     
     @staticmethod
-    def _contains_profanity(message: str, severity: str = 'moderate') -> Tuple[bool, List[str]]:
+    def _contains_profanity(message: str, severity: str = 'moderate',
+                            lowered: Optional[str] = None) -> Tuple[bool, List[str]]:
         """
         Check if message contains profanity.
         
@@ -347,32 +717,43 @@ class OllamaLLM:
         Args:
             message: The message to check
             severity: 'mild', 'moderate', or 'severe'
+            lowered: message.lower(), if the caller already has it
             
         Returns:
             tuple: (has_profanity, list_of_found_words)
         """
-        # Profanity lists by severity
-        mild_words = ['damn', 'hell', 'crap', 'suck', 'sucks', 'piss', 'pissed']
-        moderate_words = ['ass', 'bastard', 'bitch', 'dick', 'cock', 'pussy', 'slut', 'whore']
-        severe_words = ['fuck', 'fucking', 'shit', 'shitty', 'motherfucker', 'asshole', 'cunt']
-        
-        if severity == 'severe':
-            check_words = mild_words + moderate_words + severe_words
-        elif severity == 'moderate':
-            check_words = mild_words + moderate_words
-        else:  # mild
-            check_words = mild_words
+        if lowered is None:
+            lowered = message.lower()
         
-        message_lower = message.lower()
-        found_words = []
+        # Profanity lists by severity (anything unknown counts as mild)
+        check_words, pattern = _PROFANITY_LEVELS.get(severity, _PROFANITY_LEVELS['mild'])
         
-        for word in check_words:
-            if re.search(rf'\b{word}\b', message_lower):
-                found_words.append(word)
+        matches = set(pattern.findall(lowered))
+        found_words = [word for word in check_words if word in matches]
         
         return (len(found_words) > 0, found_words)
     
-    def _is_duplicate_message(self, message: str) -> bool:
+    @staticmethod
+    def _normalize_message(message: str, lowered: Optional[str] = None) -> str:
+        """
+        Normalize a message for duplicate detection.
+        
+        Lowercases, then drops hashtags, punctuation and emoji and collapses whitespace.
+        
+        Args:
+            message: The message to normalize
+            lowered: message.lower(), if the caller already has it
+            
+        Returns:
+            Normalized text
+        """
+        if lowered is None:
+            lowered = message.lower()
+        normalized = _HASHTAG_STRIP_RE.sub('', lowered)  # Remove hashtags
+        normalized = _PUNCT_RE.sub('', normalized)  # Remove punctuation/emoji
+        return _WS_RE.sub(' ', normalized).strip()  # Normalize whitespace
+    
+    def _is_duplicate_message(self, message: str, lowered: Optional[str] = None) -> bool:
         """
         Check if message is too similar to recent messages.
         
@@ -381,6 +762,7 @@ class OllamaLLM:
         
         Args:
             message: The generated message to check
+            lowered: message.lower(), if the caller already has it
             
         Returns:
             True if message is a duplicate or too similar
@@ -388,28 +770,23 @@ class OllamaLLM:
         if not self.enable_deduplication:
             return False
         
-        # Normalize message for comparison
-        normalized = message.lower()
-        normalized = re.sub(r'#\w+', '', normalized)  # Remove hashtags
-        normalized = re.sub(r'[^\w\s]', '', normalized)  # Remove punctuation/emoji
-        normalized = re.sub(r'\s+', ' ', normalized).strip()  # Normalize whitespace
-        
-        for cached in self._message_cache:
-            cached_normalized = cached.lower()
-            cached_normalized = re.sub(r'#\w+', '', cached_normalized)
-            cached_normalized = re.sub(r'[^\w\s]', '', cached_normalized)
-            cached_normalized = re.sub(r'\s+', ' ', cached_normalized).strip()
-            
-            # Exact match
-            if normalized == cached_normalized:
-                return True
-            
-            # Calculate word overlap (>80% = duplicate)
-            msg_words = set(normalized.split())
-            cached_words = set(cached_normalized.split())
-            if len(msg_words) > 0 and len(cached_words) > 0:
+        # Normalize message for comparison (cached entries were normalized on insert)
+        normalized = self._normalize_message(message, lowered)
+        
+        # Exact match
+        if normalized in self._message_cache:
+            self._message_cache.move_to_end(normalized)
+            return True
+        
+        # Calculate word overlap (>80% = duplicate)
+        msg_words = frozenset(normalized.split())
+        if not msg_words:
+            return False
+        for cached_normalized, cached_words in self._message_cache.items():
+            if cached_words:
                 overlap = len(msg_words & cached_words) / max(len(msg_words), len(cached_words))
                 if overlap > 0.8:
+                    self._message_cache.move_to_end(cached_normalized)
                     return True
         
         return False
@@ -418,17 +795,20 @@ class OllamaLLM:
         """
         Add message to deduplication cache.
         
-        Uses a simple FIFO queue. Old messages get pushed out.
-        It's not rocket science, just a fucking list.
+        Stores the normalized text and its word set, so each message is
+        normalized once. Least recently seen messages get pushed out first.
+        It's not rocket science, just a fucking ordered dict.
         """
         if not self.enable_deduplication:
             return
         
-        self._message_cache.append(message)
+        normalized = self._normalize_message(message)
+        self._message_cache[normalized] = frozenset(normalized.split())
+        self._message_cache.move_to_end(normalized)
         
         # Keep cache size limited
-        if len(self._message_cache) > self.dedup_cache_size:
-            self._message_cache.pop(0)
+        while len(self._message_cache) > self.dedup_cache_size:
+            self._message_cache.popitem(last=False)
     
     def _validate_platform_specific(self, message: str, platform: str) -> List[str]:
         """
@@ -447,34 +827,8 @@ class OllamaLLM:
         if not self.enable_platform_validation:
             return []
         
-        issues = []
-        platform_lower = platform.lower()
-        
-        if platform_lower == 'discord':
-            # Check for mass pings
-            if '@everyone' in message or '@here' in message:
-                issues.append("Contains @everyone or @here mention")
-            
-            # Check for unmatched markdown
-            unmatched_markdown = (
-                message.count('**') % 2 != 0 or
-                message.count('__') % 2 != 0
-            )
-            if unmatched_markdown:
-                issues.append("Unmatched markdown formatting")
-        
-        elif platform_lower == 'bluesky':
-            # Check for URLs in content (we add URL separately)
-            urls_in_content = re.findall(r'https?://\S+', message)
-            if urls_in_content:
-                issues.append("URL found in content (should be added separately)")
-        
-        elif platform_lower == 'mastodon':
-            # Check for HTML entities
-            if re.search(r'&[a-z]+;', message):
-                issues.append("HTML entities detected (should be plain text)")
-        
-        return issues
+        validator = _PLATFORM_VALIDATORS.get(platform.lower())
+        return validator(message) if validator else []
     
     @staticmethod
     def _safe_trim(message: str, limit: int) -> str:
@@ -533,7 +887,7 @@ class OllamaLLM:
                 parts.update(p.lower() for p in clean_username.split(separator) if len(p) >= 3)
         
         # Split CamelCase: CoolStreamer99 -> Cool, Streamer, 99
-        camel_parts = re.findall(r'[A-Z]*[a-z]+|[A-Z]+(?=[A-Z]|$)|[0-9]+', clean_username)
+        camel_parts = _CAMEL_SPLIT_RE.findall(clean_username)
         parts.update(p.lower() for p in camel_parts if len(p) >= 3)
         
         # Also add consecutive parts for partial matches
@@ -562,7 +916,7 @@ class OllamaLLM:
         message = re.sub(pattern, '', message, flags=re.IGNORECASE)
         
         # Clean up extra spaces
-        message = re.sub(r'\s+', ' ', message).strip()
+        message = _WS_RE.sub(' ', message).strip()
         
         return message
     
@@ -654,27 +1008,12 @@ class OllamaLLM:
             issues.append(f"Contains forbidden words: {', '.join(found_words)}")
         
         # Check if message accidentally includes a URL
-        if re.search(r'https?://', message):
+        if _URL_SCHEME_RE.search(message):
             issues.append("Message contains URL (should be added separately)")
         
         # Check for common hallucinations (video-specific)
-        hallucination_patterns = [
-            r'drops?\s+enabled',
-            r'giveaway',
-            r'tonight\s+at\s+\d',
-            r'premiering?\s+at\s+\d',
-            r'\d+\s*pm',
-            r'\d+\s*am',
-            r'coming\s+soon',
-            r'\d+\s+views?',
-            r'subscribe\s+for',
-            r'special\s+guest',
-            r'live\s+now',
-            r'streaming\s+now',
-        ]
-        
-        for pattern in hallucination_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
+        for pattern, compiled in _HALLUCINATION_PATTERNS:
+            if compiled.search(message):
                 issues.append(f"Possible hallucination detected: '{pattern}'")
                 break  # Only report first hallucination
         
@@ -725,7 +1064,7 @@ class OllamaLLM:
             issues.append(f"Too many generic phrases ({generic_count})")
         
         # Check length (too short = lazy, too long = rambling)
-        content_without_hashtags = re.sub(r'#\w+', '', message).strip()
+        content_without_hashtags = _HASHTAG_STRIP_RE.sub('', message).strip()
         word_count = len(content_without_hashtags.split())
         
         if word_count < 5:
@@ -752,9 +1091,9 @@ class OllamaLLM:
             issues.append("Doesn't reference video title/content")
         
         # Check if message is just reposting the title
-        content_before_hashtags = re.split(r'\s+#', message)[0].strip()
-        content_no_punct = re.sub(r'[^\w\s]', '', content_before_hashtags.lower())
-        title_no_punct = re.sub(r'[^\w\s]', '', title.lower())
+        content_before_hashtags = _HASHTAG_SPLIT_RE.split(message, maxsplit=1)[0].strip()
+        content_no_punct = _PUNCT_RE.sub('', content_before_hashtags.lower())
+        title_no_punct = _PUNCT_RE.sub('', title.lower())
         
         if content_no_punct.strip() == title_no_punct.strip():
             score -= 4
@@ -764,10 +1103,7 @@ class OllamaLLM:
             issues.append("Message too similar to title - should add value")
         
         # Check for personality/engagement
-        has_personality = bool(
-            re.search(r'[!?]', message) or
-            re.search(r'[\U0001F600-\U0001F64F]', message)  # emoji
-        )
+        has_personality = bool(_PERSONALITY_RE.search(message))
         
         if not has_personality:
             score -= 1
@@ -778,7 +1114,176 @@ class OllamaLLM:
         
         return (score, issues)
     
-    def _generate_with_retry(self, prompt: str, max_retries: int = None, initial_delay: float = None, max_tokens: int = None) -> Optional[str]:
+    def _response_text(self, response, max_tokens: int) -> Optional[str]:
+        """
+        Pull the post text out of an Ollama generate response.
+        
+        Args:
+            response: Response from Client.generate() or AsyncClient.generate()
+            max_tokens: Requested max tokens (bounds thinking mode extraction)
+            
+        Returns:
+            Response text (possibly empty) or None
+        """
+        # Extract response text - handle thinking mode. generate() returns a
+        # GenerateResponse with a top-level 'thinking' field; chat-style
+        # payloads carry it under 'message'.
+        if hasattr(response, 'response'):
+            result = (response.response or '').strip()
+            thinking_content = getattr(response, 'thinking', None) or ''
+            if not thinking_content:
+                thinking_content = getattr(getattr(response, 'message', None), 'thinking', None) or ''
+        elif isinstance(response, dict):
+            result = (response.get('response') or '').strip()
+            message = response.get('message')
+            if not isinstance(message, dict):
+                message = {}
+            # Check for thinking field (Qwen3)
+            thinking_content = response.get('thinking') or message.get('thinking') or ''
+            if not result:
+                result = (message.get('content') or '').strip()
+        else:
+            # Don't stringify unknown objects - that's a repr, not a post
+            logger.warning(f"Unexpected Ollama response type: {type(response).__name__}")
+            return None
+        
+        # Structured output: the post is the schema's one field
+        if self.json_output and result:
+            post = self._json_post(result)
+            if post is not None:
+                return post
+        
+        # If content is empty but thinking has content, extract from thinking
+        if (not result or len(result) < 20) and thinking_content and self.thinking_mode_enabled:
+            logger.info("Content empty, extracting from thinking field...")
+            extracted = self._extract_from_thinking(thinking_content, max_tokens * 3)
+            if extracted:
+                result = extracted
+                logger.info(f"Extracted {len(result)} chars from thinking mode")
+        
+        return result
+    
+    @staticmethod
+    def _json_post(text: str) -> Optional[str]:
+        """
+        Read the post out of a structured {"post": ...} response.
+        
+        Args:
+            text: Response text generated against _POST_SCHEMA
+            
+        Returns:
+            Stripped post text, or None if the response isn't the expected JSON
+        """
+        try:
+            post = json.loads(text).get('post')
+        except (ValueError, AttributeError):
+            post = None
+        if not isinstance(post, str):
+            logger.debug("Structured Ollama response wasn't {\"post\": ...}, using the raw text")
+            return None
+        return post.strip()
+    
+    def _request_kwargs(self, max_chars: Optional[int]) -> dict:
+        """
+        Extra generate() arguments for one request.
+        
+        Args:
+            max_chars: Post character limit (None = no streaming)
+            
+        Returns:
+            Dict with 'keep_alive', 'format' for structured output and/or
+            'stream' for early stop
+        """
+        request = {}
+        if self.keep_alive is not None:
+            request['keep_alive'] = self.keep_alive
+        if self.json_output:
+            # The post is only readable once the JSON is complete, so no early stop
+            request['format'] = _POST_SCHEMA
+        elif max_chars is not None and not self.thinking_mode_enabled:
+            # Thinking models may inline their reasoning (hashtags and all)
+            # into the response, so only stream when thinking mode is off
+            request['stream'] = True
+        return request
+    
+    def _generation_options(self, max_tokens: int) -> dict:
+        """
+        Get the generate() options for a token limit, built once per limit.
+        
+        Args:
+            max_tokens: Requested max tokens (before the thinking mode multiplier)
+            
+        Returns:
+            Ollama options dict (shared - don't modify)
+        """
+        options = self._gen_options.get(max_tokens)
+        if options is None:
+            # Apply thinking mode token multiplier if enabled
+            num_predict = max_tokens
+            if self.thinking_mode_enabled:
+                num_predict = int(max_tokens * self.thinking_token_multiplier)
+                logger.debug(f"Thinking mode: {max_tokens} * {self.thinking_token_multiplier} = {num_predict} tokens")
+            options = self._gen_options[max_tokens] = {
+                **self.server_options,
+                'num_predict': num_predict,
+                'temperature': self.temperature,
+                'top_p': self.top_p,
+            }
+        return options
+    
+    @staticmethod
+    def _read_stream(stream, max_chars: int, hashtag_count: int) -> dict:
+        """
+        Collect a streamed generate() response, stopping once the post is complete.
+        
+        Closing the stream early drops the connection, which makes the Ollama
+        server stop generating - the tokens we'd throw away are never computed.
+        
+        Args:
+            stream: Iterator of generate() chunks
+            max_chars: Platform character limit
+            hashtag_count: Expected number of hashtags
+            
+        Returns:
+            Dict with the collected 'response' and 'thinking' text
+        """
+        text = []
+        thinking = []
+        length = 0
+        try:
+            for chunk in stream:
+                if chunk.get('thinking'):
+                    thinking.append(chunk['thinking'])
+                if chunk.get('response'):
+                    text.append(chunk['response'])
+                    length += len(chunk['response'])
+                    if _post_complete(text, length, max_chars, hashtag_count):
+                        break
+        finally:
+            stream.close()
+        return {'response': ''.join(text), 'thinking': ''.join(thinking)}
+    
+    @staticmethod
+    async def _aread_stream(stream, max_chars: int, hashtag_count: int) -> dict:
+        """Async version of _read_stream()."""
+        text = []
+        thinking = []
+        length = 0
+        try:
+            async for chunk in stream:
+                if chunk.get('thinking'):
+                    thinking.append(chunk['thinking'])
+                if chunk.get('response'):
+                    text.append(chunk['response'])
+                    length += len(chunk['response'])
+                    if _post_complete(text, length, max_chars, hashtag_count):
+                        break
+        finally:
+            await stream.aclose()
+        return {'response': ''.join(text), 'thinking': ''.join(thinking)}
+    
+    def _generate_with_retry(self, prompt: str, max_retries: int = None, initial_delay: float = None, max_tokens: int = None,
+                             max_chars: int = None, hashtag_count: int = 0) -> Optional[str]:
         """
         Generate content with Ollama, with retry logic and thinking mode support.
         
@@ -787,6 +1292,9 @@ class OllamaLLM:
             max_retries: Maximum number of retry attempts (defaults to self.max_retries)
             initial_delay: Initial delay in seconds (defaults to self.retry_delay_base)
             max_tokens: Maximum tokens for response (defaults to self.max_tokens)
+            max_chars: Post character limit; if set (and thinking mode and JSON
+                output are off), the response is streamed and generation stops once the post is complete
+            hashtag_count: Expected number of hashtags (for the early stop)
             
         Returns:
             Generated text or None on failure
@@ -808,12 +1316,8 @@ class OllamaLLM:
         
         last_error = None
         delay = initial_delay
-        
-        # Apply thinking mode token multiplier if enabled
-        actual_max_tokens = max_tokens
-        if self.thinking_mode_enabled:
-            actual_max_tokens = int(max_tokens * self.thinking_token_multiplier)
-            logger.debug(f"Thinking mode: {max_tokens} * {self.thinking_token_multiplier} = {actual_max_tokens} tokens")
+        options = self._generation_options(max_tokens)
+        request = self._request_kwargs(max_chars)
         
         for attempt in range(max_retries):
             try:
@@ -821,39 +1325,13 @@ class OllamaLLM:
                 response = self.ollama_client.generate(
                     model=self.model,
                     prompt=prompt,
-                    options={
-                        'num_predict': actual_max_tokens,
-                        'temperature': self.temperature,
-                        'top_p': self.top_p,
-                    }
+                    options=options,
+                    **request
                 )
+                if request.get('stream'):
+                    response = self._read_stream(response, max_chars, hashtag_count)
                 
-                # Extract response text - handle thinking mode
-                result = None
-                thinking_content = None
-                
-                if isinstance(response, dict):
-                    result = response.get('response', '').strip()
-                    # Check for thinking field (Qwen3)
-                    if 'message' in response and isinstance(response['message'], dict):
-                        thinking_content = response['message'].get('thinking', '')
-                        if not result:
-                            result = response['message'].get('content', '').strip()
-                elif hasattr(response, 'response'):
-                    result = response.response.strip()
-                    if hasattr(response, 'message') and hasattr(response.message, 'thinking'):
-                        thinking_content = response.message.thinking
-                else:
-                    result = str(response).strip()
-                
-                # If content is empty but thinking has content, extract from thinking
-                if (not result or len(result) < 20) and thinking_content and self.thinking_mode_enabled:
-                    logger.info("Content empty, extracting from thinking field...")
-                    extracted = self._extract_from_thinking(thinking_content, max_tokens * 3)
-                    if extracted:
-                        result = extracted
-                        logger.info(f"Extracted {len(result)} chars from thinking mode")
-                
+                result = self._response_text(response, max_tokens)
                 if result:
                     return result
                 else:
@@ -865,21 +1343,263 @@ class OllamaLLM:
                 error_str = str(e).lower()
                 
                 # Don't retry on permanent errors
-                if any(perm in error_str for perm in ['not found', 'invalid', 'unauthorized']):
+                if _PERMANENT_ERROR_RE.search(error_str):
                     logger.error("Ollama API permanent error")
                     return None
                 
                 # Retry on transient errors
                 if attempt < max_retries - 1:
                     logger.warning(f"Ollama API error (attempt {attempt + 1}/{max_retries})")
-                    logger.debug(f"Retrying in {delay}s...")
-                    time.sleep(delay)
-                    delay *= 2  # Exponential backoff
+                    sleep_for = _jittered(delay)
+                    logger.debug(f"Retrying in {sleep_for:.1f}s...")
+                    time.sleep(sleep_for)
+                    delay = min(delay * 2, _MAX_BACKOFF)  # Exponential backoff
+                else:
+                    logger.error(f"Ollama API failed after {max_retries} attempts")
+        
+        return None
+    
+    def _http_options(self) -> dict:
+        """
+        httpx settings shared by the sync and async Ollama clients.
+        
+        The ollama package defaults to no timeout at all, so a wedged server
+        would hang the daemon forever. Keep-alive is stretched past httpx's
+        5 second default so back-to-back platform posts skip the reconnect.
+        """
+        return {
+            'timeout': httpx.Timeout(self.request_timeout, connect=10.0),
+            'limits': httpx.Limits(max_keepalive_connections=8, max_connections=16,
+                                   keepalive_expiry=_KEEPALIVE_EXPIRY),
+        }
+    
+    def close(self):
+        """Close the pooled connections to the Ollama server."""
+        if self.ollama_client is not None:
+            http = _http_client(self.ollama_client)
+            if http is not None:
+                http.close()
+            self.ollama_client = None
+        self.enabled = False
+    
+    def clear_cache(self) -> None:
+        """Drop all cached LLM responses (memory and disk)."""
+        if self.cache:
+            self.cache.clear()
+            logger.info("🗑 LLM cache cleared")
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache counters for this run.
+        
+        Returns:
+            Dict with hits, semantic_hits, misses, hit_rate and entry counts
+            (empty if the cache is disabled)
+        """
+        return self.cache.stats() if self.cache else {}
+    
+    def _get_async_client(self):
+        """
+        Get the async Ollama client for the running event loop.
+        
+        httpx connection pools belong to the loop that opened them, so each
+        asyncio.run() gets a fresh client instead of reusing dead connections.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = ollama.AsyncClient(host=self.ollama_host, **self._http_options())
+            self._async_client_loop = loop
+        return self._async_client
+    
+    async def _agenerate_with_retry(self, prompt: str, max_retries: int = None, initial_delay: float = None,
+                                    max_tokens: int = None, max_chars: int = None,
+                                    hashtag_count: int = 0) -> Optional[str]:
+        """
+        Async version of _generate_with_retry().
+        
+        Backoff sleeps with asyncio.sleep() so other platforms' requests keep
+        going while this one waits.
+        """
+        if not self.enabled or not self.ollama_client:
+            return None
+        
+        if max_retries is None:
+            max_retries = self.max_retries
+        if initial_delay is None:
+            initial_delay = float(self.retry_delay_base)
+        if max_tokens is None:
+            max_tokens = self.max_tokens
+        
+        delay = initial_delay
+        options = self._generation_options(max_tokens)
+        request = self._request_kwargs(max_chars)
+        
+        for attempt in range(max_retries):
+            try:
+                client = self._get_async_client()
+                response = await client.generate(
+                    model=self.model,
+                    prompt=prompt,
+                    options=options,
+                    **request
+                )
+                if request.get('stream'):
+                    response = await self._aread_stream(response, max_chars, hashtag_count)
+                
+                result = self._response_text(response, max_tokens)
+                if result:
+                    return result
+                else:
+                    logger.warning("Empty response from Ollama")
+                    return None
+                
+            except Exception as e:
+                error_str = str(e).lower()
+                
+                if _PERMANENT_ERROR_RE.search(error_str):
+                    logger.error("Ollama API permanent error")
+                    return None
+                
+                if attempt < max_retries - 1:
+                    logger.warning(f"Ollama API error (attempt {attempt + 1}/{max_retries})")
+                    sleep_for = _jittered(delay)
+                    logger.debug(f"Retrying in {sleep_for:.1f}s...")
+                    await asyncio.sleep(sleep_for)
+                    delay = min(delay * 2, _MAX_BACKOFF)  # Exponential backoff
                 else:
                     logger.error(f"Ollama API failed after {max_retries} attempts")
         
         return None
     
+    def _post_cache_key(self, prompt: str, social_platform: str) -> Tuple[str, Optional[str]]:
+        """
+        Get the cache task name and key for a post prompt.
+        
+        Returns:
+            tuple: (task name, cache key or None if the cache is disabled)
+        """
+        task = f"notification:{social_platform.lower()}"
+        if not self.cache:
+            return task, None
+        return task, self.cache.make_key(task, self.model or '', prompt)
+    
+    def _generate_post(self, prompt: str, guardrails: dict) -> Optional[str]:
+        """
+        Get the raw text for one post, from the response cache or from Ollama.
+        
+        Args:
+            prompt: Prompt from _prepare_notification()
+            guardrails: Settings from _prepare_notification()
+            
+        Returns:
+            Raw LLM output or None on failure
+        """
+        task, cache_key = self._post_cache_key(prompt, guardrails['social_platform'])
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("💾 LLM cache hit (%s)", task)
+                return cached
+        
+        text = self._generate_with_retry(
+            prompt, max_chars=guardrails['max_chars'], hashtag_count=guardrails['hashtag_count']
+        )
+        if cache_key and text:
+            self.cache.set(cache_key, task, text)
+        return text
+    
+    async def _agenerate_post(self, prompt: str, guardrails: dict) -> Optional[str]:
+        """Async version of _generate_post()."""
+        task, cache_key = self._post_cache_key(prompt, guardrails['social_platform'])
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("💾 LLM cache hit (%s)", task)
+                return cached
+        
+        text = await self._agenerate_with_retry(
+            prompt, max_chars=guardrails['max_chars'], hashtag_count=guardrails['hashtag_count']
+        )
+        if cache_key and text:
+            self.cache.set(cache_key, task, text)
+        return text
+    
+    def _prepare_notification(self, video_data: dict, platform_name: str, social_platform: str) -> Tuple[str, dict]:
+        """
+        Build the prompt and guardrail settings for one platform's post.
+        
+        Args:
+            video_data: Video information dict (title, description, url, etc.)
+            platform_name: Source platform name (YouTube, TikTok, etc.)
+            social_platform: Target social platform (discord, matrix, bluesky, mastodon)
+            
+        Returns:
+            tuple: (prompt, keyword arguments for _apply_guardrails)
+        """
+        title = video_data.get('title', '')
+        description = video_data.get('description', '')
+        channel_name = video_data.get('channel_name', platform_name)
+        
+        # Platform-specific character limits and hashtag settings
+        max_chars, use_hashtags, hashtag_count = _PLATFORM_LIMITS.get(social_platform.lower(), _DEFAULT_LIMITS)
+        
+        # Build the optimized prompt
+        prompt = self._build_notification_prompt(
+            platform_name=platform_name,
+            channel_name=channel_name,
+            title=title,
+            description=description,
+            max_chars=max_chars,
+            use_hashtags=use_hashtags,
+            hashtag_count=hashtag_count,
+            social_platform=social_platform
+        )
+        
+        guardrails = {
+            'max_chars': max_chars,
+            'social_platform': social_platform,
+            'use_hashtags': use_hashtags,
+            'title': title,
+            'channel_name': channel_name,
+            'hashtag_count': hashtag_count,
+        }
+        return prompt, guardrails
+    
+    def _finish_notification(self, notification: Optional[str], url: str, guardrails: dict) -> Optional[str]:
+        """
+        Run guardrails on a generated post, remember it for dedup and append the URL.
+        
+        Args:
+            notification: Raw LLM output (None if generation failed)
+            url: Video URL to append
+            guardrails: Settings from _prepare_notification()
+            
+        Returns:
+            Final notification text or None if generation or guardrails failed
+        """
+        social_platform = guardrails['social_platform']
+        
+        if not notification:
+            logger.warning(f"Failed to generate notification for {social_platform}")
+            return None
+        
+        # Apply guardrails and validation
+        notification = self._apply_guardrails(notification, **guardrails)
+        
+        if not notification:
+            logger.warning(f"Notification failed guardrails for {social_platform}")
+            return None
+        
+        # Add to deduplication cache
+        self._add_to_message_cache(notification)
+        
+        # Add URL
+        if url:
+            notification += f"\n\n{url}"
+        
+        logger.info(f"✨ Generated {social_platform} post with Ollama: {notification[:60]}...")
+        return notification
+    
     def generate_notification(self, video_data: dict, platform_name: str, social_platform: str) -> Optional[str]:
         """
         Generate a platform-specific notification message.
@@ -900,83 +1620,111 @@ class OllamaLLM:
             return None
         
         try:
-            title = video_data.get('title', '')
-            description = video_data.get('description', '')
-            url = video_data.get('url', '')
-            channel_name = video_data.get('channel_name', platform_name)
+            prompt, guardrails = self._prepare_notification(video_data, platform_name, social_platform)
             
-            # Platform-specific character limits and hashtag settings
-            social_platform_lower = social_platform.lower()
+            # Generate with retry logic (or reuse a cached response)
+            notification = self._generate_post(prompt, guardrails)
             
-            if social_platform_lower == 'bluesky':
-                max_chars = 250  # Conservative for Bluesky's 300 grapheme limit
-                use_hashtags = True
-                hashtag_count = 3
-            elif social_platform_lower == 'mastodon':
-                max_chars = 400  # Leave room for URL and hashtags
-                use_hashtags = True
-                hashtag_count = 3
-            elif social_platform_lower == 'discord':
-                max_chars = 300
-                use_hashtags = False
-                hashtag_count = 0
-            elif social_platform_lower == 'matrix':
-                max_chars = 350
-                use_hashtags = False
-                hashtag_count = 0
-            else:
-                max_chars = 300
-                use_hashtags = False
-                hashtag_count = 0
-            
-            # Build the optimized prompt
-            prompt = self._build_notification_prompt(
-                platform_name=platform_name,
-                channel_name=channel_name,
-                title=title,
-                description=description,
-                max_chars=max_chars,
-                use_hashtags=use_hashtags,
-                hashtag_count=hashtag_count,
-                social_platform=social_platform
-            )
-            
-            # Generate with retry logic
-            notification = self._generate_with_retry(prompt)
-            
-            if not notification:
-                logger.warning(f"Failed to generate notification for {social_platform}")
-                return None
-            
-            # Apply guardrails and validation
-            notification = self._apply_guardrails(
-                notification,
-                max_chars=max_chars,
-                social_platform=social_platform,
-                use_hashtags=use_hashtags,
-                title=title,
-                channel_name=channel_name,
-                hashtag_count=hashtag_count
-            )
-            
-            if not notification:
-                logger.warning(f"Notification failed guardrails for {social_platform}")
-                return None
-            
-            # Add to deduplication cache
-            self._add_to_message_cache(notification)
-            
-            # Add URL
-            if url:
-                notification += f"\n\n{url}"
-            
-            logger.info(f"✨ Generated {social_platform} post with Ollama: {notification[:60]}...")
-            return notification
+            return self._finish_notification(notification, video_data.get('url', ''), guardrails)
             
         except Exception as e:
             logger.error(f"Error generating Ollama notification for {social_platform}: {e}")
             return None
     
+    async def agenerate_notification(self, video_data: dict, platform_name: str, social_platform: str) -> Optional[str]:
+        """Async version of generate_notification()."""
+        results = await self.agenerate_notifications(video_data, platform_name, [social_platform])
+        return results[social_platform.lower()]
+    
+    async def agenerate_notifications(self, video_data: dict, platform_name: str,
+                                      social_platforms: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Generate posts for several social platforms concurrently.
+        
+        All prompts go to the server at once instead of one after another.
+        Set OLLAMA_NUM_PARALLEL on the Ollama server (e.g. 4) so it runs them
+        in parallel slots rather than queueing them. Guardrails run afterwards,
+        in platform order, so dedup sees the same sequence as the sync path.
+        
+        With LLM_OLLAMA_SHARED_POST, only the most constrained platform's post
+        is generated; the others reuse it, hashtags removed where the platform
+        doesn't use them.
+        
+        Args:
+            video_data: Video information dict (title, description, url, etc.)
+            platform_name: Source platform name (YouTube, TikTok, etc.)
+            social_platforms: Target social platforms (discord, matrix, bluesky, mastodon)
+            
+        Returns:
+            Dict of social platform (lowercase) -> post text, or None where generation failed
+        """
+        if not self.enabled:
+            return {target.lower(): None for target in social_platforms}
+        
+        requests = [self._prepare_notification(video_data, platform_name, target) for target in social_platforms]
+        shared_post = self.shared_post and len(requests) > 1
+        if shared_post:
+            # One generation for the most constrained hashtag platform; the
+            # guardrails trim it to each platform's limit below
+            prompt, guardrails = min(requests, key=lambda r: (not r[1]['use_hashtags'], r[1]['max_chars']))
+            try:
+                shared = await self._agenerate_post(prompt, guardrails)
+            except Exception as e:
+                shared = e
+            results = [shared] * len(requests)
+        else:
+            results = await asyncio.gather(
+                *(self._agenerate_post(prompt, guardrails) for prompt, guardrails in requests),
+                return_exceptions=True
+            )
+        
+        url = video_data.get('url', '')
+        posts = {}
+        for target, (_, guardrails), result in zip(social_platforms, requests, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error generating Ollama notification for {target}: {result}")
+                result = None
+            elif result and shared_post:
+                if not guardrails['use_hashtags']:
+                    result = _WS_RE.sub(' ', _HASHTAG_STRIP_RE.sub('', result)).strip()
+                if posts:
+                    # Siblings of one shared post are meant to match each other
+                    guardrails = dict(guardrails, check_duplicates=False)
+            try:
+                posts[target.lower()] = self._finish_notification(result, url, guardrails)
+            except Exception as e:
+                logger.error(f"Error generating Ollama notification for {target}: {e}")
+                posts[target.lower()] = None
+        return posts
+    
+    def generate_all_notifications(self, video_data: dict, platform_name: str,
+                                   social_platforms: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Generate posts for several social platforms (unified interface).
+        
+        Blocking wrapper around agenerate_notifications() for the sync daemon loop.
+        
+        Args:
+            video_data: Video information dict (title, description, url, etc.)
+            platform_name: Source platform name (YouTube, TikTok, etc.)
+            social_platforms: Target social platforms (discord, matrix, bluesky, mastodon)
+            
+        Returns:
+            Dict of social platform (lowercase) -> post text, or None where generation failed
+        """
+        async def run():
+            try:
+                return await self.agenerate_notifications(video_data, platform_name, social_platforms)
+            finally:
+                # The loop ends with this call, so its connection pool can't be reused
+                if self._async_client is not None and self._async_client_loop is asyncio.get_running_loop():
+                    http = _http_client(self._async_client)
+                    if http is not None:
+                        await http.aclose()
+                    self._async_client = None
+        
+        return asyncio.run(run())
+    
     def _build_notification_prompt(
         self,
         platform_name: str,
@@ -1000,63 +1748,20 @@ class OllamaLLM:
         """
         # Clean up description (first 200 chars, remove URLs)
         clean_description = description[:200] if description else ''
-        clean_description = re.sub(r'https?://\S+', '', clean_description).strip()
+        clean_description = _URL_RE.sub('', clean_description).strip()
         
-        # Build hashtag instructions
-        hashtag_instruction = ""
-        if use_hashtags:
-            hashtag_instruction = f"""
-
-STEP 3 - HASHTAG RULES (CRITICAL):
-You MUST include EXACTLY {hashtag_count} hashtags at the end.
-- Extract hashtags from key words/topics in the title
-- NEVER use generic tags like #Video, #YouTube, #New, #Content
-- Format: space before each hashtag"""
+        description_line = f'DESCRIPTION: "{clean_description}"\n' if clean_description else ''
+        hashtag_rule = f'Exactly {hashtag_count} hashtags. ' if use_hashtags else 'No hashtags. '
+        # The JSON instruction goes before the "Post:" cue, never after it
+        json_line = f'\n{_JSON_POST_INSTRUCTION}' if self.json_output else ''
         
-        prompt = f"""You are a social media assistant that writes engaging video announcements with personality.
-
-TASK: Write a short, engaging post announcing a new {platform_name} video from {channel_name}.
+        # Fixed rules first, video details last: the shared prefix lets Ollama
+        # reuse its KV cache instead of re-reading the rules for every post
+        prompt = f"""{_NOTIFICATION_RULES}
 
+NOW: Write the post announcing a new {platform_name} video from {channel_name}.
 VIDEO TITLE: "{title}"
-{f'DESCRIPTION: "{clean_description}"' if clean_description else ''}
-
-STEP 1 - STYLE & TONE:
-✓ Match the vibe: Read the title and match its energy (technical, gaming, tutorial, entertainment, etc.)
-✓ Be personality-driven: Write like a real person with character, not a corporate bot
-✓ Add interest: Make people want to click - build curiosity without being cringe
-✓ Use formatting: Short lines or natural flow work great
-✓ Emoji: Use 0-1 emoji that fits the vibe (🎬 for video, 🎮 for gaming, 💻 for tech, etc.)
-
-STEP 2 - CONTENT RULES (FOLLOW EXACTLY):
-✓ Length: MUST be {max_chars} characters or less (including hashtags)
-✓ Output: ONLY the post text (no quotes, no meta-commentary, no "Here's...")
-✓ Based on title: Reference what the video is about BUT don't just copy/paste the title
-✓ Call-to-action: Natural invite like "check it out", "link below", "new video"
-✗ DO NOT repost the title verbatim - the link already shows it
-✗ DO NOT include the URL (it's added automatically)
-✗ DO NOT invent details not in the title (no "giveaways", "premiering tonight", etc.)
-✗ DO NOT use cringe words: "INSANE", "EPIC", "smash that", "unmissable", "legendary", "incredible"{hashtag_instruction}
-
-EXAMPLES OF GOOD POSTS:
-
-Example 1 - Tech Tutorial:
-Title: "Building a Home Server with Proxmox"
-Good: "New video! Building out a home server with Proxmox. Full walkthrough from hardware to config 💻 #Homelab #Proxmox #SelfHosted"
-
-Example 2 - Gaming:
-Title: "Elden Ring Boss Guide - Malenia"
-Good: "Finally beat Malenia and made a guide about it. Tips that actually work. #EldenRing #BossGuide #Gaming"
-
-Example 3 - Casual/Vlog:
-Title: "Day in My Life - Remote Worker Edition"
-Good: "New vlog is up! A day in my life working remote. Coffee, code, and questionable time management 🎬 #RemoteWork #Vlog #DayInMyLife"
-
-BAD examples to AVOID:
-✗ "EPIC new video just dropped! INSANE content! #AMAZING #EPIC" (cringe, forbidden words)
-✗ Just copying: "Building a Home Server with Proxmox #Server #Home #Build" (lazy, no personality)
-✗ "Check out my new video at https://..." (don't include URL)
-
-NOW: Write the post for "{title}" from {channel_name}. Match the title's energy. {f'Exactly {hashtag_count} hashtags. ' if use_hashtags else 'No hashtags needed. '}Under {max_chars} characters.
+{description_line}Match the title's energy. {hashtag_rule}Under {max_chars} characters.{json_line}
 
 Post:"""
         
@@ -1070,7 +1775,8 @@ Post:"""
         use_hashtags: bool,
         title: str = '',
         channel_name: str = '',
-        hashtag_count: int = 0
+        hashtag_count: int = 0,
+        check_duplicates: bool = True
     ) -> Optional[str]:
         """
         Apply quality guardrails and validation to generated notification.
@@ -1089,34 +1795,41 @@ Post:"""
             return None
         
         # Clean up common meta-text patterns
-        meta_patterns = [
-            r'^(?:Here\'?s|Okay,? here\'?s|Alright,? here\'?s)\s+.*?:?\s*',
-            r'^(?:Here you go|Sure thing|Certainly).*?:?\s*',
-            r'^(?:Post|Draft|Output).*?:?\s*',
-            r'^"',  # Leading quote
-            r'"$',  # Trailing quote
-        ]
-        
-        for pattern in meta_patterns:
-            notification = re.sub(pattern, '', notification, flags=re.IGNORECASE | re.MULTILINE)
-        notification = notification.strip()
+        for pattern in _META_PATTERNS:
+            notification = pattern.sub('', notification)
+        notification = _QUOTE_EDGE_RE.sub('', notification).strip()
         
         # Remove any URLs the LLM might have included
-        notification = re.sub(r'https?://[^\s]+', '', notification).strip()
+        notification = _URL_RE.sub('', notification).strip()
+        generated = notification
+        
+        # Remove username-derived hashtags
+        if channel_name:
+            notification = self._validate_hashtags_against_username(notification, channel_name)
+        
+        # Lowercase once for the word filters and the duplicate check
+        lowered = notification.lower()
+        
+        # Ordering: profanity is the only check that rejects a post, so it runs
+        # before the warn-only diagnostics below. A post we're throwing away
+        # doesn't need its hashtags counted or its hallucinations graded.
+        # Keep any new rejecting check up here, ahead of the warnings.
+        if self.enable_profanity_filter:
+            has_profanity, found_profanity = self._contains_profanity(notification, self.profanity_severity, lowered)
+            if has_profanity:
+                logger.warning(f"⚠ Notification contains profanity: {', '.join(found_profanity)}")
+                return None  # Fail the notification
         
         # Validate message quality (hallucinations, forbidden words, etc.)
+        # on the post as generated, before username hashtags were removed
         if use_hashtags and hashtag_count > 0:
-            is_valid, issues = self._validate_message_quality(notification, hashtag_count, title, channel_name)
+            is_valid, issues = self._validate_message_quality(generated, hashtag_count, title, channel_name)
             if not is_valid:
                 for issue in issues:
                     logger.warning(f"⚠ Quality issue: {issue}")
         
-        # Remove username-derived hashtags
-        if channel_name:
-            notification = self._validate_hashtags_against_username(notification, channel_name)
-        
         # Check for forbidden words
-        has_forbidden, found_words = self._contains_forbidden_words(notification)
+        has_forbidden, found_words = self._contains_forbidden_words(notification, lowered)
         if has_forbidden:
             logger.warning(f"⚠ Notification contains forbidden words: {', '.join(found_words)}")
         
@@ -1125,13 +1838,6 @@ Post:"""
         if emoji_count > self.max_emoji_count:
             logger.warning(f"⚠ Too many emojis ({emoji_count}, max: {self.max_emoji_count})")
         
-        # Check for profanity if filter is enabled
-        if self.enable_profanity_filter:
-            has_profanity, found_profanity = self._contains_profanity(notification, self.profanity_severity)
-            if has_profanity:
-                logger.warning(f"⚠ Notification contains profanity: {', '.join(found_profanity)}")
-                return None  # Fail the notification
-        
         # Quality scoring (if enabled)
         if self.enable_quality_scoring and title:
             score, score_issues = self._score_message_quality(notification, title)
@@ -1142,7 +1848,7 @@ Post:"""
                 # Don't fail, but log the issues
         
         # Check for duplicates
-        if self._is_duplicate_message(notification):
+        if check_duplicates and self._is_duplicate_message(notification, lowered):
             logger.warning("⚠ Notification is too similar to recent messages")
         
         # Platform-specific validation
@@ -14,7 +14,7 @@ import time
 import signal
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
 from boon_tube_daemon.utils.config import load_config, get_config, get_bool_config, get_int_config, get_float_config
@@ -53,6 +53,12 @@ class BoonTubeDaemon:
         self.media_platforms: List = []
         self.social_platforms: List = []
         self.llm = None
+        # LLM feature flags, read once in initialize() - with Doppler every
+        # get_config() is a secrets API call, so keep them off the per-post path
+        self.llm_enhance = False
+        self.llm_filtering = False
+        self.llm_hashtags = False
+        self.platform_delay = 2.0
         self.check_interval = 900  # Default: 15 minutes (optimized for video uploads, not livestreams)
         
     def initialize(self):
@@ -128,6 +134,15 @@ class BoonTubeDaemon:
         else:
             logger.info("  ⊘ LLM disabled")
         
+        self.llm_enhance = get_bool_config('LLM', 'enhance_notifications', default=False)
+        self.llm_filtering = get_bool_config('LLM', 'enable_filtering', default=False)
+        self.llm_hashtags = get_bool_config('LLM', 'generate_hashtags', default=False)
+        self.platform_delay = get_float_config('LLM', 'platform_delay', default=2.0)
+        # Only space out posts when each one makes its own LLM call and the provider
+        # doesn't pace requests itself (Gemini's token bucket already does)
+        if not (self.llm and self.llm_enhance) or getattr(self.llm, 'rate_limiter', None) is not None:
+            self.platform_delay = 0.0
+        
         # Initialize social platforms
         logger.info("\n📢 Initializing Social Platforms...")
         
@@ -182,27 +197,46 @@ class BoonTubeDaemon:
         logger.info(f"   Title: {video_data.get('title')}")
         logger.info(f"   URL: {video_data.get('url')}")
         
+        # Run all per-video LLM tasks in one request where the provider supports it
+        if self.llm and self.llm.enabled and hasattr(self.llm, 'process_video'):
+            if self.llm_enhance or self.llm_filtering or self.llm_hashtags:
+                self.llm.process_video(
+                    video_data,
+                    platforms=[social.name.lower() for social in self.social_platforms] if self.llm_enhance else [],
+                    platform_name=platform.name
+                )
+        
         # Use LLM to filter if enabled
         if self.llm and self.llm.enabled:
             if not self.llm.should_notify(video_data):
                 logger.info("   🚫 Skipped by LLM filter")
                 return
         
-        # Get platform delay for request spacing (prevents rate limit hammering)
-        platform_delay = get_float_config('LLM', 'platform_delay', default=2.0)
+        # Write every platform's post in one call where the provider supports it
+        posts = None
+        if (self.llm and self.llm.enabled and self.llm_enhance and self.social_platforms
+                and hasattr(self.llm, 'generate_all_notifications')):
+            try:
+                posts = self.llm.generate_all_notifications(
+                    video_data, platform.name, [social.name for social in self.social_platforms]
+                )
+            except Exception as e:
+                logger.error("   ✗ LLM enhancement failed, generating posts one at a time")
+                logger.debug(f"Batch post generation error: {e}")
         
         # Post to all social platforms (each gets a unique message)
         for idx, social in enumerate(self.social_platforms):
             try:
                 # Add delay between platforms (except first one) to space out LLM requests
-                if idx > 0 and platform_delay > 0:
-                    logger.debug(f"   ⏱ Waiting {platform_delay}s before next platform...")
-                    time.sleep(platform_delay)
+                # (LLM.platform_delay prevents rate limit hammering; see initialize())
+                if idx > 0 and self.platform_delay > 0 and posts is None:
+                    logger.debug(f"   ⏱ Waiting {self.platform_delay}s before next platform...")
+                    time.sleep(self.platform_delay)
                 
                 logger.info(f"   📤 Posting to {social.name}...")
                 
                 # Generate platform-specific message
-                message = self.format_notification(platform, video_data, social.name)
+                message = self.format_notification(platform, video_data, social.name, posts)
                 
                 if not message:
                     logger.warning(f"   ⚠ Failed to generate message for {social.name}, skipping...")
@@ -222,7 +256,8 @@ class BoonTubeDaemon:
                 logger.exception("Detailed traceback:")
                 # Continue to next platform even on error
     
-    def format_notification(self, platform, video_data: Dict, social_platform_name: str = None) -> str:
+    def format_notification(self, platform, video_data: Dict, social_platform_name: str = None,
+                            posts: Optional[Dict[str, Optional[str]]] = None) -> str:
         """
         Format notification message for social platforms.
         Each platform gets a unique, tailored message if LLM is enabled.
@@ -231,6 +266,8 @@ class BoonTubeDaemon:
             platform: Media platform object (YouTube, TikTok, etc.)
             video_data: Video information dict
             social_platform_name: Target social platform name (Discord, Bluesky, etc.)
+            posts: LLM posts already generated for all platforms (social platform
+                lowercase -> text), from generate_all_notifications()
             
         Returns:
             Formatted message string
@@ -239,15 +276,18 @@ class BoonTubeDaemon:
         url = video_data.get('url', '')
         
         # Try LLM-enhanced notification (platform-specific)
-        if self.llm and self.llm.enabled and get_bool_config('LLM', 'enhance_notifications', default=False):
+        if self.llm and self.llm.enabled and self.llm_enhance:
             if social_platform_name:
                 try:
-                    # Use unified generate_notification interface (works for both Ollama and Gemini)
-                    enhanced_message = self.llm.generate_notification(
-                        video_data, 
-                        platform.name,
-                        social_platform_name
-                    )
+                    if posts is not None:
+                        enhanced_message = posts.get(social_platform_name.lower())
+                    else:
+                        # Use unified generate_notification interface (works for both Ollama and Gemini)
+                        enhanced_message = self.llm.generate_notification(
+                            video_data, 
+                            platform.name,
+                            social_platform_name
+                        )
                     if enhanced_message:
                         logger.info(f"   ✨ Using LLM-enhanced {social_platform_name} post")
                         return enhanced_message
@@ -269,7 +309,7 @@ class BoonTubeDaemon:
         )
         
         # Add hashtags (LLM-generated or configured)
-        if self.llm and self.llm.enabled and get_bool_config('LLM', 'generate_hashtags', default=False):
+        if self.llm and self.llm.enabled and self.llm_hashtags:
             hashtags = self.llm.generate_hashtags(video_data)
             if hashtags:
                 message += f"\n\n{hashtags}"
@@ -301,8 +341,8 @@ class BoonTubeDaemon:
                 self.check_platforms()
                 
             except KeyboardInterrupt:
+                # main() calls stop() once run() returns
                 logger.info("\n⏹ Received shutdown signal...")
-                self.stop()
                 break
             except Exception as e:
                 logger.error("Error in main loop")
@@ -312,6 +352,13 @@ class BoonTubeDaemon:
     def stop(self):
         """Stop the daemon."""
         self.running = False
+        if self.llm and hasattr(self.llm, 'cache_stats'):
+            stats = self.llm.cache_stats()
+            if stats:
+                logger.info(f"💾 LLM cache: {stats['hits'] + stats['semantic_hits']} hits, "
+                            f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+        if self.llm and hasattr(self.llm, 'close'):
+            self.llm.close()
         logger.info("👋 Boon-Tube-Daemon stopped.")
 
 
@@ -331,7 +378,11 @@ def main():
     daemon = BoonTubeDaemon()
     
     if daemon.initialize():
-        daemon.run()
+        try:
+            daemon.run()
+        finally:
+            # signal_handler exits with SystemExit, which unwinds through here
+            daemon.stop()
     else:
         logger.error("❌ Failed to initialize daemon")
         sys.exit(1)
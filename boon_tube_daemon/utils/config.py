@@ -12,8 +12,10 @@ Supports multiple secret management backends.
 import logging
 import os
 import configparser
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Tuple
 
 from dotenv import load_dotenv
 
@@ -25,6 +27,11 @@ _config = None
 # Track if .env is loaded
 _env_loaded = False
 
+# Doppler secrets listing per (token, project, config): (fetched_at, secrets or None)
+_doppler_cache: Dict[Tuple[str, Optional[str], str], Tuple[float, Optional[dict]]] = {}
+_doppler_lock = threading.Lock()
+_DOPPLER_CACHE_TTL = 300.0  # seconds; picks up rotated secrets without a restart
+
 
 def load_config(env_path: str = ".env") -> bool:
     """
@@ -52,6 +59,47 @@ def load_config(env_path: str = ".env") -> bool:
         return False
 
 
+def _doppler_secrets(doppler_token: str) -> Optional[dict]:
+    """
+    Get the Doppler secrets for DOPPLER_PROJECT/DOPPLER_CONFIG.
+    
+    The listing is fetched once and reused for _DOPPLER_CACHE_TTL seconds, so
+    reading a dozen config keys costs one API call instead of one each.
+    Failed lookups are remembered too, so an unreachable Doppler doesn't
+    stall every key.
+    
+    Args:
+        doppler_token: Doppler access token
+        
+    Returns:
+        Dict of {name: {raw: ..., computed: ...}}, or None if unavailable
+    """
+    project = os.getenv('DOPPLER_PROJECT')
+    config = os.getenv('DOPPLER_CONFIG', 'dev')
+    cache_key = (doppler_token, project, config)
+    
+    with _doppler_lock:
+        cached = _doppler_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < _DOPPLER_CACHE_TTL:
+            return cached[1]
+        
+        secrets = None
+        try:
+            from dopplersdk import DopplerSDK
+            
+            sdk = DopplerSDK(access_token=doppler_token)
+            secrets_response = sdk.secrets.list(project=project, config=config)
+            if hasattr(secrets_response, 'secrets') and secrets_response.secrets:
+                secrets = secrets_response.secrets
+        except ImportError:
+            logger.debug("dopplersdk not installed, skipping Doppler lookup")
+        except Exception as e:
+            logger.debug(f"Failed to query Doppler for config: {e}")
+        
+        _doppler_cache[cache_key] = (time.monotonic(), secrets)
+        return secrets
+
+
 def get_config(section: str, key: str, default: Any = None) -> Optional[str]:
     """
     Get configuration value from Doppler or environment variables.
@@ -81,35 +129,23 @@ def get_config(section: str, key: str, default: Any = None) -> Optional[str]:
     # 1. Try Doppler first (if DOPPLER_TOKEN is set)
     doppler_token = os.getenv('DOPPLER_TOKEN')
     if doppler_token:
-        try:
-            from dopplersdk import DopplerSDK
-            
-            sdk = DopplerSDK(access_token=doppler_token)
-            secrets_response = sdk.secrets.list(
-                project=os.getenv('DOPPLER_PROJECT'),
-                config=os.getenv('DOPPLER_CONFIG', 'dev')
-            )
+        secrets = _doppler_secrets(doppler_token)
+        if secrets:
+            # Try sectioned key first (e.g., BLUESKY_HANDLE)
+            if sectioned_key in secrets:
+                value = secrets[sectioned_key].get('computed',
+                        secrets[sectioned_key].get('raw', ''))
+                if value and not value.startswith('YOUR_'):
+                    logger.debug(f"✓ Retrieved {section}.{key} from Doppler: {sectioned_key}")
+                    return value
             
-            if hasattr(secrets_response, 'secrets') and secrets_response.secrets:
-                # Try sectioned key first (e.g., BLUESKY_HANDLE)
-                if sectioned_key in secrets_response.secrets:
-                    value = secrets_response.secrets[sectioned_key].get('computed',
-                            secrets_response.secrets[sectioned_key].get('raw', ''))
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from Doppler: {sectioned_key}")
-                        return value
-                
-                # Try simple key format (e.g., CHECK_INTERVAL)
-                if simple_key in secrets_response.secrets:
-                    value = secrets_response.secrets[simple_key].get('computed',
-                            secrets_response.secrets[simple_key].get('raw', ''))
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from Doppler: {simple_key}")
-                        return value
-        except ImportError:
-            logger.debug("dopplersdk not installed, skipping Doppler lookup")
-        except Exception as e:
-            logger.debug(f"Failed to query Doppler for config: {e}")
+            # Try simple key format (e.g., CHECK_INTERVAL)
+            if simple_key in secrets:
+                value = secrets[simple_key].get('computed',
+                        secrets[simple_key].get('raw', ''))
+                if value and not value.startswith('YOUR_'):
+                    logger.debug(f"✓ Retrieved {section}.{key} from Doppler: {simple_key}")
+                    return value
     
     # 2. Try simple key format from env (e.g., CHECK_INTERVAL)
     value = os.getenv(simple_key)
@@ -237,30 +273,16 @@ def get_secret(section: str, key: str, default: Optional[str] = None) -> Optiona
             return value
         
         # If not in env, fetch from Doppler API using the SDK
-        try:
-            from dopplersdk import DopplerSDK
-            
-            sdk = DopplerSDK(access_token=doppler_token)
-            # Get all secrets for this project/config
-            secrets_response = sdk.secrets.list(
-                project=os.getenv('DOPPLER_PROJECT'),
-                config=os.getenv('DOPPLER_CONFIG', 'dev')
-            )
-            
-            # secrets is a dict of {name: {raw: ..., computed: ...}}
-            if hasattr(secrets_response, 'secrets') and secrets_response.secrets:
-                if env_var in secrets_response.secrets:
-                    secret_data = secrets_response.secrets[env_var]
-                    # Extract the computed value (or raw if computed not available)
-                    value = secret_data.get('computed', secret_data.get('raw'))
-                    # Skip placeholder values
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from Doppler (SDK)")
-                        return value
-        except ImportError:
-            logger.debug("dopplersdk not installed, skipping Doppler SDK lookup")
-        except Exception as e:
-            logger.debug(f"Doppler SDK lookup failed: {e}")
+        # secrets is a dict of {name: {raw: ..., computed: ...}}
+        secrets = _doppler_secrets(doppler_token)
+        if secrets and env_var in secrets:
+            secret_data = secrets[env_var]
+            # Extract the computed value (or raw if computed not available)
+            value = secret_data.get('computed', secret_data.get('raw'))
+            # Skip placeholder values
+            if value and not value.startswith('YOUR_'):
+                logger.debug(f"✓ Retrieved {section}.{key} from Doppler (SDK)")
+                return value
     
     # 2. Try AWS Secrets Manager (if enabled)
     if get_bool_config('Secrets', 'aws_enabled', default=False):
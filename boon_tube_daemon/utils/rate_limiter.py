@@ -21,6 +21,10 @@ class RateLimiter:
     Enforces a maximum number of requests per time period using the token bucket algorithm.
     This prevents exceeding API rate limits by throttling requests.
     
+    The refill rate adapts to the API (AIMD): on_failure() after a 429 halves it
+    and empties the bucket, on_success() adds it back in small steps up to the
+    configured maximum.
+    
     Example:
         # Gemini Free Tier: 15 requests per minute
         limiter = RateLimiter(max_requests=15, time_window=60.0)
@@ -30,29 +34,39 @@ class RateLimiter:
         make_api_call()
     """
     
-    def __init__(self, max_requests: int, time_window: float):
+    def __init__(self, max_requests: int, time_window: float, min_rate: Optional[float] = None,
+                 increase: Optional[float] = None, decrease: float = 0.5):
         """
         Initialize rate limiter.
         
         Args:
             max_requests: Maximum number of requests allowed in the time window
             time_window: Time window in seconds (e.g., 60.0 for per-minute limit)
+            min_rate: Lowest refill rate on_failure() can drop to, in req/s
+                (default: 1/10 of the maximum)
+            increase: Refill rate added per on_success(), in req/s
+                (default: 1/10 of the maximum)
+            decrease: Factor the refill rate is multiplied by on_failure()
         """
         self.max_requests = max_requests
         self.time_window = time_window
         self.tokens = max_requests  # Start with full bucket
-        self.last_refill = time.time()
+        self.last_refill = time.monotonic()
         self.lock = threading.Lock()
         
         # Calculate refill rate (tokens per second)
-        self.refill_rate = max_requests / time_window
+        self.max_rate = max_requests / time_window
+        self.refill_rate = self.max_rate
+        self.min_rate = min_rate if min_rate is not None else self.max_rate / 10
+        self.increase = increase if increase is not None else self.max_rate / 10
+        self.decrease = decrease
         
         logger.info(f"⏱ Rate limiter initialized: {max_requests} requests per {time_window}s "
                    f"({self.refill_rate:.2f} req/s)")
     
     def _refill_tokens(self):
         """Refill tokens based on time elapsed since last refill."""
-        now = time.time()
+        now = time.monotonic()
         elapsed = now - self.last_refill
         
         # Calculate new tokens (never exceed max)
@@ -71,7 +85,7 @@ class RateLimiter:
         Returns:
             True if token acquired, False if timeout reached
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         
         while True:
             with self.lock:
@@ -86,7 +100,7 @@ class RateLimiter:
                 
                 # No tokens available - check timeout
                 if timeout is not None:
-                    elapsed = time.time() - start_time
+                    elapsed = time.monotonic() - start_time
                     if elapsed >= timeout:
                         logger.warning(f"⏱ Rate limit timeout after {elapsed:.1f}s")
                         return False
@@ -96,7 +110,7 @@ class RateLimiter:
             wait_time = min(1.0 / self.refill_rate, 0.5)  # Max 0.5s sleep
             
             if timeout is not None:
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 remaining_timeout = timeout - elapsed
                 wait_time = min(wait_time, remaining_timeout)
                 
@@ -131,9 +145,36 @@ class RateLimiter:
             tokens_needed = 1.0 - self.tokens
             return tokens_needed / self.refill_rate
     
+    def tokens_available(self) -> int:
+        """
+        Get the number of requests that can be made right now without waiting.
+        
+        Returns:
+            Whole tokens currently in the bucket
+        """
+        with self.lock:
+            self._refill_tokens()
+            return int(self.tokens)
+    
+    def on_success(self):
+        """Report a successful request: step the refill rate back up (additive increase)."""
+        with self.lock:
+            if self.refill_rate < self.max_rate:
+                self._refill_tokens()
+                self.refill_rate = min(self.max_rate, self.refill_rate + self.increase)
+    
+    def on_failure(self):
+        """Report a rate-limit error: cut the refill rate (multiplicative decrease) and drain the bucket."""
+        with self.lock:
+            self._refill_tokens()
+            self.refill_rate = max(self.min_rate, self.refill_rate * self.decrease)
+            self.tokens = 0.0
+            logger.debug("⏱ Rate limit hit, refill rate lowered to %.3f req/s", self.refill_rate)
+    
     def reset(self):
         """Reset the rate limiter (refill all tokens)."""
         with self.lock:
             self.tokens = self.max_requests
-            self.last_refill = time.time()
+            self.refill_rate = self.max_rate
+            self.last_refill = time.monotonic()
             logger.debug(f"🔄 Rate limiter reset ({self.max_requests} tokens available)")
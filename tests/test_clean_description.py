@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Unit tests for description cleaning in the Gemini provider.
+These tests don't require API keys or external services.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from boon_tube_daemon.llm.gemini import GeminiLLM, _PROMO_PATTERNS, _STRIP_RE
+
+SAMPLE_LINES = [
+    "Sponsored by NordVPN - get 60% off",
+    "This video is sponsored: Brilliant",
+    "Thanks to our sponsors",
+    "Support me on Patreon",
+    "SUPPORT US ON ko-fi today",
+    "Buy me a coffee if you liked it",
+    "Tip jar below",
+    "Donate to the channel",
+    "Check out the merch store",
+    "Affiliate links help the channel",
+    "Our Discord server is open",
+    "join my discord!",
+    "Follow me on Mastodon",
+    "Find me on Bluesky",
+    "Connect with me elsewhere",
+    "Today we install Arch Linux on a ThinkPad",
+    "Chapters: 00:00 intro, 02:15 partitioning",
+]
+
+
+def _sequential_promo_strip(text: str) -> str:
+    """The original one-sub-per-pattern implementation."""
+    for pattern in _PROMO_PATTERNS:
+        text = re.sub(r'(?i)' + pattern + r'[^\n]*', '', text)
+    return text
+
+
+class TestFusedPromoPattern:
+    """Test that the fused pattern removes exactly what the separate passes did."""
+
+    def test_each_line_matches_sequential_passes(self):
+        """Test every sample line on its own."""
+        for line in SAMPLE_LINES:
+            assert _STRIP_RE.sub('', line) == _sequential_promo_strip(line), line
+
+    def test_multiline_description_matches_sequential_passes(self):
+        """Test a whole description; removal must stop at each newline."""
+        description = "\n".join(SAMPLE_LINES)
+        assert _STRIP_RE.sub('', description) == _sequential_promo_strip(description)
+
+    def test_overlapping_phrases_remove_from_the_earliest(self):
+        """Test that the single scan starts at the leftmost phrase on a line."""
+        # Separate passes ran 'discord server' first and left "Join our " behind
+        assert _STRIP_RE.sub('', "Join our Discord server for chat") == ""
+
+    def test_urls_and_handles_only_remove_themselves(self):
+        """Test that a promo keyword inside a URL or handle doesn't eat the line."""
+        text = "Great stuff https://patreon.com/someone and more @merch_guy here"
+        assert _STRIP_RE.sub('', text) == "Great stuff  and more  here"
+
+
+class TestCleanDescription:
+    """Test clean_description end to end."""
+
+    def test_cleans_and_truncates(self):
+        """Test promo removal, whitespace collapsing and word-boundary truncation."""
+        llm = GeminiLLM()
+        description = "Installing   Arch\tLinux\n\n\n\nSponsored by X\nSee https://x.y @me"
+        assert llm.clean_description(description) == "Installing Arch Linux\n\nSee"
+        assert llm.clean_description("one two three four", max_length=10) == "one two..."
+
+    def test_strips_each_description_once(self):
+        """Test that repeated cleaning of a description reuses the stripped text."""
+        llm = GeminiLLM()
+        calls = []
+        strip = llm._strip_description
+        llm._strip_description = lambda text: calls.append(text) or strip(text)
+        for max_length in (500, 400, 400):
+            llm.clean_description("Arch install\nSponsored by X", max_length=max_length)
+        llm._cleaned_description({'description': "Arch install\nSponsored by X"})
+        assert calls == ["Arch install\nSponsored by X"]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Unit tests for Gemini's local filtering helpers.
+These tests don't require API keys or external services.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from boon_tube_daemon.llm.gemini import GeminiLLM, _mean_unit_vector
+
+
+class TestPrototypeFilter:
+    """Test the embedding prototype classifier used by should_notify."""
+
+    def _llm(self):
+        llm = GeminiLLM()
+        llm._prototypes = (_mean_unit_vector([[1.0, 0.0], [1.0, 0.2]]), [0.0, 1.0])
+        return llm
+
+    def test_clear_matches_are_decided_locally(self):
+        """Test that videos close to one prototype skip the LLM."""
+        llm = self._llm()
+        assert llm._prototype_decision([2.0, 0.1]) is True
+        assert llm._prototype_decision([0.1, 3.0]) is False
+
+    def test_ambiguous_band_falls_back(self):
+        """Test that videos between the prototypes return None."""
+        llm = self._llm()
+        assert llm._prototype_decision([1.0, 1.1]) is None
+
+    def test_unusable_vectors_fall_back(self):
+        """Test missing prototypes, missing vectors and dimension mismatches."""
+        llm = self._llm()
+        assert llm._prototype_decision(None) is None
+        assert llm._prototype_decision([1.0, 0.0, 0.0]) is None
+        assert GeminiLLM()._prototype_decision([1.0, 0.0]) is None
+
+    def test_prototypes_require_both_example_lists(self):
+        """Test that the filter stays off unless good and bad examples are set."""
+        llm = GeminiLLM()
+        llm._filter_good_examples = ['Installing Arch Linux']
+        assert llm._load_prototypes() is None
+
+
+class TestLocalShouldNotify:
+    """Test the local keyword/heuristic pre-filter."""
+
+    def _llm(self, heuristics=True):
+        llm = GeminiLLM()
+        llm._filter_keyword_list = ['giveaway']
+        llm._filter_heuristics = heuristics
+        return llm
+
+    def test_keyword_hit_rejects(self):
+        """Test that a filter keyword is always a local reject."""
+        video = {'title': 'Huge GIVEAWAY stream', 'description': ''}
+        assert self._llm()._local_should_notify(video) is False
+        assert self._llm(heuristics=False)._local_should_notify(video) is False
+
+    def test_plain_title_accepted_only_with_heuristics(self):
+        """Test that ordinary titles skip the LLM only when heuristics are on."""
+        video = {'title': 'Setting up WireGuard on OpenBSD', 'description': 'A walkthrough'}
+        assert self._llm()._local_should_notify(video) is True
+        assert self._llm(heuristics=False)._local_should_notify(video) is None
+
+    def test_clickbait_markers_escalate(self):
+        """Test that suspicious titles are left to the LLM."""
+        llm = self._llm()
+        for title in ['You WON\'T believe this!!!', 'THIS CHANGES EVERYTHING FOREVER',
+                      'Wow 🔥🔥🔥🔥🔥🔥 look', 'x' * 120]:
+            assert llm._local_should_notify({'title': title, 'description': 'Details'}) is None, title
+
+    def test_thin_metadata_escalates(self):
+        """Test that very short titles and empty descriptions are left to the LLM."""
+        llm = self._llm()
+        assert llm._local_should_notify({'title': 'New video', 'description': 'Details'}) is None
+        assert llm._local_should_notify({'title': 'Setting up WireGuard', 'description': '  '}) is None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Unit tests for Gemini notification prompts and post clean-up.
+These tests don't require API keys or external services.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from boon_tube_daemon.llm.gemini import (
+    GeminiLLM, _BLUESKY_CONTENT_LIMIT, _MASTODON_CONTENT_LIMIT, _truncate_for_bluesky
+)
+
+VIDEO = {
+    'title': 'Installing {Arch} Linux',
+    'description': 'A full walkthrough of partitioning and bootloaders.',
+    'url': 'https://youtu.be/abc123',
+}
+
+
+class TestPromptTemplates:
+    """Test the per-platform enhance_notification prompts."""
+
+    def test_every_platform_renders(self):
+        """Test that each template fills every placeholder."""
+        llm = GeminiLLM()
+        for platform in ['discord', 'matrix', 'bluesky', 'mastodon', 'telegram']:
+            prompt = llm._notification_prompt(VIDEO, 'YouTube', platform, 'concise')
+            assert 'Installing {Arch} Linux' in prompt
+            assert 'Be brief and to-the-point.' in prompt
+            assert '{' not in prompt.replace('{Arch}', ''), platform
+
+    def test_limits_come_from_constants(self):
+        """Test that the Bluesky and Mastodon prompts quote the content limits."""
+        llm = GeminiLLM()
+        bluesky = llm._notification_prompt(VIDEO, 'YouTube', 'bluesky', 'conversational')
+        mastodon = llm._notification_prompt(VIDEO, 'YouTube', 'mastodon', 'detailed')
+        assert 'MAXIMUM: %d characters' % _BLUESKY_CONTENT_LIMIT in bluesky
+        assert 'Stay under %d characters' % _MASTODON_CONTENT_LIMIT in mastodon
+
+
+class TestFinalizeNotification:
+    """Test clean-up of raw LLM post text."""
+
+    def test_strips_meta_text_and_urls(self):
+        """Test that prefaces and LLM-supplied URLs go and the real URL is appended."""
+        llm = GeminiLLM()
+        raw = "Here's your Discord post:\nNew video on Arch https://youtu.be/fake is up"
+        assert llm._finalize_notification(raw, VIDEO['url'], 'discord') == (
+            "New video on Arch  is up\n\nhttps://youtu.be/abc123"
+        )
+
+    def test_meta_text_only_stripped_at_line_start(self):
+        """Test that a phrase like 'Certainly' mid-sentence is kept."""
+        llm = GeminiLLM()
+        raw = "This is certainly the best install guide"
+        assert llm._finalize_notification(raw, '', 'matrix') == raw
+
+    def test_post_starting_with_a_preface_word_survives(self):
+        """Test that only one preface per line goes, not the post's own first word."""
+        llm = GeminiLLM()
+        assert llm._finalize_notification("Draft: Drafting your first novel", '', 'matrix') == (
+            "Drafting your first novel"
+        )
+        assert llm._finalize_notification("Draft: Draft beer reviews", '', 'matrix') == "Draft beer reviews"
+        assert llm._finalize_notification("Here's your post: Here's how I host email", '', 'matrix') == (
+            "Here's how I host email"
+        )
+
+
+class TestBlueskyTruncation:
+    """Test the single-pass Bluesky length enforcement."""
+
+    def test_short_posts_unchanged(self):
+        """Test that posts within the limit are returned as-is."""
+        assert _truncate_for_bluesky("Short post #Linux", 250) == "Short post #Linux"
+
+    def test_cuts_at_word_and_keeps_trailing_hashtags(self):
+        """Test word-boundary truncation with the closing hashtags re-attached."""
+        text = "aaaa bbbb cccc dddd ffffffffffffffff #Arch #Linux  "
+        assert _truncate_for_bluesky(text, 33) == "aaaa bbbb cccc dddd #Arch #Linux"
+
+    def test_drops_hashtags_that_do_not_fit(self):
+        """Test that hashtags are only re-attached when they fit."""
+        assert _truncate_for_bluesky("aaaa bbbb cccc dddd eeee #Arch", 20) == "aaaa bbbb cccc dddd"
+
+    def test_counts_graphemes_not_code_points(self):
+        """Test that skin tones and ZWJ sequences count as one character each."""
+        text = "\U0001F44D\U0001F3FD" * 10 + " " + "e\u0301" * 5
+        assert _truncate_for_bluesky(text, 16) == text
+        family = "\U0001F468\u200d\U0001F469\u200d\U0001F467"
+        assert _truncate_for_bluesky((family + " ") * 20, 20) == " ".join([family] * 10)
+
+
+class TestOutputTokenCaps:
+    """Test the output token limits for length-limited generations."""
+
+    def test_cap_scales_with_length(self):
+        """Test that the cap leaves headroom over the character limit."""
+        llm = GeminiLLM()
+        llm._limit_output_tokens = True
+        assert llm._length_config(250) == {'max_output_tokens': 84}
+        assert llm._length_config(200)['max_output_tokens'] * 4 > 200
+        assert llm._length_config(250) is llm._length_config(250)
+
+    def test_cap_can_be_disabled(self):
+        """Test that LLM.limit_output_tokens=false sends no generation config."""
+        assert GeminiLLM()._length_config(250) is None
+
+
+class TestBatchedResponse:
+    """Test parsing of the process_video JSON response."""
+
+    def test_hashtag_list_is_joined(self):
+        """Test that the schema's hashtag array is stored as the usual string."""
+        llm = GeminiLLM()
+        video = dict(VIDEO)
+        response = ('{"summary": "s", "hashtags": ["#Arch", "#Linux"], "sentiment": "tutorial", '
+                    '"should_notify": true, "posts": {"Discord": "Go watch"}}')
+        result = llm._store_batched(video, response)
+        assert result['hashtags'] == '#Arch #Linux'
+        assert result['posts'] == {'discord': 'Go watch'}
+        assert llm._get_batched(video, 'hashtags') == '#Arch #Linux'
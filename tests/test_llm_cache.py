@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Unit tests for the LLM response cache.
+These tests don't require API keys or external services.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from boon_tube_daemon.llm.llm_cache import LLMCache, json_dumps, json_loads
+
+
+class TestExactCache:
+    """Test the exact-match tier."""
+    
+    def test_key_depends_on_task_model_and_prompt(self):
+        """Test that every component of the key changes the digest."""
+        base = LLMCache.make_key('summary', 'model-a', 'prompt')
+        assert base == LLMCache.make_key('summary', 'model-a', 'prompt')
+        assert base != LLMCache.make_key('hashtags', 'model-a', 'prompt')
+        assert base != LLMCache.make_key('summary', 'model-b', 'prompt')
+        assert base != LLMCache.make_key('summary', 'model-a', 'prompt!')
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = LLMCache(max_entries=2)
+        cache.set('a', 'task', 'A')
+        cache.set('b', 'task', 'B')
+        assert cache.get('a') == 'A'  # 'b' is now least recently used
+        cache.set('c', 'task', 'C')
+        assert cache.get('b') is None
+        assert cache.get('a') == 'A'
+        assert cache.get('c') == 'C'
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive a restart via SQLite."""
+        path = tmp_path / 'llm_cache.sqlite'
+        cache = LLMCache(path=str(path))
+        cache.set('key', 'summary', 'cached summary')
+        cache.add_similar('summary', [1.0, 0.0], 'similar summary')
+        cache.close()
+        
+        reloaded = LLMCache(path=str(path))
+        assert reloaded.get('key') == 'cached summary'
+        assert reloaded.get_similar('summary', [1.0, 0.0]) == 'similar summary'
+        reloaded.close()
+
+
+class TestSemanticCache:
+    """Test the semantic-similarity tier."""
+    
+    def test_threshold_and_task_isolation(self):
+        """Test that only close vectors for the same task match."""
+        cache = LLMCache(semantic_threshold=0.95)
+        cache.add_similar('summary', [1.0, 0.0, 0.0], 'hit')
+        
+        assert cache.get_similar('summary', [0.99, 0.05, 0.0]) == 'hit'
+        assert cache.get_similar('summary', [0.5, 0.5, 0.0]) is None
+        assert cache.get_similar('hashtags', [1.0, 0.0, 0.0]) is None
+    
+    def test_eviction_is_oldest_first_across_tasks(self):
+        """Test that max_entries evicts the oldest entry whatever its task."""
+        cache = LLMCache(max_entries=2)
+        cache.add_similar('notification:youtube:discord:conversational', [1.0, 0.0], 'first')
+        cache.add_similar('notification:youtube:bluesky:concise', [1.0, 0.0], 'second')
+        cache.add_similar('notification:youtube:bluesky:concise', [0.0, 1.0], 'third')
+        
+        assert cache.get_similar('notification:youtube:discord:conversational', [1.0, 0.0]) is None
+        assert cache.get_similar('notification:youtube:bluesky:concise', [1.0, 0.0]) == 'second'
+        assert cache.stats()['semantic_entries'] == 2
+
+
+class TestVideoCache:
+    """Test per-video results keyed by URL."""
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Test that a video result survives a restart."""
+        path = tmp_path / 'llm_cache.sqlite'
+        result = {'summary': 'A video', 'posts': {'discord': 'New video!'}}
+        cache = LLMCache(path=str(path), video_ttl=3600)
+        cache.set_video('https://youtu.be/abc', result)
+        cache.close()
+        
+        reloaded = LLMCache(path=str(path), video_ttl=3600)
+        assert reloaded.get_video('https://youtu.be/abc') == result
+        assert reloaded.get_video('https://youtu.be/other') is None
+        reloaded.close()
+    
+    def test_expired_results_are_dropped(self):
+        """Test that results older than video_ttl are not returned."""
+        cache = LLMCache(video_ttl=60)
+        cache.set_video('https://youtu.be/abc', {'summary': 'old'})
+        cache._videos['https://youtu.be/abc'] = (0.0, cache._videos['https://youtu.be/abc'][1])
+        assert cache.get_video('https://youtu.be/abc') is None
+
+
+class TestJsonHelpers:
+    """Test the JSON helpers shared by the cache and batched responses."""
+    
+    def test_round_trip(self):
+        """Test that dumps/loads round-trip unicode and nested data."""
+        data = {'summary': 'Café ☕', 'posts': {'bluesky': 'New video! #Linux'}, 'should_notify': True}
+        assert json_loads(json_dumps(data)) == data
+    
+    def test_accepts_raw_newlines_in_strings(self):
+        """Test that raw control characters inside strings still parse."""
+        assert json_loads('{"post": "line one\nline two"}') == {'post': 'line one\nline two'}
+
+
+class TestCacheHousekeeping:
+    """Test TTL expiry, stats and clearing."""
+    
+    def test_expired_responses_are_misses(self):
+        """Test that responses older than the TTL are dropped on lookup."""
+        cache = LLMCache(ttl=60)
+        cache.set('key', 'summary', 'fresh')
+        assert cache.get('key') == 'fresh'
+        cache._exact['key'] = (0.0, 'stale')
+        assert cache.get('key') is None
+        assert 'key' not in cache._exact
+    
+    def test_stats_and_clear(self, tmp_path):
+        """Test hit/miss counters and that clear() also empties the database."""
+        path = tmp_path / 'llm_cache.sqlite'
+        cache = LLMCache(path=str(path))
+        cache.set('key', 'summary', 'cached')
+        cache.get('key')
+        cache.get('missing')
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+        assert stats['hit_rate'] == 0.5
+        
+        cache.clear()
+        assert cache.get('key') is None
+        assert cache.stats()['hits'] == 0
+        cache.close()
+        assert LLMCache(path=str(path)).get('key') is None
+
+    def test_shared_instance_per_path(self, tmp_path):
+        """Test that shared() hands every caller the same cache for a file."""
+        path = str(tmp_path / 'shared.sqlite')
+        first = LLMCache.shared(path, max_entries=10)
+        first.set('k', 'summary', 'hello')
+        assert LLMCache.shared(path, max_entries=99) is first
+        assert LLMCache.shared(path).get('k') == 'hello'
+        assert LLMCache.shared(str(tmp_path / 'other.sqlite')) is not first
+
+        first.close()
+        assert LLMCache.shared(path) is not first
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Unit tests for Ollama notification generation and guardrails.
+These tests don't require an Ollama server.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from boon_tube_daemon.llm.llm_cache import LLMCache
+from boon_tube_daemon.llm.ollama import (
+    OllamaLLM, _NOTIFICATION_RULES, _keep_alive_value
+)
+
+VIDEO = {
+    'title': 'Installing Arch Linux on a ThinkPad',
+    'description': 'A full walkthrough of partitioning and bootloaders.',
+    'url': 'https://youtu.be/abc123',
+    'channel_name': 'TechChannel',
+}
+
+
+def _llm():
+    llm = OllamaLLM()
+    llm.enabled = True
+    llm.ollama_client = object()
+    llm.model = 'gemma3:4b'
+    return llm
+
+
+class TestNotificationPrompt:
+    """Test the notification prompt layout."""
+
+    def test_fixed_prefix_and_video_tail(self):
+        """Test that every prompt starts with the shared rules and ends with the video details."""
+        llm = _llm()
+        bluesky, _ = llm._prepare_notification(VIDEO, 'YouTube', 'bluesky')
+        matrix, _ = llm._prepare_notification(dict(VIDEO, description=''), 'YouTube', 'matrix')
+        for prompt in (bluesky, matrix):
+            assert prompt.startswith(_NOTIFICATION_RULES)
+            assert VIDEO['title'] not in prompt[:len(_NOTIFICATION_RULES)]
+            assert prompt.endswith('characters.\n\nPost:')
+        assert 'Exactly 3 hashtags. Under 250 characters.' in bluesky
+        assert 'DESCRIPTION: "A full walkthrough' in bluesky
+        assert 'No hashtags. Under 350 characters.' in matrix
+        assert 'DESCRIPTION' not in matrix
+
+
+class _FakeAsyncClient:
+    """Streams a canned post after a short delay and records peak concurrency."""
+
+    def __init__(self, fail_call=None):
+        self.fail_call = fail_call
+        self.running = 0
+        self.peak = 0
+        self.prompts = []
+
+    async def generate(self, model, prompt, options, stream=False):
+        self.prompts.append(prompt)
+        call = len(self.prompts)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if call == self.fail_call:
+            raise RuntimeError("invalid model")
+
+        async def chunks():
+            for word in 'Walking through a full Arch install on a ThinkPad #Arch #Linux #ThinkPad'.split():
+                yield {'response': word + ' '}
+
+        return chunks()
+
+
+class TestConcurrentNotifications:
+    """Test the async per-platform fan-out."""
+
+    def test_platforms_generated_concurrently(self):
+        """Test that all prompts are in flight at once and results map back to platforms."""
+        llm = _llm()
+        client = _FakeAsyncClient(fail_call=2)
+        llm._get_async_client = lambda: client
+
+        posts = llm.generate_all_notifications(VIDEO, 'YouTube', ['Bluesky', 'Matrix', 'discord'])
+        assert client.peak == 3
+        assert set(posts) == {'bluesky', 'matrix', 'discord'}
+        assert posts['matrix'] is None
+        assert posts['bluesky'].endswith('\n\nhttps://youtu.be/abc123')
+        assert posts['discord'].startswith('Walking through')
+
+    def test_shared_post(self):
+        """Test that shared-post mode makes one request and adapts it per platform."""
+        llm = _llm()
+        llm.shared_post = True
+        client = _FakeAsyncClient()
+        llm._get_async_client = lambda: client
+
+        posts = llm.generate_all_notifications(VIDEO, 'YouTube', ['matrix', 'bluesky', 'discord'])
+        assert len(client.prompts) == 1
+        assert 'Under 250 characters' in client.prompts[0]
+        assert posts['bluesky'].startswith('Walking through a full Arch install on a ThinkPad #Arch')
+        assert posts['matrix'] == "Walking through a full Arch install on a ThinkPad\n\nhttps://youtu.be/abc123"
+
+    def test_disabled_returns_none_per_platform(self):
+        """Test that a disabled provider makes no requests."""
+        llm = OllamaLLM()
+        assert llm.generate_all_notifications(VIDEO, 'YouTube', ['discord']) == {'discord': None}
+
+
+class TestResponseCache:
+    """Test that repeated prompts reuse the cached post text."""
+
+    def test_repeat_prompts_skip_the_server(self):
+        """Test sync and async generation against the shared response cache."""
+        llm = _llm()
+        llm.cache = LLMCache()
+        client = _FakeAsyncClient()
+        llm._get_async_client = lambda: client
+
+        first = llm.generate_all_notifications(VIDEO, 'YouTube', ['bluesky', 'discord'])
+        again = llm.generate_all_notifications(VIDEO, 'YouTube', ['bluesky', 'discord'])
+        assert len(client.prompts) == 2
+        assert llm.cache_stats()['hits'] == 2
+        assert again == first
+
+        llm.ollama_client = None
+        assert llm.generate_notification(VIDEO, 'YouTube', 'discord') == first['discord']
+
+    def test_cache_disabled(self):
+        """Test that no cache means empty stats and clear_cache() is a no-op."""
+        llm = _llm()
+        llm.clear_cache()
+        assert llm.cache_stats() == {}
+
+
+class _StreamClient:
+    """Streams the given tokens one by one and records how many were consumed."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.consumed = 0
+        self.closed = False
+
+    def generate(self, model, prompt, options, stream=False):
+        assert stream
+
+        def chunks():
+            try:
+                for token in self.tokens:
+                    self.consumed += 1
+                    yield {'response': token}
+            finally:
+                self.closed = True
+
+        return chunks()
+
+
+class TestStreamingEarlyStop:
+    """Test that streamed generation stops once the post is complete."""
+
+    def test_stops_after_hashtag_line(self):
+        """Test that commentary after the closing hashtags is never generated."""
+        llm = _llm()
+        post = ['Full ', 'Arch ', 'install ', 'on ', 'a ', 'ThinkPad ', '#Arch ', '#Linux ', '#ThinkPad', '\n']
+        llm.ollama_client = _StreamClient(post + ['I ', 'hope ', 'this ', 'meets ', 'your ', 'needs'])
+        text = llm._generate_with_retry('prompt', max_chars=250, hashtag_count=3)
+        assert text == "Full Arch install on a ThinkPad #Arch #Linux #ThinkPad"
+        assert llm.ollama_client.consumed == len(post)
+        assert llm.ollama_client.closed
+
+    def test_stops_past_the_length_limit(self):
+        """Test the length cut-off for posts without hashtags."""
+        llm = _llm()
+        llm.ollama_client = _StreamClient(['word '] * 200)
+        llm._generate_with_retry('prompt', max_chars=50, hashtag_count=0)
+        assert llm.ollama_client.consumed == 30
+
+
+class TestGenerationOptions:
+    """Test the prebuilt generate() options."""
+
+    def test_options_built_once_per_limit(self):
+        """Test that options are reused and thinking mode scales num_predict."""
+        llm = _llm()
+        llm.thinking_mode_enabled = True
+        options = llm._generation_options(150)
+        assert options == {'num_predict': 600, 'temperature': 0.3, 'top_p': 0.9}
+        assert llm._generation_options(150) is options
+        assert llm._generation_options(50)['num_predict'] == 200
+
+    def test_server_options_included(self):
+        """Test that configured runtime options go out with every request."""
+        llm = _llm()
+        llm.server_options = {'num_ctx': 2048, 'num_gpu': 99}
+        assert llm._generation_options(150) == {
+            'num_ctx': 2048, 'num_gpu': 99, 'num_predict': 150, 'temperature': 0.3, 'top_p': 0.9
+        }
+
+    def test_retries_send_the_same_options(self):
+        """Test that every attempt passes the shared options dict."""
+        llm = _llm()
+        sent = []
+
+        class FlakyClient:
+            def generate(self, model, prompt, options):
+                sent.append(options)
+                if len(sent) < 2:
+                    raise RuntimeError("connection reset")
+                return {'response': 'A post that is long enough to keep'}
+
+        llm.ollama_client = FlakyClient()
+        assert llm._generate_with_retry('prompt', initial_delay=0) == 'A post that is long enough to keep'
+        assert sent[0] is sent[1] is llm._generation_options(llm.max_tokens)
+
+
+class TestKeepAlive:
+    """Test keeping the model loaded between notifications."""
+
+    def test_setting_conversion(self):
+        """Test durations, seconds and the server default."""
+        assert _keep_alive_value('30m') == '30m'
+        assert _keep_alive_value('-1') == -1
+        assert _keep_alive_value('90.5') == 90.5
+        assert _keep_alive_value(' ') is None
+
+    def test_sent_with_every_request(self):
+        """Test that streamed and plain requests both carry keep_alive."""
+        llm = _llm()
+        llm.keep_alive = '30m'
+        assert llm._request_kwargs(250) == {'keep_alive': '30m', 'stream': True}
+        assert llm._request_kwargs(None) == {'keep_alive': '30m'}
+
+
+class TestClose:
+    """Test shutting down the Ollama connection pool."""
+
+    def test_closes_underlying_http_client(self):
+        """Test that close() closes the httpx client and disables the LLM."""
+        closed = []
+        llm = _llm()
+        llm.ollama_client = SimpleNamespace(_client=SimpleNamespace(close=lambda: closed.append(True)))
+        llm.close()
+        assert closed == [True]
+        assert llm.ollama_client is None
+        assert not llm.enabled
+
+    def test_client_without_http_attribute(self):
+        """Test that a client missing the private _client still closes cleanly."""
+        llm = _llm()
+        llm.close()
+        assert llm.ollama_client is None
+
+
+class TestQuantizationCheck:
+    """Test the startup quantization report."""
+
+    def _llm(self, level):
+        llm = _llm()
+
+        class ShowClient:
+            def show(self, model):
+                class Response:
+                    details = type('Details', (), {'quantization_level': level})()
+                return Response()
+
+        llm.ollama_client = ShowClient()
+        return llm
+
+    def test_expected_level_mismatch_warns(self, caplog):
+        """Test that a tag other than LLM_OLLAMA_QUANTIZATION is reported."""
+        llm = self._llm('Q4_K_M')
+        llm.quantization = 'q8_0'
+        llm._log_quantization('gemma3:4b')
+        assert 'https://ollama.com/library/gemma3/tags' in caplog.text
+
+    def test_matching_level_is_info(self, caplog):
+        """Test that the expected level, in any case, only logs at info."""
+        llm = self._llm('Q8_0')
+        llm.quantization = 'q8_0'
+        with caplog.at_level('INFO'):
+            llm._log_quantization('gemma3:4b-it-q8_0')
+        assert [record.levelname for record in caplog.records] == ['INFO']
+
+
+class TestResponseParsing:
+    """Test reading post text out of Ollama responses."""
+
+    def test_generate_response_thinking_field(self):
+        """Test that GenerateResponse.thinking feeds thinking mode extraction."""
+        import ollama
+        llm = _llm()
+        llm.thinking_mode_enabled = True
+        response = ollama.GenerateResponse(
+            model='qwen3:4b', response='',
+            thinking="Let me draft it.\nFinal post: Walking through a full Arch install on a ThinkPad"
+        )
+        assert llm._response_text(response, 150) == "Walking through a full Arch install on a ThinkPad"
+
+    def test_dict_and_unknown_responses(self):
+        """Test chat-style dict payloads and that unknown objects aren't stringified."""
+        llm = _llm()
+        assert llm._response_text({'response': '', 'message': {'content': ' Hello there '}}, 150) == 'Hello there'
+        assert llm._response_text(['not', 'a', 'response'], 150) is None
+
+    def test_structured_output(self):
+        """Test that JSON output requests the schema and reads the post field."""
+        llm = _llm()
+        llm.json_output = True
+        sent = []
+
+        class JsonClient:
+            def generate(self, model, prompt, options, **kwargs):
+                sent.append(kwargs)
+                return {'response': '{"post": " Arch on a ThinkPad, start to finish #Arch "}'}
+
+        llm.ollama_client = JsonClient()
+        prompt, guardrails = llm._prepare_notification(VIDEO, 'YouTube', 'bluesky')
+        assert prompt.endswith('characters.\nRespond with JSON only: {"post": "<the post text>"}\n\nPost:')
+        assert llm._generate_post(prompt, guardrails) == "Arch on a ThinkPad, start to finish #Arch"
+        assert sent == [{'format': {'type': 'object', 'properties': {'post': {'type': 'string'}},
+                                    'required': ['post']}}]
+        assert llm._response_text({'response': 'Plain text post that ignored the schema'}, 150) == (
+            'Plain text post that ignored the schema'
+        )
+
+
+class TestMetaTextStripping:
+    """Test meta-text and quote stripping in the guardrails."""
+
+    def _strip(self, text):
+        return _llm()._apply_guardrails(text, 500, 'matrix', False)
+
+    def test_prefaces_removed(self):
+        """Test typical model prefaces, stacked prefixes and edge quotes."""
+        assert self._strip("Here's your Bluesky post: Arch on a ThinkPad #Arch") == (
+            "your Bluesky post: Arch on a ThinkPad #Arch"
+        )
+        assert self._strip("Here's Post: Arch on a ThinkPad") == "Arch on a ThinkPad"
+        assert self._strip("Certainly Post: Arch on a ThinkPad") == "Arch on a ThinkPad"
+        assert self._strip('Certainly:\n"Arch on a ThinkPad"') == "Arch on a ThinkPad"
+        assert self._strip("A plain post about Arch #Linux") == "A plain post about Arch #Linux"
+
+    def test_post_text_sharing_a_prefix_word_survives(self):
+        """Test that only the preface goes when the post starts with the same word."""
+        assert self._strip("Post: Postgres 17 tuning tips for small servers") == (
+            "Postgres 17 tuning tips for small servers"
+        )
+        assert self._strip("Draft: Drafting a novel with plain-text tools") == (
+            "Drafting a novel with plain-text tools"
+        )
+        assert self._strip("Output: Output devices on Linux, explained") == (
+            "Output devices on Linux, explained"
+        )
+
+
+class TestWordFilters:
+    """Test the forbidden-word and profanity checks."""
+
+    def test_forbidden_words_whole_words_only(self):
+        """Test that matches respect word boundaries and come back in list order."""
+        found = OllamaLLM._contains_forbidden_words("Unbelievable! An EPIC, mind-blowing build. Litmus test.")
+        assert found == (True, ['epic', 'mind-blowing', 'unbelievable'])
+        assert OllamaLLM._contains_forbidden_words("Epicurean litany") == (False, [])
+
+    def test_profanity_severity_tiers(self):
+        """Test that each severity also checks the milder tiers."""
+        message = "Damn, this bastard of a bug is shitty"
+        assert OllamaLLM._contains_profanity(message, 'mild') == (True, ['damn'])
+        assert OllamaLLM._contains_profanity(message, 'moderate') == (True, ['damn', 'bastard'])
+        assert OllamaLLM._contains_profanity(message, 'severe') == (True, ['damn', 'bastard', 'shitty'])
+        assert OllamaLLM._contains_profanity("Assembly class", 'severe') == (False, [])
+
+
+class TestPlatformValidation:
+    """Test the per-platform validation rules."""
+
+    def test_bluesky_and_mastodon(self):
+        """Test URL and HTML entity detection, including the plain-text fast path."""
+        llm = _llm()
+        assert llm._validate_platform_specific("Watch it at https://youtu.be/x", 'Bluesky')
+        assert llm._validate_platform_specific("Made with http and love", 'bluesky') == []
+        assert llm._validate_platform_specific("Rock &amp; roll", 'mastodon')
+        assert llm._validate_platform_specific("Rock & roll", 'mastodon') == []
+
+    def test_discord_mass_pings(self):
+        """Test mass-ping detection."""
+        llm = _llm()
+        assert llm._validate_platform_specific("Hey @everyone new video", 'discord')
+        assert llm._validate_platform_specific("Thanks @TechChannel for the tip", 'discord') == []
+        assert llm._validate_platform_specific("No pings here", 'matrix') == []
+
+    def test_discord_markdown_pairs(self):
+        """Test that an odd number of bold/underline markers is flagged."""
+        llm = _llm()
+        assert llm._validate_platform_specific("A **bold** and __underlined__ post", 'discord') == []
+        assert llm._validate_platform_specific("A **bold post", 'discord') == ["Unmatched markdown formatting"]
+        assert llm._validate_platform_specific("A __dangling post", 'discord') == ["Unmatched markdown formatting"]
+
+
+class TestGuardrailOrder:
+    """Test that rejected posts skip the warn-only diagnostics."""
+
+    def _llm(self, checked):
+        llm = _llm()
+        llm.enable_profanity_filter = True
+
+        def fake_quality(message, hashtag_count, title, channel_name):
+            checked.append(message)
+            return True, []
+
+        llm._validate_message_quality = fake_quality
+        return llm
+
+    def test_profanity_rejects_before_quality_checks(self):
+        """Test the early return for a profane post."""
+        checked = []
+        llm = self._llm(checked)
+        assert llm._apply_guardrails("This damn install #Arch", 250, 'bluesky', True,
+                                     title='Arch', hashtag_count=1) is None
+        assert checked == []
+
+    def test_clean_post_still_checked(self):
+        """Test that quality checks see the post before username hashtags are removed."""
+        checked = []
+        llm = self._llm(checked)
+        post = llm._apply_guardrails("Arch install on a ThinkPad #Arch #TechChannel", 250, 'bluesky', True,
+                                     title='Arch', channel_name='TechChannel', hashtag_count=2)
+        assert checked == ["Arch install on a ThinkPad #Arch #TechChannel"]
+        assert '#TechChannel' not in post
+
+
+class TestEmojiCount:
+    """Test the emoji counter used by the emoji guardrail."""
+
+    def test_counts_emoji_blocks(self):
+        """Test emoticons, supplemental symbols, dingbats and stars."""
+        assert OllamaLLM._count_emojis("Plain ASCII post") == 0
+        assert OllamaLLM._count_emojis("New build \U0001F525\U0001F92F\U0001F973 \u2728\u2b50") == 5
+        assert OllamaLLM._count_emojis("Watch now \u25b6\ufe0f \u23f0") == 2
+
+    def test_ignores_non_latin_text(self):
+        """Test that CJK and accented text isn't mistaken for emoji."""
+        assert OllamaLLM._count_emojis("日本語のタイトル — café") == 0
+
+
+class TestDeduplication:
+    """Test the recent-message duplicate check."""
+
+    def test_exact_and_near_duplicates(self):
+        """Test that normalization ignores hashtags/punctuation and >80% word overlap counts."""
+        llm = OllamaLLM()
+        llm._add_to_message_cache("Full Arch install on a ThinkPad, start to finish! #Arch")
+        assert llm._is_duplicate_message("full arch install on a thinkpad start to finish #Linux")
+        assert llm._is_duplicate_message("Full Arch install on a ThinkPad, start to finish today")
+        assert not llm._is_duplicate_message("Tuning ZFS on a home server")
+
+    def test_cache_evicts_least_recently_seen(self):
+        """Test that a duplicate hit keeps its entry from being evicted."""
+        llm = OllamaLLM()
+        llm.dedup_cache_size = 2
+        llm._add_to_message_cache("first post about arch")
+        llm._add_to_message_cache("second post about zfs")
+        assert llm._is_duplicate_message("First post about Arch!")
+        llm._add_to_message_cache("third post about nixos")
+        assert list(llm._message_cache) == ["first post about arch", "third post about nixos"]
+
+
+class TestThinkingExtraction:
+    """Test pulling the post out of Qwen3 thinking output."""
+
+    def test_post_marker_preferred_and_case_kept(self):
+        """Test that the first usable post-style marker wins over output markers."""
+        thinking = ("Output: Setting up ZFS on the home server today, come along\n"
+                    "Message: short\n"
+                    "Final post: \"Walking through a full Arch install on a ThinkPad #Arch\"")
+        assert OllamaLLM()._extract_from_thinking(thinking, 150) == (
+            "Walking through a full Arch install on a ThinkPad #Arch"
+        )
+
+    def test_output_marker_used_when_no_post_marker(self):
+        """Test the output/result fallback."""
+        thinking = "Let me think.\nResult: Setting up ZFS on the home server today, come along"
+        assert OllamaLLM()._extract_from_thinking(thinking, 150) == (
+            "Setting up ZFS on the home server today, come along"
+        )
+
+
+class TestRetryBackoff:
+    """Test the Ollama retry schedule."""
+
+    def test_delays_are_jittered_and_capped(self, monkeypatch):
+        """Test +/-20% jitter, the 30s cap and no retries for permanent errors."""
+        from boon_tube_daemon.llm import ollama as ollama_module
+        sleeps = []
+        monkeypatch.setattr(ollama_module.time, 'sleep', sleeps.append)
+
+        class DownClient:
+            calls = 0
+
+            def generate(self, model, prompt, options):
+                DownClient.calls += 1
+                raise RuntimeError("connection refused" if DownClient.calls < 10 else "model not found")
+
+        llm = _llm()
+        llm.ollama_client = DownClient()
+        assert llm._generate_with_retry('prompt', max_retries=6, initial_delay=8.0) is None
+        bases = [8.0, 16.0, 30.0, 30.0, 30.0]
+        assert len(sleeps) == len(bases)
+        assert all(0.8 * base <= slept <= 1.2 * base for slept, base in zip(sleeps, bases))
+
+        sleeps.clear()
+        DownClient.calls = 9
+        assert llm._generate_with_retry('prompt', max_retries=6) is None
+        assert sleeps == []
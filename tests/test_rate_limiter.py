@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Unit tests for the token bucket rate limiter and LLM request scheduling
+(rate-limit handling, batching and request coalescing).
+These tests don't require API keys or external services.
+"""
+
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from boon_tube_daemon.utils.rate_limiter import RateLimiter
+from boon_tube_daemon.llm.gemini import GeminiLLM
+
+
+class TestAdaptiveRate:
+    """Test the AIMD refill-rate adjustments."""
+
+    def test_failure_halves_rate_and_drains_bucket(self):
+        """Test that a rate-limit error slows the limiter down."""
+        limiter = RateLimiter(max_requests=60, time_window=60.0)
+        limiter.on_failure()
+        assert limiter.refill_rate == 0.5
+        assert not limiter.try_acquire()
+
+    def test_rate_is_bounded(self):
+        """Test that the rate stays between min_rate and the configured maximum."""
+        limiter = RateLimiter(max_requests=60, time_window=60.0, min_rate=0.2)
+        for _ in range(10):
+            limiter.on_failure()
+        assert limiter.refill_rate == 0.2
+
+        for _ in range(50):
+            limiter.on_success()
+        assert limiter.refill_rate == limiter.max_rate == 1.0
+
+    def test_reset_restores_rate(self):
+        """Test that reset() also undoes any slowdown."""
+        limiter = RateLimiter(max_requests=15, time_window=60.0)
+        limiter.on_failure()
+        limiter.reset()
+        assert limiter.refill_rate == limiter.max_rate
+        assert limiter.try_acquire()
+
+
+class _RetryDelay:
+    def __init__(self, seconds, nanos):
+        self.seconds = seconds
+        self.nanos = nanos
+
+
+class _RetryInfo:
+    def __init__(self, seconds, nanos=0):
+        self.retry_delay = _RetryDelay(seconds, nanos)
+
+
+class _QuotaError(Exception):
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details
+
+
+class TestRetryAfter:
+    """Test reading the server's retry hint from Gemini errors."""
+
+    def test_retry_info_detail(self):
+        """Test the gRPC RetryInfo detail."""
+        error = _QuotaError("429 Resource has been exhausted", details=[_RetryInfo(7, 500000000)])
+        assert GeminiLLM._retry_after(error) == 7.5
+
+    def test_message_hint(self):
+        """Test the 'Please retry in Ns' hint in the message."""
+        error = _QuotaError("429 You exceeded your current quota. Please retry in 23.4s.")
+        assert GeminiLLM._retry_after(error) == 23.4
+        assert GeminiLLM._retry_after(_QuotaError("503 Service unavailable")) is None
+
+    def test_rate_limit_error_slows_limiter(self):
+        """Test that only quota errors reach the rate limiter."""
+        llm = GeminiLLM()
+        llm.rate_limiter = RateLimiter(max_requests=60, time_window=60.0)
+        assert llm._transient_error_delay(_QuotaError("503 Service unavailable")) == 0.0
+        assert llm.rate_limiter.refill_rate == 1.0
+
+        assert llm._transient_error_delay(_QuotaError("429 quota exceeded, retry in 3s")) == 3.0
+        assert llm.rate_limiter.refill_rate == 0.5
+
+
+class TestNotificationBatch:
+    """Test that batched post generation respects the rate-limit budget."""
+
+    def test_concurrency_capped_by_available_tokens(self):
+        """Test that no more requests run at once than the bucket can pay for."""
+        llm = GeminiLLM()
+        llm.rate_limiter = RateLimiter(max_requests=3, time_window=60.0)
+        llm.rate_limiter.try_acquire()
+        running = []
+        peak = []
+
+        async def fake_enhance(video_data, platform_name, social_platform):
+            running.append(social_platform)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(social_platform)
+            if social_platform == 'matrix':
+                raise RuntimeError("boom")
+            return f"{video_data['title']} on {social_platform}"
+
+        llm.aenhance_notification = fake_enhance
+        jobs = [({'title': 'A'}, 'YouTube', target) for target in ['discord', 'matrix', 'bluesky', 'mastodon']]
+        posts = llm.enhance_notifications_batch_sync(jobs)
+        assert posts == ['A on discord', None, 'A on bluesky', 'A on mastodon']
+        assert max(peak) == 2
+
+
+class TestRequestCoalescing:
+    """Test that identical concurrent requests share one API call."""
+
+    def _llm(self, calls):
+        llm = GeminiLLM()
+        llm.model_name = 'gemini-test'
+
+        def fake_uncached(prompt, max_retries, initial_delay, generation_config):
+            calls.append(prompt)
+            time.sleep(0.05)
+            return f"answer to {prompt}"
+
+        async def fake_auncached(prompt, max_retries, initial_delay, generation_config):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return f"answer to {prompt}"
+
+        llm._generate_uncached = fake_uncached
+        llm._agenerate_uncached = fake_auncached
+        return llm
+
+    def test_threads_share_one_call(self):
+        """Test single-flight across threads."""
+        calls = []
+        llm = self._llm(calls)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: llm._generate_with_retry('same', task='summary'), range(4)))
+        assert results == ['answer to same'] * 4
+        assert calls == ['same']
+        assert not llm._inflight
+
+    def test_coroutines_share_one_call(self):
+        """Test single-flight across coroutines; different tasks still get their own call."""
+        calls = []
+        llm = self._llm(calls)
+
+        async def run():
+            return await asyncio.gather(
+                llm._agenerate_with_retry('same', task='summary'),
+                llm._agenerate_with_retry('same', task='summary'),
+                llm._agenerate_with_retry('same', task='sentiment'),
+            )
+
+        assert asyncio.run(run()) == ['answer to same'] * 3
+        assert calls == ['same', 'same']
+        assert not llm._ainflight
@@ -87,6 +87,36 @@ class TestConfiguration:
         assert get_bool_config('NonExistent', 'test', default=True) == True
         assert get_bool_config('NonExistent', 'test', default=False) == False
         assert get_int_config('NonExistent', 'test', default=42) == 42
+    
+    def test_doppler_listing_fetched_once(self, monkeypatch):
+        """Test that several config reads share one Doppler API call."""
+        import types
+        from boon_tube_daemon.utils import config
+        
+        calls = []
+        
+        class FakeSecrets:
+            def list(self, project, config):
+                calls.append((project, config))
+                return types.SimpleNamespace(secrets={
+                    'LLM_MODEL': {'computed': 'gemma3:4b'},
+                    'TEMPERATURE': {'raw': '0.5'},
+                })
+        
+        class FakeSDK:
+            def __init__(self, access_token):
+                self.secrets = FakeSecrets()
+        
+        monkeypatch.setitem(sys.modules, 'dopplersdk', types.SimpleNamespace(DopplerSDK=FakeSDK))
+        monkeypatch.setattr(config, '_doppler_cache', {})
+        monkeypatch.setenv('DOPPLER_TOKEN', 'dp.test')
+        monkeypatch.setenv('DOPPLER_PROJECT', 'boon-tube')
+        monkeypatch.delenv('LLM_MODEL', raising=False)
+        
+        assert config.get_config('LLM', 'model') == 'gemma3:4b'
+        assert config.get_config('LLM', 'temperature') == '0.5'
+        assert config.get_secret('LLM', 'model') == 'gemma3:4b'
+        assert calls == [('boon-tube', 'dev')]
 
 
 if __name__ == '__main__':